@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Roguelike Game - Floor Generation Benchmark
+Times building and installing floors of increasing size to show linear scaling
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from core.settings import Settings
+from core.game_state import Biome, GameState
+
+
+def measure(rooms: int, seed: int, biome: Biome):
+    """Return (build seconds, install seconds, peak MiB) for one floor."""
+    state = GameState(Settings(ROOMS_PER_FLOOR=rooms), seed=seed)
+    state.current_biome = biome
+
+    start = time.perf_counter()
+    built = state.build_floor(2, biome)
+    middle = time.perf_counter()
+    state.install_floor(built)
+    end = time.perf_counter()
+
+    # Memory is traced in a second pass since tracing slows everything down
+    tracemalloc.start()
+    state.install_floor(state.build_floor(2, biome))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return middle - start, end - middle, peak / 2 ** 20
+
+
+def main(argv=None):
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description="Benchmark floor generation at increasing room counts")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="room counts to benchmark")
+    parser.add_argument("--biome", choices=[b.name for b in Biome], default="FACTORY",
+                        help="biome to generate (FACTORY includes hazards)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    biome = Biome[args.biome]
+    print(f"{'rooms':>6} {'build':>9} {'install':>9} {'per room':>9} {'peak':>9}")
+    for rooms in args.rooms:
+        build, install, peak = measure(rooms, args.seed, biome)
+        per_room = (build + install) / rooms * 1e6
+        print(f"{rooms:>6} {build * 1e3:>7.1f}ms {install * 1e3:>7.1f}ms "
+              f"{per_room:>7.1f}us {peak:>6.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
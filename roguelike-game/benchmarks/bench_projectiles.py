@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Roguelike Game - Projectile Benchmark
+Times one simulation step of the projectile pool against a room full of targets
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from core.projectiles import ProjectilePool, PLAYER, ENEMY, ENEMY_RADIUS, PLAYER_RADIUS
+
+
+ROOM_SIZE = 30.0  # tiles
+
+
+def step(shots: ProjectilePool, count: int, xs: np.ndarray, ys: np.ndarray, rng: np.random.Generator):
+    """Top the pool up to ``count`` shots, then move them and resolve hits once."""
+    # Half the refill is the player's, half the enemies'
+    missing = count - shots.count
+    for owner, volley in ((PLAYER, missing // 2), (ENEMY, missing - missing // 2)):
+        angles = rng.uniform(0, 2 * np.pi, volley)
+        shots.fire_many(rng.uniform(0, ROOM_SIZE, volley), rng.uniform(0, ROOM_SIZE, volley),
+                        np.cos(angles) * 8.0, np.sin(angles) * 8.0, 2.0, 5.0, owner)
+    shots.update(1 / 60)
+    rows, _ = shots.hits(PLAYER, xs, ys, ENEMY_RADIUS)
+    shots.expire(rows)
+    rows, _ = shots.hits(ENEMY, xs[:1], ys[:1], PLAYER_RADIUS)
+    shots.expire(rows)
+    shots.remove_spent()
+
+
+def main(argv=None):
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description="Benchmark projectile motion and collision")
+    parser.add_argument("--projectiles", type=int, nargs="+", default=[100, 500, 2000],
+                        help="live projectile counts to benchmark")
+    parser.add_argument("--enemies", type=int, default=50, help="targets in the room")
+    parser.add_argument("--number", type=int, default=500, help="steps per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    xs = rng.uniform(0, ROOM_SIZE, args.enemies)
+    ys = rng.uniform(0, ROOM_SIZE, args.enemies)
+
+    print(f"{'shots':>6} {'step':>9} {'frame share':>12}")
+    for count in args.projectiles:
+        shots = ProjectilePool(capacity=count)
+        per_step = timeit.timeit(lambda: step(shots, count, xs, ys, rng), number=args.number) / args.number
+        print(f"{count:>6} {per_step * 1e6:>7.1f}us {per_step * 60 * 100:>11.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Roguelike Game - Snapshot Benchmark
+Compares Game.snapshot()/restore() with copy.deepcopy on a mid-combat state
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import timeit
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from core.settings import Settings
+from core.game import Game, GamePhase
+from core.input import ScriptedInput
+from core.policies import make_policy
+
+
+def mid_combat_game(rooms: int, seed: int) -> Game:
+    """Start a headless game and step into the middle of a fight."""
+    random.seed(seed)
+    settings = Settings(ROOMS_PER_FLOOR=rooms, EVENT_LOG_LEVEL="OFF", AUTO_SAVE=False)
+    game = Game(settings, headless=True, input_source=ScriptedInput(make_policy("greedy")))
+    game.simulate(60 * 60, until=lambda g: g.current_phase == GamePhase.FIGHT)
+    game.simulate(30)
+    return game
+
+
+def deepcopy_clone(game: Game):
+    """What cloning costs without the snapshot API: deepcopy everything but settings, the log and pools."""
+    state = game.state
+    fields = {k: v for k, v in vars(state).items()
+              if k not in ("settings", "events", "room_pool", "enemy_objects")}
+    return copy.deepcopy((fields, game.combat.pool))
+
+
+def measure(fn, number: int) -> float:
+    """Return the mean time of ``fn`` in microseconds."""
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+
+def main(argv=None):
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description="Benchmark GameState snapshots against deepcopy")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[10, 50, 200],
+                        help="room counts to benchmark")
+    parser.add_argument("--number", type=int, default=200, help="repetitions per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'rooms':>6} {'phase':>8} {'snapshot':>10} {'restore':>10} {'deepcopy':>10} {'speedup':>8}")
+    for rooms in args.rooms:
+        game = mid_combat_game(rooms, args.seed)
+        snap = game.snapshot()
+        take = measure(game.snapshot, args.number)
+        back = measure(lambda: game.restore(snap), args.number)
+        deep = measure(lambda: deepcopy_clone(game), max(1, args.number // 10))
+        print(f"{rooms:>6} {game.current_phase.name:>8} {take:>8.1f}us {back:>8.1f}us "
+              f"{deep:>8.1f}us {deep / take:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Data-driven enemy archetypes and per-floor spawn tables."""
+
+import functools
+import numpy as np
+import yaml
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+
+DEFAULT_ENEMY_DATA = Path(__file__).resolve().parents[2] / "assets" / "data" / "enemies.yaml"
+
+
+class ArchetypeError(Exception):
+    """Raised when the enemy data file is missing or malformed."""
+
+
+class RangedAttack(NamedTuple):
+    """Projectile attack of a ranged archetype."""
+    speed: float  # tiles per second
+    range: float  # tiles
+
+
+class SpawnTable:
+    """
+    Enemy archetypes compiled for one biome and floor.
+
+    Stats are already scaled for the floor and stored as arrays indexed
+    by archetype, next to the cumulative spawn weights, so a whole floor's
+    enemies come from a few vectorized draws instead of a dict lookup and
+    several random calls per enemy.
+    """
+
+    def __init__(self, names: List[str], weights: np.ndarray, hp: np.ndarray, damage: np.ndarray,
+                 speed: np.ndarray, elite_chance: float, elite_hp: np.ndarray, elite_damage: np.ndarray):
+        """Wrap per-archetype arrays; ``weights`` need not be normalized."""
+        self.names = names
+        self.cumulative = np.cumsum(weights / weights.sum())
+        self.hp = hp
+        self.damage = damage
+        self.speed = speed
+        self.elite_chance = elite_chance
+        self.elite_hp = elite_hp
+        self.elite_damage = elite_damage
+
+    def roll(self, rng: np.random.Generator, shape) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw archetype indices and elite flags for an array of ``shape`` enemies."""
+        rolls = rng.random((2,) + tuple(np.atleast_1d(shape).tolist()))
+        kinds = np.minimum(np.searchsorted(self.cumulative, rolls[0], side="right"), len(self.names) - 1)
+        return kinds, rolls[1] < self.elite_chance
+
+    def stats(self, kinds: np.ndarray, elite: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the hp and damage of rolled enemies."""
+        return (np.where(elite, self.elite_hp[kinds], self.hp[kinds]),
+                np.where(elite, self.elite_damage[kinds], self.damage[kinds]))
+
+    def spawn(self, rng: np.random.Generator, xs: np.ndarray, ys: np.ndarray, widths: np.ndarray,
+              heights: np.ndarray) -> Iterator[Tuple[str, float, float, int, int, float, bool]]:
+        """
+        Roll one enemy per entry of the room rectangle arrays in a single batch.
+
+        Yields (type, x, y, hp, damage, speed, is_elite) per enemy, each
+        placed on a whole tile away from its room's top and left walls.
+        """
+        kinds, elite = self.roll(rng, len(xs))
+        ex = xs + rng.integers(1, widths)
+        ey = ys + rng.integers(1, heights)
+        hp, damage = self.stats(kinds, elite)
+
+        names = self.names
+        return zip([names[k] for k in kinds.tolist()], ex.astype(float).tolist(), ey.astype(float).tolist(),
+                   hp.tolist(), damage.tolist(), self.speed[kinds].tolist(), elite.tolist())
+
+
+class ArchetypeRegistry:
+    """
+    Enemy archetypes and biome spawn weights loaded from YAML.
+
+    compile() turns them into a SpawnTable for a biome and floor; tables
+    are cached, so each floor is compiled once however many rooms it has.
+    """
+
+    def __init__(self, data: Dict):
+        """Validate parsed enemy data (see assets/data/enemies.yaml)."""
+        try:
+            self.archetypes = {name: (int(stats["hp"]), int(stats["damage"]), float(stats["speed"]))
+                               for name, stats in data["archetypes"].items()}
+            self.ranged = {name: RangedAttack(float(stats["projectile"]["speed"]), float(stats["projectile"]["range"]))
+                           for name, stats in data["archetypes"].items() if "projectile" in stats}
+            self.spawns = {biome: {name: float(weight) for name, weight in weights.items()}
+                           for biome, weights in data["spawns"].items()}
+            elites = data.get("elites", {})
+            self.elite_chance_per_floor = float(elites.get("chance_per_floor", 0.0))
+            self.elite_hp_multiplier = float(elites.get("hp_multiplier", 1.0))
+            self.elite_damage_multiplier = float(elites.get("damage_multiplier", 1.0))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ArchetypeError(f"Malformed enemy data: {e!r}") from e
+
+        for name, attack in self.ranged.items():
+            if attack.speed <= 0 or attack.range <= 0:
+                raise ArchetypeError(f"Archetype {name} has a non-positive projectile speed or range")
+        if "default" not in self.spawns:
+            raise ArchetypeError("Enemy data has no default spawn table")
+        for biome, weights in self.spawns.items():
+            unknown = set(weights) - set(self.archetypes)
+            if unknown:
+                raise ArchetypeError(f"Spawn table {biome} uses unknown archetypes {sorted(unknown)}")
+            if not weights or sum(weights.values()) <= 0:
+                raise ArchetypeError(f"Spawn table {biome} has no positive weights")
+
+        self.tables: Dict[tuple, SpawnTable] = {}
+
+    def compile(self, biome: str, floor: int, hp_scale: float, damage_scale: float) -> SpawnTable:
+        """Return the spawn table for ``biome`` on ``floor`` with per-floor stat scaling."""
+        key = (biome, floor, hp_scale, damage_scale)
+        table = self.tables.get(key)
+        if table is not None:
+            return table
+
+        weights = self.spawns.get(biome, self.spawns["default"])
+        names = list(weights)
+        base = np.array([self.archetypes[name] for name in names], dtype=np.float64)
+        hp = (base[:, 0] * hp_scale ** (floor - 1)).astype(np.int64)
+        damage = (base[:, 1] * damage_scale ** (floor - 1)).astype(np.int64)
+        table = SpawnTable(
+            names, np.array([weights[name] for name in names]), hp, damage, base[:, 2],
+            elite_chance=self.elite_chance_per_floor * floor,
+            elite_hp=(hp * self.elite_hp_multiplier).astype(np.int64),
+            elite_damage=(damage * self.elite_damage_multiplier).astype(np.int64),
+        )
+        self.tables[key] = table
+        return table
+
+
+@functools.lru_cache(maxsize=None)
+def load_archetypes(path: str = "") -> ArchetypeRegistry:
+    """Load (once per path) the enemy registry; an empty path uses the bundled data."""
+    path = path or str(DEFAULT_ENEMY_DATA)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise ArchetypeError(f"Cannot load enemy data {path}: {e}") from e
+    return ArchetypeRegistry(data or {})
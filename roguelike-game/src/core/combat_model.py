@@ -0,0 +1,199 @@
+"""Combat rules and a vectorized Monte Carlo estimate of fights; needs no pygame."""
+
+import math
+import numpy as np
+from typing import Dict, NamedTuple, Optional, Sequence
+
+
+TELEGRAPH_TIME = 0.5  # seconds of warning before an attack lands
+ATTACK_COOLDOWN = 2.0  # seconds between attacks
+ATTACK_RANGE = 1.5  # tiles; melee enemies further away move instead
+INITIAL_COOLDOWN = (1.0, 2.0)  # seconds; range of an enemy's wait before its first attack
+MELEE_RANGE = 2.0  # tiles; the player hits the nearest enemy this close
+
+TRIAL_CHUNK = 10_000  # trials simulated per batch, bounding memory
+
+
+def attack_damage(damage, crit_chance, crit_damage, rolls):
+    """Damage of player attacks for uniform ``rolls``; rolls below ``crit_chance`` are crits."""
+    crit = np.less(rolls, crit_chance)
+    return np.where(crit, np.trunc(np.multiply(damage, crit_damage)), damage).astype(np.int64)
+
+
+def mitigate(damage, armor):
+    """Damage left after armor; every hit deals at least 1."""
+    return np.maximum(1, np.subtract(damage, armor))
+
+
+class Build(NamedTuple):
+    """The player stats a fight is estimated for."""
+    hp: int
+    damage: int
+    crit_chance: float = 0.1
+    crit_damage: float = 1.5
+    armor: int = 0
+    speed: float = 4.0  # tiles per second
+    attack_interval: float = 0.4  # seconds between attacks
+    dodge_rate: float = 0.0  # share of enemy attacks dodged
+
+    @classmethod
+    def from_player(cls, player, **overrides) -> "Build":
+        """Take the current stats of ``player``; ``overrides`` replace any field."""
+        build = cls(hp=player.hp, damage=player.damage, crit_chance=player.crit_chance,
+                    crit_damage=player.crit_damage, armor=player.armor, speed=player.speed)
+        return build._replace(**overrides)
+
+    def upgraded(self, effect: str, value) -> "Build":
+        """Return the build after a power-up choice of ``effect``; unknown effects change nothing."""
+        if effect == "damage":
+            return self._replace(damage=self.damage + value)
+        if effect == "max_hp":
+            return self._replace(hp=self.hp + value)
+        if effect == "speed":
+            return self._replace(speed=self.speed + value)
+        if effect == "armor":
+            return self._replace(armor=self.armor + value)
+        if effect == "crit_chance":
+            return self._replace(crit_chance=self.crit_chance + value)
+        return self
+
+
+class Foe(NamedTuple):
+    """One enemy of a fight."""
+    hp: int
+    damage: int
+    speed: float
+    reach: float = ATTACK_RANGE
+    shot_speed: float = 0.0  # 0 for melee attackers
+
+    @classmethod
+    def from_enemy(cls, enemy, ranged: Optional[Dict] = None) -> "Foe":
+        """Take an Enemy record; ``ranged`` maps archetypes to their RangedAttack."""
+        attack = (ranged or {}).get(enemy.enemy_type)
+        if attack is None:
+            return cls(enemy.hp, enemy.damage, enemy.speed)
+        return cls(enemy.hp, enemy.damage, enemy.speed, attack.range, attack.speed)
+
+
+class CombatEstimate(NamedTuple):
+    """Per-trial outcomes of a simulated fight."""
+    time_to_kill: np.ndarray  # seconds until the last enemy died; nan where the player died
+    damage_taken: np.ndarray  # capped at the player's hp
+    died: np.ndarray
+
+    @property
+    def death_probability(self) -> float:
+        """Share of trials the player did not survive."""
+        return float(self.died.mean()) if len(self.died) else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Headline numbers: death probability and time-to-kill / damage percentiles."""
+        won = self.time_to_kill[~self.died]
+        ttk = np.percentile(won, (50, 90)) if len(won) else (math.nan, math.nan)
+        damage = np.percentile(self.damage_taken, (50, 90)) if len(self.damage_taken) else (math.nan, math.nan)
+        return {
+            "death_probability": self.death_probability,
+            "ttk_p50": float(ttk[0]),
+            "ttk_p90": float(ttk[1]),
+            "damage_p50": float(damage[0]),
+            "damage_p90": float(damage[1]),
+        }
+
+
+def simulate_fights(build: Build, hp: np.ndarray, damage: np.ndarray, speed: np.ndarray,
+                    reach: np.ndarray, shot_speed: np.ndarray, rng: np.random.Generator,
+                    distance: float = 4.0) -> CombatEstimate:
+    """
+    Simulate one fight per row of the (trials, enemies) stat arrays.
+
+    Follows CombatSystem's rules in closed form rather than frame by
+    frame. Enemies start ``distance`` tiles away, close in until within
+    their reach, and then attack every TELEGRAPH_TIME + ATTACK_COOLDOWN
+    seconds after an initial cooldown; ranged shots also spend their
+    flight time. The player attacks every ``attack_interval`` seconds
+    once the first enemy is in melee range, rolling crits per hit and
+    killing enemies in column order; an enemy's attacks stop when it
+    dies. Each trial's hits are all drawn up front, so every trial of a
+    batch advances together.
+    """
+    trials, count = hp.shape
+    if not count:
+        zeros = np.zeros(trials)
+        return CombatEstimate(zeros, zeros, np.zeros(trials, dtype=bool))
+
+    # Player hits: enough to kill every enemy even if each hit rolls its weakest damage
+    player_damage = max(1, build.damage)
+    weakest = int(attack_damage(player_damage, build.crit_chance, build.crit_damage, (0.0, 1.0)).min())
+    hits = int(np.ceil(hp / max(1, weakest)).sum(axis=1).max())
+    dealt = np.zeros((trials, hits + 1), dtype=np.int64)
+    np.cumsum(attack_damage(player_damage, build.crit_chance, build.crit_damage,
+                            rng.random((trials, hits))), axis=1, out=dealt[:, 1:])
+
+    # Each enemy dies on the first hit whose running total covers its hp.
+    # Offsetting every row past the previous row's total makes the flattened
+    # totals one sorted array, so each enemy is a single searchsorted call
+    engage = max(distance - MELEE_RANGE, 0.0) / (build.speed + speed.max(axis=1))
+    width = hits + 1
+    base = np.arange(trials) * width
+    flat = (dealt + np.arange(trials)[:, None] * (int(dealt[:, -1].max()) + 1)).ravel()
+    used = np.zeros(trials, dtype=np.int64)
+    deaths = np.empty((trials, count))
+    for j in range(count):
+        used = np.searchsorted(flat, flat[base + used] + hp[:, j]) - base
+        deaths[:, j] = engage + (used - 1) * build.attack_interval
+
+    # Enemy attacks land periodically from their first hit until they die
+    approach = np.maximum(distance - reach, 0.0) / (speed + build.speed)
+    flight = np.divide(reach, shot_speed, out=np.zeros_like(reach, dtype=np.float64), where=shot_speed > 0)
+    first = (np.maximum(approach, rng.uniform(*INITIAL_COOLDOWN, size=hp.shape))
+             + TELEGRAPH_TIME + flight)
+    landed = np.maximum(np.ceil((deaths - first) / (TELEGRAPH_TIME + ATTACK_COOLDOWN)), 0).astype(np.int64)
+    if build.dodge_rate > 0:
+        landed = rng.binomial(landed, 1.0 - build.dodge_rate)
+    taken = (landed * mitigate(damage, build.armor)).sum(axis=1)
+
+    # All counted hits land before the last kill, so the fight is lost iff they add up to the player's hp
+    died = taken >= build.hp
+    return CombatEstimate(np.where(died, np.nan, deaths[:, -1]), np.minimum(taken, build.hp), died)
+
+
+def estimate(build: Build, foes: Sequence[Foe], trials: int = 100_000,
+             rng: Optional[np.random.Generator] = None, distance: float = 4.0) -> CombatEstimate:
+    """Estimate ``trials`` fights of ``build`` against a fixed composition of ``foes``, killed in order."""
+    rng = rng if rng is not None else np.random.default_rng()
+    columns = np.array([tuple(foe) for foe in foes], dtype=np.float64).reshape(len(foes), len(Foe._fields))
+    parts = []
+    for start in range(0, trials, TRIAL_CHUNK):
+        shape = (min(TRIAL_CHUNK, trials - start), len(foes))
+        hp, damage, speed, reach, shot_speed = (np.broadcast_to(column, shape) for column in columns.T)
+        parts.append(simulate_fights(build, hp, damage, speed, reach, shot_speed, rng, distance))
+    return concatenate(parts)
+
+
+def estimate_room(build: Build, table, count: int, ranged: Optional[Dict] = None, trials: int = 100_000,
+                  rng: Optional[np.random.Generator] = None, distance: float = 4.0) -> CombatEstimate:
+    """
+    Estimate fights against rooms of ``count`` enemies rolled from a SpawnTable.
+
+    Every trial rolls its own composition, elites included, the way
+    GameState.populate_room() would; ``ranged`` (the registry's map of
+    RangedAttack per archetype) gives ranged archetypes their reach.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    attacks = [(ranged or {}).get(name) for name in table.names]
+    reaches = np.array([ATTACK_RANGE if a is None else a.range for a in attacks])
+    shot_speeds = np.array([0.0 if a is None else a.speed for a in attacks])
+    parts = []
+    for start in range(0, trials, TRIAL_CHUNK):
+        kinds, elite = table.roll(rng, (min(TRIAL_CHUNK, trials - start), count))
+        hp, damage = table.stats(kinds, elite)
+        parts.append(simulate_fights(build, hp, damage, table.speed[kinds], reaches[kinds],
+                                     shot_speeds[kinds], rng, distance))
+    return concatenate(parts)
+
+
+def concatenate(parts: Sequence[CombatEstimate]) -> CombatEstimate:
+    """Join the estimates of several batches of trials."""
+    if not parts:
+        return CombatEstimate(np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool))
+    return CombatEstimate(*(np.concatenate(column) for column in zip(*parts)))
@@ -0,0 +1,283 @@
+"""Struct-of-arrays storage for enemies in an active fight."""
+
+import random
+import numpy as np
+from typing import List, Optional, Tuple
+
+from core.game_state import Enemy
+from core.handles import HandleRegistry
+from core.spatial import SpatialHash, close_pairs
+from core.pathfinding import FlowField
+from core.combat_model import TELEGRAPH_TIME, ATTACK_COOLDOWN, ATTACK_RANGE, INITIAL_COOLDOWN
+
+
+SEPARATION_RADIUS = 0.8  # tiles; closer enemies push each other apart
+SEPARATION_STRENGTH = 3.0  # tiles per second at full overlap
+
+
+class EnemyView:
+    """One pooled enemy's live hp by handle, for code written against Enemy-like objects."""
+
+    __slots__ = ("pool", "handle")
+
+    def __init__(self, pool: "EnemyPool", handle: int):
+        """View the enemy ``handle`` of ``pool``."""
+        self.pool = pool
+        self.handle = handle
+
+    @property
+    def hp(self) -> float:
+        """Current hp."""
+        return float(self.pool.hp[self.pool.row(self.handle)])
+
+    @hp.setter
+    def hp(self, value: float):
+        """Set the current hp."""
+        self.pool.hp[self.pool.row(self.handle)] = value
+
+    @property
+    def max_hp(self) -> float:
+        """Maximum hp."""
+        return float(self.pool.max_hp[self.pool.row(self.handle)])
+
+
+class EnemyPool:
+    """
+    Enemies of the current fight stored as parallel NumPy arrays.
+
+    Row i of every array (and of ``enemies``, which keeps the source
+    Enemy records for type, elite flag and modifiers) describes the same
+    enemy. Only the first ``count`` rows are live. Movement, telegraph
+    countdown and attack resolution are batched array operations rather
+    than per-enemy Python loops. ``spatial`` hashes live positions for
+    local queries; update() rebuilds it once per step, after movement and
+    separation, and spawn() after adding.
+
+    Rows move when enemies are removed (the last row fills the hole), so
+    anything that must outlive a removal or a mid-fight spawn holds the
+    enemy's handle from ``registry`` and looks its row up with row().
+    """
+
+    COLUMNS = ("x", "y", "prev_x", "prev_y", "hp", "max_hp", "speed",
+               "damage", "cooldown", "telegraph", "reach", "shot_speed")
+
+    def __init__(self, capacity: int = 32):
+        """Allocate arrays for ``capacity`` enemies."""
+        self.count = 0
+        self.capacity = 0
+        self.enemies: List[Enemy] = []
+        self.registry = HandleRegistry()
+        self.spatial = SpatialHash(cell_size=2.0)
+        self.elite = np.zeros(0, dtype=bool)
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(0, dtype=np.float64))
+        self.reserve(capacity)
+
+    def reserve(self, capacity: int):
+        """Grow the arrays to hold at least ``capacity`` enemies."""
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, self.capacity * 2)
+        for name in self.COLUMNS + ("elite",):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def load(self, enemies: List[Enemy]):
+        """Replace the pool contents with ``enemies``."""
+        self.count = 0
+        self.enemies = []
+        self.registry.clear()
+        self.reserve(len(enemies))
+        for enemy in enemies:
+            self.add(enemy)
+        self.reindex()
+
+    def add(self, enemy: Enemy) -> int:
+        """Append an enemy and return its handle; call reindex() once done adding."""
+        self.reserve(self.count + 1)
+        i = self.count
+        self.x[i] = self.prev_x[i] = enemy.x
+        self.y[i] = self.prev_y[i] = enemy.y
+        self.hp[i] = enemy.hp
+        self.max_hp[i] = enemy.max_hp
+        self.speed[i] = enemy.speed
+        self.damage[i] = enemy.damage
+        self.elite[i] = enemy.is_elite
+        self.cooldown[i] = random.uniform(*INITIAL_COOLDOWN)
+        self.telegraph[i] = 0.0
+        self.reach[i] = ATTACK_RANGE
+        self.shot_speed[i] = 0.0
+        self.enemies.append(enemy)
+        self.count += 1
+        return self.registry.create()
+
+    def arm(self, row: int, shot_speed: float, reach: float):
+        """Make the enemy at ``row`` attack with projectiles from up to ``reach`` tiles."""
+        self.shot_speed[row] = shot_speed
+        self.reach[row] = reach
+
+    def spawn(self, enemy: Enemy) -> int:
+        """Add an enemy in the middle of a fight and return its handle."""
+        handle = self.add(enemy)
+        self.reindex()
+        return handle
+
+    def __len__(self) -> int:
+        """Number of live enemies."""
+        return self.count
+
+    def row(self, handle: int) -> int:
+        """Return the current row of ``handle``, or -1 if that enemy is gone."""
+        return self.registry.row(handle)
+
+    def handle(self, row: int) -> int:
+        """Return the handle of the enemy at ``row``."""
+        return self.registry.handles[row]
+
+    def get(self, handle: int) -> Optional[Enemy]:
+        """Return the Enemy record of ``handle``, or None if it is gone."""
+        row = self.registry.row(handle)
+        return self.enemies[row] if row >= 0 else None
+
+    def view(self, handle: int) -> EnemyView:
+        """Return a view of the live stats of enemy ``handle``."""
+        return EnemyView(self, handle)
+
+    def remove(self, handle: int) -> Enemy:
+        """Swap-remove the enemy ``handle`` and return its record; call reindex() once done removing."""
+        row, last = self.registry.remove(handle)
+        enemy = self.enemies[row]
+        if row != last:
+            for name in self.COLUMNS + ("elite",):
+                column = getattr(self, name)
+                column[row] = column[last]
+            self.enemies[row] = self.enemies[last]
+        self.enemies.pop()
+        self.count -= 1
+        return enemy
+
+    def remove_dead(self) -> List[Enemy]:
+        """Remove enemies with hp <= 0 and return their records; update() reindexes."""
+        dead_rows = np.flatnonzero(self.hp[:self.count] <= 0)
+        if not len(dead_rows):
+            return []
+
+        # Highest rows first, so the row moved into each hole is a live one
+        handles = self.registry.handles
+        dead = [self.remove(handles[row]) for row in dead_rows[::-1].tolist()]
+        dead.reverse()
+        return dead
+
+    def reindex(self):
+        """Rebuild the spatial hash from the live positions."""
+        self.spatial.rebuild(self.x[:self.count], self.y[:self.count])
+
+    def update(self, dt: float, px: float, py: float,
+               field: Optional[FlowField] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Advance every enemy by ``dt`` toward the player at (px, py).
+
+        Enemies out of their reach follow ``field`` (a flow field to the player's
+        tile) around obstacles, or move straight at the player once next to
+        it, off the field or when no field is given. Enemies in range
+        whose cooldown has expired wind up a telegraph and attack when it
+        runs out. Returns the rows that started a telegraph and the rows
+        whose attack lands this step.
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        cooldown = self.cooldown[:n]
+        telegraph = self.telegraph[:n]
+
+        # Attack cooldowns
+        np.subtract(cooldown, dt, out=cooldown, where=cooldown > 0)
+
+        # Distance to player
+        dx = px - x
+        dy = py - y
+        dist = np.hypot(dx, dy)
+
+        # Move towards player
+        moving = dist > self.reach[:n]
+        step = np.zeros(n)
+        np.divide(self.speed[:n] * dt, dist, out=step, where=moving)
+        step_x = dx * step
+        step_y = dy * step
+
+        if field is not None:
+            dir_x, dir_y, path = field.sample(x, y)
+            follow = moving & np.isfinite(path) & (path > 1.5)
+            speed = self.speed[:n] * dt
+            step_x[follow] = dir_x[follow] * speed[follow]
+            step_y[follow] = dir_y[follow] * speed[follow]
+
+        x += step_x
+        y += step_y
+
+        # Keep enemies from stacking on one another
+        self.separate(dt)
+        self.reindex()
+
+        # In range and can attack: telegraph, then strike
+        ready = ~moving & (cooldown <= 0)
+        starting = ready & (telegraph == 0)
+        telegraph[starting] = TELEGRAPH_TIME
+        telegraph[ready] -= dt
+
+        attacking = ready & (telegraph <= 0)
+        cooldown[attacking] = ATTACK_COOLDOWN
+        telegraph[attacking] = 0.0
+
+        return np.flatnonzero(starting), np.flatnonzero(attacking)
+
+    def separate(self, dt: float):
+        """Push overlapping enemies apart so they do not stack on the player."""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        i, j = close_pairs(x, y, SEPARATION_RADIUS)
+        if not len(i):
+            return
+
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        dist = np.hypot(dx, dy)
+        # Exactly stacked: split along a fixed axis by index
+        stacked = dist == 0
+        dx[stacked] = np.where(i[stacked] < j[stacked], 1.0, -1.0)
+        dist[stacked] = 1.0
+        push = (SEPARATION_RADIUS - dist) / SEPARATION_RADIUS / dist * SEPARATION_STRENGTH * dt
+        x += np.bincount(i, dx * push, minlength=n)
+        y += np.bincount(i, dy * push, minlength=n)
+
+    def nearest(self, px: float, py: float, max_range: float) -> int:
+        """Return the row of the nearest enemy within ``max_range``, or -1."""
+        return self.spatial.nearest(px, py, max_range)
+
+    def snapshot(self) -> tuple:
+        """Copy the live columns for a later restore()."""
+        n = self.count
+        columns = tuple(getattr(self, name)[:n].copy() for name in self.COLUMNS + ("elite",))
+        return n, tuple(self.enemies), columns, self.registry.snapshot()
+
+    def restore(self, snap: tuple):
+        """Return to a snapshot taken by snapshot()."""
+        n, enemies, columns, registry = snap
+        self.reserve(n)
+        for name, column in zip(self.COLUMNS + ("elite",), columns):
+            getattr(self, name)[:n] = column
+        self.enemies[:] = enemies  # in place: the fight's room shares this list
+        self.registry.restore(registry)
+        self.count = n
+        self.reindex()
+
+    def sync(self):
+        """Write positions and hp back to the Enemy records."""
+        for i, enemy in enumerate(self.enemies):
+            enemy.x = float(self.x[i])
+            enemy.y = float(self.y[i])
+            enemy.hp = int(self.hp[i])
@@ -0,0 +1,179 @@
+"""Buffered, levelled structured event log."""
+
+import sys
+import threading
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Level(IntEnum):
+    """Event severity levels."""
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    OFF = 100
+
+
+class GameEvent(NamedTuple):
+    """A single logged event; the message is formatted lazily from the payload."""
+    level: Level
+    channel: str
+    message: str
+    payload: Dict[str, Any]
+    phase: Any
+    frame: int
+
+    @property
+    def text(self) -> str:
+        """Return the message formatted with its payload."""
+        return self.message.format(**self.payload) if self.payload else self.message
+
+
+def print_sink(event: GameEvent):
+    """Default sink writing one line per event to stdout."""
+    sys.stdout.write(event.text + "\n")
+
+
+def _noop(*args, **kwargs):
+    """Stand-in for logging methods below the active level."""
+    pass
+
+
+class EventLog:
+    """
+    Structured event channel on a preallocated ring buffer.
+
+    Emitting stores an event tuple in the next slot and never blocks on
+    I/O; a background thread drains new events to the sink. When the
+    buffer wraps before a flush, the oldest events are dropped and
+    counted. Logging methods below the active level are rebound to a
+    no-op, so disabled channels cost a single call.
+    """
+
+    def __init__(self, capacity: int = 4096, level: Level = Level.INFO,
+                 sink: Optional[Callable[[GameEvent], None]] = None,
+                 flush_interval: float = 0.25):
+        """Initialize the log with ``capacity`` preallocated slots."""
+        self.capacity = capacity
+        self.buffer: List[Optional[GameEvent]] = [None] * capacity
+        self.head = 0       # total events written
+        self.flushed = 0    # total events handed to the sink (or dropped)
+        self.dropped = 0
+        self.sink = sink
+        self.flush_interval = flush_interval
+
+        # Context stamped onto each event
+        self.phase = None
+        self.frame = 0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.level = Level.OFF
+        self.set_level(level)
+
+    def set_level(self, level: Level):
+        """Set the minimum level recorded; ``Level.OFF`` disables the log."""
+        self.level = Level(level)
+        for name, method_level in (("debug", Level.DEBUG),
+                                   ("info", Level.INFO),
+                                   ("warning", Level.WARNING)):
+            if method_level < self.level:
+                setattr(self, name, _noop)
+            else:
+                self.__dict__.pop(name, None)
+        if self.level >= Level.OFF:
+            self.log = _noop
+        else:
+            self.__dict__.pop("log", None)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any events are being recorded."""
+        return self.level < Level.OFF
+
+    def log(self, level: Level, channel: str, message: str, **payload):
+        """Record an event; ``message`` is a str.format template over ``payload``."""
+        if level < self.level:
+            return
+        head = self.head
+        self.buffer[head % self.capacity] = GameEvent(
+            level, channel, message, payload, self.phase, self.frame)
+        self.head = head + 1
+
+    def debug(self, channel: str, message: str, **payload):
+        """Record a DEBUG event."""
+        self.log(Level.DEBUG, channel, message, **payload)
+
+    def info(self, channel: str, message: str, **payload):
+        """Record an INFO event."""
+        self.log(Level.INFO, channel, message, **payload)
+
+    def warning(self, channel: str, message: str, **payload):
+        """Record a WARNING event."""
+        self.log(Level.WARNING, channel, message, **payload)
+
+    def recent(self, channel: Optional[str] = None,
+               limit: Optional[int] = None) -> List[GameEvent]:
+        """Return buffered events, oldest first, optionally filtered by channel."""
+        head = self.head
+        start = max(0, head - self.capacity)
+        events = []
+        for i in range(head - 1, start - 1, -1):
+            event = self.buffer[i % self.capacity]
+            if event is None or (channel is not None and event.channel != channel):
+                continue
+            events.append(event)
+            if limit is not None and len(events) >= limit:
+                break
+        events.reverse()
+        return events
+
+    def messages(self, channel: Optional[str] = None,
+                 limit: Optional[int] = None) -> List[str]:
+        """Return formatted messages of buffered events."""
+        return [event.text for event in self.recent(channel, limit)]
+
+    def flush(self):
+        """Hand all events written since the last flush to the sink."""
+        with self._lock:
+            head = self.head
+            if head - self.flushed > self.capacity:
+                self.dropped += head - self.flushed - self.capacity
+                self.flushed = head - self.capacity
+            if self.sink is not None:
+                for i in range(self.flushed, head):
+                    event = self.buffer[i % self.capacity]
+                    if event is not None:
+                        self.sink(event)
+            self.flushed = head
+
+    def clear(self):
+        """Flush pending events and empty the buffer."""
+        self.flush()
+        with self._lock:
+            self.buffer = [None] * self.capacity
+            self.head = 0
+            self.flushed = 0
+
+    def start(self):
+        """Start the background flush thread."""
+        if self._thread is not None or self.sink is None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and flush anything left."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        """Background flush loop."""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
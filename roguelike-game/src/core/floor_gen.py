@@ -0,0 +1,128 @@
+"""Floor layout generation."""
+
+import math
+import random
+from collections import deque
+from typing import List, NamedTuple, Set, Tuple
+
+
+class FloorLayout(NamedTuple):
+    """Room rectangles, types and connections for one floor."""
+    rects: List[Tuple[int, int, int, int]]  # (x, y, width, height)
+    room_types: List[str]
+    connections: List[Set[int]]
+    boss_index: int
+
+
+class FloorGenerator:
+    """
+    Lays out floors of any size without overlap checks or retries.
+
+    Rooms are packed one per cell of a near-square grid; each cell is a
+    wall tile wider than the largest room on every side, so rooms can be
+    sized and offset freely inside their cell and never touch. Rooms are
+    connected by a random spanning tree over neighbouring cells plus a few
+    extra edges for loops, which keeps every room reachable, and the boss
+    goes in the room farthest from the start. Every step is linear in the
+    number of rooms and draws only from the given rng.
+    """
+
+    def __init__(self, min_size: int, max_size: int):
+        """Create a generator for rooms of ``min_size``-``max_size`` tiles."""
+        self.min_size = min_size
+        self.max_size = max_size
+        self.cell = max_size + 2
+
+    def generate(self, count: int, rng: random.Random) -> FloorLayout:
+        """Lay out ``count`` rooms; room 0 is the start room."""
+        cols = max(1, math.ceil(math.sqrt(count)))
+        rects = [self.place(i, cols, rng) for i in range(count)]
+        connections = self.connect(count, cols, rng)
+
+        # The boss room is the one farthest from the start
+        depth = self.depths(connections)
+        boss_index = max(range(count), key=lambda i: (depth[i], i)) if count > 1 else -1
+
+        room_types = []
+        for i in range(count):
+            if i == 0:
+                room_types.append("start")
+            elif i == boss_index:
+                room_types.append("boss")
+            elif rng.random() < 0.1:
+                room_types.append("shop")
+            elif rng.random() < 0.2:
+                room_types.append("treasure")
+            else:
+                room_types.append("standard")
+
+        return FloorLayout(rects, room_types, connections, boss_index)
+
+    def place(self, index: int, cols: int, rng: random.Random) -> Tuple[int, int, int, int]:
+        """Size a room and offset it inside its grid cell."""
+        width = rng.randint(self.min_size, self.max_size)
+        height = rng.randint(self.min_size, self.max_size)
+        x = (index % cols) * self.cell + rng.randint(0, self.max_size - width)
+        y = (index // cols) * self.cell + rng.randint(0, self.max_size - height)
+        return x, y, width, height
+
+    def neighbours(self, index: int, count: int, cols: int) -> List[int]:
+        """Return the occupied grid cells beside ``index``."""
+        col = index % cols
+        result = []
+        if col > 0:
+            result.append(index - 1)
+        if col < cols - 1 and index + 1 < count:
+            result.append(index + 1)
+        if index >= cols:
+            result.append(index - cols)
+        if index + cols < count:
+            result.append(index + cols)
+        return result
+
+    def connect(self, count: int, cols: int, rng: random.Random) -> List[Set[int]]:
+        """Join rooms with a random spanning tree plus extra loop edges."""
+        connections: List[Set[int]] = [set() for _ in range(count)]
+        if count == 0:
+            return connections
+
+        # Randomized depth-first walk over the grid
+        visited = [False] * count
+        visited[0] = True
+        stack = [0]
+        while stack:
+            current = stack[-1]
+            options = [n for n in self.neighbours(current, count, cols) if not visited[n]]
+            if not options:
+                stack.pop()
+                continue
+            nxt = rng.choice(options)
+            visited[nxt] = True
+            connections[current].add(nxt)
+            connections[nxt].add(current)
+            stack.append(nxt)
+
+        # Add some extra connections for variety
+        for _ in range(count // 3):
+            room = rng.randrange(count)
+            other = rng.choice(self.neighbours(room, count, cols) or [room])
+            if other != room:
+                connections[room].add(other)
+                connections[other].add(room)
+
+        return connections
+
+    def depths(self, connections: List[Set[int]]) -> List[int]:
+        """Breadth-first hop count from room 0 to every room."""
+        depth = [-1] * len(connections)
+        if not connections:
+            return depth
+        depth[0] = 0
+        queue = deque([0])
+        while queue:
+            current = queue.popleft()
+            for n in connections[current]:
+                if depth[n] < 0:
+                    depth[n] = depth[current] + 1
+                    queue.append(n)
+        return depth
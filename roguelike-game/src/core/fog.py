@@ -0,0 +1,100 @@
+"""Bitmap fog of war for a single floor."""
+
+import functools
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+@functools.lru_cache(maxsize=8)
+def vision_stencil(radius: int) -> np.ndarray:
+    """Return a read-only (2r+1, 2r+1) mask of tiles within ``radius``."""
+    offsets = np.arange(-radius, radius + 1)
+    stencil = offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius ** 2
+    stencil.setflags(write=False)
+    return stencil
+
+
+class FogOfWar:
+    """
+    Revealed tiles of one floor as a NumPy boolean grid.
+
+    The grid is indexed [row, col] and covers the floor bounds starting at
+    tile (origin_x, origin_y). Revealing ORs a cached circular stencil into
+    the grid, and is skipped entirely while the player's tile and vision
+    range are unchanged. ``version`` increments whenever the grid changes so
+    renderers can cache what they draw from it.
+    """
+
+    def __init__(self, origin_x: int, origin_y: int, width: int, height: int):
+        """Create a fully fogged grid."""
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.grid = np.zeros((height, width), dtype=bool)
+        self.version = 0
+        self.last_reveal: Optional[Tuple[int, int, int]] = None
+
+    @classmethod
+    def for_rooms(cls, rooms: List) -> "FogOfWar":
+        """Create a grid covering the bounding box of ``rooms``."""
+        if not rooms:
+            return cls(0, 0, 0, 0)
+        left = min(room.x for room in rooms)
+        top = min(room.y for room in rooms)
+        right = max(room.x + room.width for room in rooms)
+        bottom = max(room.y + room.height for room in rooms)
+        return cls(left, top, right - left, bottom - top)
+
+    @classmethod
+    def for_tiles(cls, tiles) -> "FogOfWar":
+        """Create a grid matching a floor's TileMap."""
+        return cls(tiles.origin_x, tiles.origin_y, tiles.width, tiles.height)
+
+    @property
+    def width(self) -> int:
+        """Grid width in tiles."""
+        return self.grid.shape[1]
+
+    @property
+    def height(self) -> int:
+        """Grid height in tiles."""
+        return self.grid.shape[0]
+
+    def reveal(self, x: float, y: float, radius: int) -> bool:
+        """
+        Reveal every tile within ``radius`` of tile (x, y).
+
+        Returns False without touching the grid if neither the tile nor
+        the radius changed since the last call.
+        """
+        px = int(x)
+        py = int(y)
+        if self.last_reveal == (px, py, radius):
+            return False
+        self.last_reveal = (px, py, radius)
+
+        # Stencil bounds in grid coordinates, clipped to the grid
+        col = px - self.origin_x - radius
+        row = py - self.origin_y - radius
+        size = 2 * radius + 1
+        c0, r0 = max(col, 0), max(row, 0)
+        c1, r1 = min(col + size, self.width), min(row + size, self.height)
+        if c0 >= c1 or r0 >= r1:
+            return False
+
+        stencil = vision_stencil(radius)
+        window = self.grid[r0:r1, c0:c1]
+        window |= stencil[r0 - row:r1 - row, c0 - col:c1 - col]
+        self.version += 1
+        return True
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        """Check whether tile (x, y) has been seen."""
+        col = x - self.origin_x
+        row = y - self.origin_y
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return bool(self.grid[row, col])
+        return False
+
+    def revealed_count(self) -> int:
+        """Number of revealed tiles."""
+        return int(np.count_nonzero(self.grid))
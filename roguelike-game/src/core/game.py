@@ -1,11 +1,15 @@
 """Main game class implementing the core loop."""
 
 import pygame
-from typing import Optional
+import random
+from typing import Any, Callable, NamedTuple, Optional
 from enum import Enum, auto
 
 from core.settings import Settings
-from core.game_state import GameState
+from core.game_state import GameState, Snapshot
+from core.event_log import print_sink
+from core.input import InputSource, PygameInput, ScriptedInput
+from core.profiler import FrameProfiler
 from systems.exploration import ExplorationSystem
 from systems.combat import CombatSystem
 from systems.choice import ChoiceSystem
@@ -16,6 +20,7 @@ from systems.economy import EconomySystem
 from systems.reset import ResetSystem
 from ui.renderer import Renderer
 from ui.hud import HUD
+from ui.profiler_overlay import ProfilerOverlay
 
 
 class GamePhase(Enum):
@@ -30,22 +35,55 @@ class GamePhase(Enum):
     RESET = auto()
 
 
+class GameSnapshot(NamedTuple):
+    """Copy of a running game taken by Game.snapshot()."""
+    state: Snapshot
+    combat: tuple
+    phase: GamePhase
+    frame: int
+    rng: Any  # random.getstate()
+
+
 class Game:
     """Main game class managing the core loop."""
     
-    def __init__(self, settings: Settings):
-        """Initialize the game with given settings."""
+    def __init__(self, settings: Settings, headless: bool = False,
+                 input_source: Optional[InputSource] = None):
+        """
+        Initialize the game with given settings.
+        
+        A headless game opens no window, builds no Renderer or HUD and is
+        advanced explicitly through step()/simulate() instead of run().
+        """
         self.settings = settings
-        self.screen = pygame.display.set_mode(
-            (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
-        )
-        pygame.display.set_caption(settings.TITLE)
-        self.clock = pygame.time.Clock()
+        self.headless = headless
+        if headless:
+            self.screen = None
+            self.clock = None
+        else:
+            self.screen = pygame.display.set_mode(
+                (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+            )
+            pygame.display.set_caption(settings.TITLE)
+            self.clock = pygame.time.Clock()
         self.running = True
+        self.frame = 0
+        self.previous_positions = {}
+        self.profiler = FrameProfiler(settings.PROFILER_WINDOW, settings.PROFILER_ENABLED)
+        
+        # Input source (live keyboard or a synthetic policy)
+        if input_source is None:
+            input_source = ScriptedInput() if headless else PygameInput()
+        self.input = input_source
         
         # Initialize game state
         self.state = GameState(settings)
         self.current_phase = GamePhase.EXPLORE
+        self.state.current_phase = self.current_phase
+        self.state.events.phase = self.current_phase
+        if not headless:
+            self.state.events.sink = print_sink
+            self.state.events.start()
         
         # Initialize systems
         self.exploration = ExplorationSystem(self.state, settings)
@@ -57,9 +95,19 @@ class Game:
         self.economy = EconomySystem(self.state, settings)
         self.reset = ResetSystem(self.state, settings)
         
+        for system in (self.exploration, self.combat, self.choice, self.powerup,
+                       self.risk_reward, self.escalation, self.economy, self.reset):
+            system.input = self.input
+        
         # Initialize UI
-        self.renderer = Renderer(self.screen, settings)
-        self.hud = HUD(self.screen, settings)
+        if headless:
+            self.renderer = None
+            self.hud = None
+            self.profiler_overlay = None
+        else:
+            self.renderer = Renderer(self.screen, settings)
+            self.hud = HUD(self.screen, settings)
+            self.profiler_overlay = ProfilerOverlay(self.screen, settings)
         
         # Phase management
         self.phase_handlers = {
@@ -72,30 +120,131 @@ class Game:
             GamePhase.CASH_OUT: self.handle_cashout,
             GamePhase.RESET: self.handle_reset,
         }
+        
+        self.input.attach(self)
+        
+        # Enter the starting phase
+        self.exploration.enter()
     
     def run(self):
-        """Main game loop."""
+        """
+        Main game loop.
+        
+        Simulation advances in fixed steps of 1 / SIM_TICK_RATE seconds,
+        decoupled from the render rate. Leftover time between steps is used
+        to interpolate entity positions when rendering, and the number of
+        catch-up steps per frame is capped so a slow frame cannot snowball.
+        """
+        sim_dt = 1.0 / self.settings.SIM_TICK_RATE
+        max_steps = self.settings.MAX_SIM_STEPS_PER_FRAME
+        accumulator = 0.0
+        
         while self.running:
-            dt = self.clock.tick(self.settings.FPS) / 1000.0  # Delta time in seconds
+            frame_time = self.clock.tick(self.settings.FPS) / 1000.0  # Seconds since last frame
+            accumulator += frame_time
+            self.profiler.begin_frame(self.current_phase)
             
-            # Handle events
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == self.settings.KEY_PAUSE:
-                        self.toggle_pause()
+            # Run fixed simulation steps
+            steps = 0
+            while accumulator >= sim_dt and steps < max_steps and self.running:
+                self.capture_positions()
+                self.step(sim_dt)
+                accumulator -= sim_dt
+                steps += 1
             
-            # Update current phase
-            if not self.state.paused:
-                self.phase_handlers[self.current_phase](dt, events)
+            # Drop backlog the sim could not catch up on
+            if steps == max_steps and accumulator >= sim_dt:
+                accumulator = accumulator % sim_dt
             
             # Render
+            self.renderer.set_interpolation(self.previous_positions, accumulator / sim_dt)
             self.render()
             
             # Update display
-            pygame.display.flip()
+            with self.profiler.section("flip"):
+                self.present()
+            self.profiler.end_frame()
+        
+        if self.settings.PROFILE_DUMP_PATH:
+            self.profiler.dump(self.settings.PROFILE_DUMP_PATH)
+        self.combat.exit()
+        self.state.events.stop()
+        self.escalation.prefetcher.shutdown()
+        self.escalation.saves.shutdown()
+    
+    def capture_positions(self):
+        """
+        Record the player's position before a simulation step for interpolation.
+        
+        Enemy positions are kept by the combat EnemyPool itself.
+        """
+        self.previous_positions = {id(self.state.player): (self.state.player.x, self.state.player.y)}
+    
+    def step(self, dt: float):
+        """Advance the simulation by one update of ``dt`` seconds."""
+        self.profiler.set_phase(self.current_phase)
+        self.state.events.frame = self.frame
+        
+        # Handle events
+        with self.profiler.section("events"):
+            events = self.input.poll()
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == self.settings.KEY_PAUSE:
+                    self.toggle_pause()
+                elif event.key == self.settings.KEY_PROFILER and self.profiler_overlay:
+                    self.profiler_overlay.toggle()
+        
+        # Update current phase
+        if not self.state.paused:
+            with self.profiler.section("update"):
+                self.phase_handlers[self.current_phase](dt, events)
+        
+        self.frame += 1
+    
+    def simulate(self, steps: int, dt: Optional[float] = None,
+                 until: Optional[Callable[["Game"], bool]] = None) -> int:
+        """
+        Run up to ``steps`` updates back to back with a fixed ``dt``.
+        
+        No rendering or frame pacing is done, so this runs as fast as the
+        systems allow. Stops early when the game stops running or when
+        ``until(game)`` returns True. Returns the number of steps taken.
+        """
+        if dt is None:
+            dt = 1.0 / self.settings.SIM_TICK_RATE
+        
+        taken = 0
+        while taken < steps and self.running:
+            self.step(dt)
+            taken += 1
+            if until is not None and until(self):
+                break
+        return taken
+    
+    def snapshot(self) -> GameSnapshot:
+        """
+        Capture the game for a later restore(), mid-fight included.
+        
+        Covers the GameState, the fight, the phase, the frame counter and
+        the global random state, so a restored game replays the same steps
+        for the same input. Scripted policies keep their own state.
+        """
+        return GameSnapshot(self.state.snapshot(), self.combat.snapshot(), self.current_phase,
+                            self.frame, random.getstate())
+    
+    def restore(self, snap: GameSnapshot):
+        """Return to a snapshot; the same snapshot can be restored any number of times."""
+        self.escalation.prefetcher.reset()
+        self.state.restore(snap.state)
+        self.combat.restore(snap.combat)
+        self.current_phase = snap.phase
+        self.state.current_phase = snap.phase
+        self.state.events.phase = snap.phase
+        self.frame = snap.frame
+        random.setstate(snap.rng)
     
     def handle_explore(self, dt: float, events: list):
         """Handle exploration phase."""
@@ -110,6 +259,9 @@ class Game:
                 self.transition_to(GamePhase.CHOOSE)
             elif self.state.shop_available():
                 self.transition_to(GamePhase.CASH_OUT)
+        elif self.settings.AUTO_ESCALATE and self.state.floor_cleared():
+            # Every room cleared: escalate to the next floor
+            self.transition_to(GamePhase.ESCALATE)
     
     def handle_fight(self, dt: float, events: list):
         """Handle combat phase."""
@@ -192,11 +344,15 @@ class Game:
     
     def transition_to(self, phase: GamePhase):
         """Transition to a new game phase."""
-        print(f"Transitioning from {self.current_phase.name} to {phase.name}")
+        self.state.events.info("phase", "Transitioning from {old} to {new}",
+                               old=self.current_phase.name, new=phase.name)
+        if self.current_phase == GamePhase.FIGHT and phase != GamePhase.FIGHT:
+            self.combat.exit()
         self.current_phase = phase
         
         # Notify systems of phase change
         self.state.current_phase = phase
+        self.state.events.phase = phase
         
         # Phase-specific initialization
         if phase == GamePhase.EXPLORE:
@@ -207,8 +363,10 @@ class Game:
             self.choice.enter()
         elif phase == GamePhase.POWER_UP:
             self.powerup.enter()
+            self.escalation.prefetch_next_floor()
         elif phase == GamePhase.PUSH_LUCK:
             self.risk_reward.enter()
+            self.escalation.prefetch_next_floor()
         elif phase == GamePhase.ESCALATE:
             self.escalation.enter()
         elif phase == GamePhase.CASH_OUT:
@@ -216,16 +374,70 @@ class Game:
         elif phase == GamePhase.RESET:
             self.reset.enter()
     
+    def load_game(self, slot: int = 0):
+        """Resume a saved run in the exploration phase."""
+        self.escalation.saves.load(self.state, slot)
+        self.state.events.info("phase", "Loaded save from floor {floor}", floor=self.state.current_floor)
+        if self.renderer:
+            self.renderer.invalidate()
+        self.transition_to(GamePhase.EXPLORE)
+    
     def toggle_pause(self):
         """Toggle game pause state."""
         self.state.paused = not self.state.paused
+        if self.renderer:
+            self.renderer.invalidate()
     
     def render(self):
         """Render the game."""
-        # Clear screen
-        self.screen.fill(self.settings.BLACK)
+        if self.headless:
+            return
+        
+        renderer = self.renderer
+        dirty = renderer.dirty_rendering
+        if dirty:
+            # Nothing moves while paused; keep the overlay on screen
+            if self.state.paused and not renderer.invalidated:
+                renderer.skip_frame()
+                return
+            renderer.begin_frame()
+        else:
+            # Clear screen
+            self.screen.fill(self.settings.BLACK)
         
         # Render based on current phase
+        with self.profiler.section("render.phase"):
+            self.render_phase()
+        
+        # Render HUD on top
+        with self.profiler.section("render.hud"):
+            force = (not dirty or renderer.full_redraw
+                     or self.hud.rect.collidelist(renderer.frame_rects()) != -1)
+            hud_rect = self.hud.render(self.state, force)
+            if hud_rect:
+                renderer.mark_dirty(hud_rect)
+        
+        # Render pause overlay if needed
+        if self.state.paused:
+            self.render_pause_overlay()
+        
+        # Frame timing overlay
+        if self.profiler_overlay.visible:
+            with self.profiler.section("render.overlay"):
+                renderer.track(self.profiler_overlay.render(self.profiler, self.current_phase))
+    
+    def present(self):
+        """Push the frame to the display."""
+        renderer = self.renderer
+        if renderer.dirty_rendering and not renderer.full_redraw:
+            rects = renderer.frame_rects()
+            if rects:
+                pygame.display.update(rects)
+        else:
+            pygame.display.flip()
+    
+    def render_phase(self):
+        """Render the active phase's system."""
         if self.current_phase == GamePhase.EXPLORE:
             self.exploration.render(self.renderer)
         elif self.current_phase == GamePhase.FIGHT:
@@ -242,13 +454,6 @@ class Game:
             self.economy.render(self.renderer)
         elif self.current_phase == GamePhase.RESET:
             self.reset.render(self.renderer)
-        
-        # Render HUD on top
-        self.hud.render(self.state)
-        
-        # Render pause overlay if needed
-        if self.state.paused:
-            self.render_pause_overlay()
     
     def render_pause_overlay(self):
         """Render pause screen overlay."""
@@ -1,9 +1,23 @@
 """Central game state management."""
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, NamedTuple, Optional, Set, Tuple
 from enum import Enum, auto
+import operator
+from collections import deque
 import random
+import numpy as np
+
+from core.archetypes import load_archetypes
+from core.event_log import EventLog, Level
+from core.floor_gen import FloorGenerator
+from core.fog import FogOfWar
+from core.room_graph import RoomGraph
+from core.spatial import RoomIndex
+from core.tilemap import TileMap
+from core.pathfinding import FlowFieldCache
+from core.pooling import ObjectPool, PoolCounts, full_collections
+from core.modifiers import ModifierChain, compile_chain
 
 
 class Biome(Enum):
@@ -70,20 +84,104 @@ class Room:
     room_type: str
     discovered: bool = False
     cleared: bool = False
-    connections: List[int] = field(default_factory=list)
+    connections: Set[int] = field(default_factory=set)
+    spawn_seed: int = 0
+    spawn_count: int = 0  # enemies still to be rolled on discovery
     enemies: List[Enemy] = field(default_factory=list)
     items: List[Dict] = field(default_factory=list)
 
 
+# Fields that change after generation, captured by GameState.snapshot()
+# Everything a pooled room or enemy can be reused with, so restore() undoes reuse too
+ROOM_STATE = ("x", "y", "width", "height", "room_type", "connections", "spawn_seed",
+              "discovered", "cleared", "spawn_count")
+ENEMY_STATE = ("x", "y", "hp", "max_hp", "damage", "speed", "enemy_type", "is_elite")
+room_state = operator.attrgetter(*ROOM_STATE)
+enemy_state = operator.attrgetter(*ENEMY_STATE)
+
+
+def freeze_fields(obj) -> Dict[str, Any]:
+    """Copy an object's attributes, turning list values into tuples."""
+    return {k: tuple(v) if type(v) is list else v for k, v in vars(obj).items()}
+
+
+def thaw_fields(obj, fields: Dict[str, Any]):
+    """Write back frozen attributes as fresh lists."""
+    vars(obj).update({k: list(v) if type(v) is tuple else v for k, v in fields.items()})
+
+
+def new_room() -> Room:
+    """Blank room for the room pool."""
+    return Room(0, 0, 0, 0, "")
+
+
+def reset_room(room: Room):
+    """Return a released room to its freshly generated state."""
+    room.discovered = False
+    room.cleared = False
+    room.enemies.clear()
+    room.items.clear()
+    room.spawn_count = 0
+
+
+def new_enemy() -> Enemy:
+    """Blank enemy for the enemy pool."""
+    return Enemy(x=0.0, y=0.0, hp=0, max_hp=0, damage=0, speed=0.0, enemy_type="")
+
+
+def reset_enemy(enemy: Enemy):
+    """Return a released enemy to its freshly rolled state."""
+    enemy.is_elite = False
+    enemy.modifiers.clear()
+
+
+class FloorAllocations(NamedTuple):
+    """Entity allocations made while one floor was live, including building the next."""
+    floor: int
+    rooms: PoolCounts
+    enemies: PoolCounts
+    full_collections: int  # gen-2 garbage collections
+
+
+class Snapshot(NamedTuple):
+    """Immutable copy of a GameState taken by GameState.snapshot()."""
+    values: Dict[str, Any]  # GameState attributes; lists frozen to tuples
+    player: Tuple[Player, Dict[str, Any]]
+    rooms: Tuple[tuple, ...]  # (room, ROOM_STATE values, enemies, items)
+    enemies: Tuple[tuple, ...]  # (enemy, ENEMY_STATE values, modifiers)
+    fog: Tuple[Any, int, Any]  # grid copy, version, last reveal
+
+
 class GameState:
     """Central game state container."""
     
-    def __init__(self, settings):
-        """Initialize game state."""
+    def __init__(self, settings, seed: Optional[int] = None):
+        """
+        Initialize game state.
+        
+        Floor layouts are derived from ``seed`` (random when omitted), so
+        the same seed always produces the same floors.
+        """
         self.settings = settings
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.archetypes = load_archetypes(settings.ENEMY_DATA_FILE)
         self.paused = False
+        
+        # Rooms and enemies are recycled across floors and runs
+        self.room_pool = ObjectPool(new_room, reset_room)
+        self.enemy_objects = ObjectPool(new_enemy, reset_enemy)
+        self.allocations = deque(maxlen=settings.ALLOCATION_HISTORY)
+        self.live_floor = 0  # floor number of the installed rooms
+        self.collections_at_install = full_collections()
         self.current_phase = None
         
+        # Structured event log (sink and flush thread are attached by Game)
+        self.events = EventLog(
+            capacity=settings.EVENT_LOG_CAPACITY,
+            level=Level[settings.EVENT_LOG_LEVEL],
+            flush_interval=settings.EVENT_LOG_FLUSH_INTERVAL
+        )
+        
         # Player state
         self.player = Player(
             hp=settings.PLAYER_BASE_HP,
@@ -100,12 +198,26 @@ class GameState:
         self.current_biome = Biome.DUNGEON
         self.rooms: List[Room] = []
         self.current_room_index = 0
-        self.fog_of_war: Dict[tuple, bool] = {}
+        self.room_lookup = RoomIndex([], settings.MAX_ROOM_SIZE)  # replaced per floor
+        self.room_graph = RoomGraph.from_rooms([])
+        self.tiles = TileMap(0, 0, 0, 0)  # replaced per floor
+        self.flow_fields = FlowFieldCache(self.tiles)
+        self.fog_of_war = FogOfWar.for_rooms([])  # replaced per floor
+        self.vision_range = settings.VISION_RANGE
+        
+        # Floor aggregates, kept current by the mark_*/record_* methods
+        self.rooms_discovered = 0
+        self.rooms_cleared = 0
+        self.rooms_to_clear = 0  # non-shop rooms still uncleared
+        self.enemies_remaining = 0
+        self.shop_rooms = 0
+        self.boss_room_index = -1
+        self.boss_defeated = False
         
         # Combat state
         self.in_combat = False
         self.enemies: List[Enemy] = []
-        self.combat_log: List[str] = []
+        self.rebuild_player_modifiers()
         
         # Choice state
         self.pending_choices: List[Dict] = []
@@ -128,139 +240,272 @@ class GameState:
     
     def generate_floor(self):
         """Generate a new floor layout."""
-        self.rooms = []
-        num_rooms = self.settings.ROOMS_PER_FLOOR
+        self.install_floor(self.build_floor(self.current_floor, self.current_biome))
+    
+    def floor_rng(self, floor: int, biome: Biome) -> random.Random:
+        """Return the random generator dedicated to one floor of this run."""
+        return random.Random(f"{self.seed}:{floor}:{biome.name}")
+    
+    def build_floor(self, floor: int, biome: Biome) -> List[Room]:
+        """
+        Build the rooms for a floor without touching the live state.
         
-        for i in range(num_rooms):
-            room = self.create_room(i)
-            self.rooms.append(room)
+        Reads the seed and settings and takes its rooms from ``room_pool``,
+        whose lock makes it safe to call from a worker thread; the result
+        is identical for the same arguments.
+        """
+        rng = self.floor_rng(floor, biome)
+        generator = FloorGenerator(self.settings.MIN_ROOM_SIZE, self.settings.MAX_ROOM_SIZE)
+        layout = generator.generate(self.settings.ROOMS_PER_FLOOR, rng)
+        spawn_seeds = np.random.default_rng(rng.getrandbits(64)).integers(2 ** 63, size=len(layout.rects))
+        extra = int(floor * self.settings.ENEMY_DENSITY_INCREASE)
         
-        # Connect rooms
-        self.connect_rooms()
+        rooms = []
+        for (x, y, width, height), room_type, connections, spawn_seed in zip(
+                layout.rects, layout.room_types, layout.connections, spawn_seeds.tolist()):
+            room = self.room_pool.acquire(x=x, y=y, width=width, height=height, room_type=room_type,
+                                          connections=connections, spawn_seed=spawn_seed)
+            
+            # Enemies (except in start and shop) are only rolled when the room is discovered
+            if room_type not in ["start", "shop"]:
+                room.spawn_count = (2 if room_type == "standard" else 3) + extra
+            rooms.append(room)
+        return rooms
+    
+    def install_floor(self, rooms: List[Room]):
+        """Swap a built floor into the live state in one step."""
+        if rooms is not self.rooms:
+            self.release_floor()
+        self.rooms = rooms
+        self.live_floor = self.current_floor
+        self.current_room_index = 0
+        self.room_lookup = RoomIndex(rooms, self.settings.MAX_ROOM_SIZE)
+        self.room_graph = RoomGraph.from_rooms(rooms)
+        self.tiles = self.build_tiles(rooms, self.current_floor, self.current_biome)
+        self.flow_fields = FlowFieldCache(self.tiles, self.settings.FLOW_FIELD_CACHE_SIZE)
+        self.fog_of_war = FogOfWar.for_tiles(self.tiles)
+        
+        self.count_floor()
         
         # Place player in first room
         if self.rooms:
             first_room = self.rooms[0]
             self.player.x = float(first_room.x + first_room.width / 2)
             self.player.y = float(first_room.y + first_room.height / 2)
-            first_room.discovered = True
+            self.mark_room_discovered(0)
     
-    def create_room(self, index: int) -> Room:
-        """Create a single room."""
-        width = random.randint(self.settings.MIN_ROOM_SIZE, self.settings.MAX_ROOM_SIZE)
-        height = random.randint(self.settings.MIN_ROOM_SIZE, self.settings.MAX_ROOM_SIZE)
-        
-        # Simple grid placement for now
-        grid_cols = 5
-        col = index % grid_cols
-        row = index // grid_cols
-        x = col * (self.settings.MAX_ROOM_SIZE + 2)
-        y = row * (self.settings.MAX_ROOM_SIZE + 2)
-        
-        # Determine room type
-        if index == 0:
-            room_type = "start"
-        elif index == len(range(self.settings.ROOMS_PER_FLOOR)) - 1:
-            room_type = "boss"
-        elif random.random() < 0.1:
-            room_type = "shop"
-        elif random.random() < 0.2:
-            room_type = "treasure"
-        else:
-            room_type = "standard"
-        
-        room = Room(x, y, width, height, room_type)
+    def release_floor(self):
+        """Hand the live floor's rooms and enemies back to the pools and record its allocations."""
+        for room in self.rooms:
+            self.enemy_objects.release_all(room.enemies)
+        self.room_pool.release_all(self.rooms)
         
-        # Populate room with enemies (except start and shop)
-        if room_type not in ["start", "shop"]:
-            self.populate_room_enemies(room)
-        
-        return room
+        collections = full_collections()
+        record = FloorAllocations(self.live_floor, self.room_pool.take_counts(),
+                                  self.enemy_objects.take_counts(),
+                                  collections - self.collections_at_install)
+        self.collections_at_install = collections
+        if self.rooms:
+            self.allocations.append(record)
+            self.events.debug("memory", "Floor {floor}: {rooms} rooms and {enemies} enemies allocated, "
+                              "{reused} reused, {gc} full collections", floor=record.floor,
+                              rooms=record.rooms.created, enemies=record.enemies.created,
+                              reused=record.rooms.reused + record.enemies.reused,
+                              gc=record.full_collections)
+    
+    def count_floor(self):
+        """Recompute every floor aggregate from the rooms; done once per floor."""
+        self.rooms_discovered = sum(1 for room in self.rooms if room.discovered)
+        self.rooms_cleared = sum(1 for room in self.rooms if room.cleared)
+        self.rooms_to_clear = sum(1 for room in self.rooms
+                                  if not room.cleared and room.room_type != "shop")
+        self.enemies_remaining = sum(len(room.enemies) + room.spawn_count for room in self.rooms)
+        self.shop_rooms = sum(1 for room in self.rooms if room.room_type == "shop")
+        self.boss_room_index = next((i for i, room in enumerate(self.rooms)
+                                     if room.room_type == "boss"), -1)
+        self.boss_defeated = self.boss_room_index >= 0 and self.rooms[self.boss_room_index].cleared
     
-    def populate_room_enemies(self, room: Room):
-        """Add enemies to a room."""
-        # Enemy count based on floor and room type
-        base_count = 2 if room.room_type == "standard" else 3
-        enemy_count = base_count + int(self.current_floor * self.settings.ENEMY_DENSITY_INCREASE)
+    def mark_room_discovered(self, index: int) -> bool:
+        """
+        Mark a room as discovered; returns False if it already was.
         
-        for _ in range(enemy_count):
-            enemy = self.create_enemy(room)
-            room.enemies.append(enemy)
+        Enemies are rolled on discovery. With AUTO_ESCALATE, rooms with
+        nothing to fight are cleared as well.
+        """
+        room = self.rooms[index]
+        if room.discovered:
+            return False
+        room.discovered = True
+        self.populate_room(room)
+        self.rooms_discovered += 1
+        if self.settings.AUTO_ESCALATE and not room.enemies and room.room_type != "shop":
+            self.mark_room_cleared(index)
+        return True
+    
+    def mark_room_cleared(self, index: int):
+        """Mark a room as cleared, dropping any enemies left in it."""
+        room = self.rooms[index]
+        if room.cleared:
+            return
+        room.cleared = True
+        self.enemies_remaining -= len(room.enemies) + room.spawn_count
+        self.enemy_objects.release_all(room.enemies)
+        room.enemies.clear()
+        room.spawn_count = 0
+        self.rooms_cleared += 1
+        if room.room_type != "shop":
+            self.rooms_to_clear -= 1
+        if index == self.boss_room_index:
+            self.boss_defeated = True
+    
+    def record_enemy_killed(self, enemy: Enemy):
+        """Count an enemy killed in the current room; the fight has already removed it from the room."""
+        self.enemies_killed += 1
+        self.enemies_remaining -= 1
+    
+    def record_enemy_spawned(self, enemy: Enemy):
+        """Count an enemy that joined the fight in the current room; the fight has already added it."""
+        self.enemies_remaining += 1
+    
+    def player_modifiers(self) -> ModifierChain:
+        """Compiled hooks of the player's relics and curses."""
+        return self.player_chain
+    
+    def rebuild_player_modifiers(self):
+        """Recompile the player's chain; call after relics or curses change."""
+        self.player_chain = compile_chain(tuple(self.player.relics) + tuple(self.player.curses))
+    
+    def heal_player(self, amount: int) -> int:
+        """Heal the player through their modifiers, up to max hp; returns the hp gained."""
+        return self.player_modifiers().heal(amount, self.player)
+    
+    def floor_cleared(self) -> bool:
+        """Check if every room that needs clearing has been cleared."""
+        return self.rooms_to_clear == 0
     
-    def create_enemy(self, room: Room) -> Enemy:
-        """Create an enemy."""
-        # Random position within room
-        x = float(room.x + random.randint(1, room.width - 1))
-        y = float(room.y + random.randint(1, room.height - 1))
+    def critical_path(self) -> List[int]:
+        """Return the room indices on the shortest route from the start to the boss."""
+        if self.boss_room_index < 0:
+            return []
+        return self.room_graph.path(0, self.boss_room_index)
+    
+    def next_unexplored_room(self) -> int:
+        """Return the undiscovered room fewest hops from the current room, or -1."""
+        if self.current_room_index >= len(self.rooms):
+            return -1
+        return self.room_graph.nearest(self.current_room_index,
+                                       lambda i: not self.rooms[i].discovered)
+    
+    @property
+    def current_room(self) -> Optional[Room]:
+        """The room the player is in, or None."""
+        if self.current_room_index < len(self.rooms):
+            return self.rooms[self.current_room_index]
+        return None
+    
+    def build_tiles(self, rooms: List[Room], floor: int, biome: Biome) -> TileMap:
+        """Carve the tile grid for a floor's rooms and connections."""
+        rng = random.Random(f"{self.seed}:{floor}:{biome.name}:tiles")
+        hazard_chance = self.settings.HAZARD_CHANCE if biome in (Biome.FACTORY, Biome.VOID) else 0.0
+        return TileMap.from_rooms(rooms, rng, hazard_chance)
+    
+    def populate_room(self, room: Room) -> bool:
+        """
+        Roll a room's pending enemies; returns False if there were none.
         
-        # Scale stats based on floor
-        hp_scale = self.settings.HP_SCALE_PER_FLOOR ** (self.current_floor - 1)
-        damage_scale = self.settings.DAMAGE_SCALE_PER_FLOOR ** (self.current_floor - 1)
+        Each room draws from its own seed, so its enemies are the same
+        whenever (and in whatever order) rooms are populated.
+        """
+        count = room.spawn_count
+        if not count:
+            return False
         
-        # Enemy types based on biome
-        if self.current_biome == Biome.DUNGEON:
-            enemy_types = ["grunt", "ranger", "tank"]
-        elif self.current_biome == Biome.CAVERNS:
-            enemy_types = ["lurker", "spitter", "brute"]
-        else:
-            enemy_types = ["grunt", "ranger", "tank", "swarm"]
+        rng = np.random.default_rng(room.spawn_seed)
+        table = self.spawn_table(self.current_floor, self.current_biome)
+        acquire = self.enemy_objects.acquire
+        room.enemies.extend(
+            acquire(x=x, y=y, hp=hp, max_hp=hp, damage=damage, speed=speed,
+                    enemy_type=enemy_type, is_elite=is_elite)
+            for enemy_type, x, y, hp, damage, speed, is_elite
+            in table.spawn(rng, np.full(count, room.x), np.full(count, room.y),
+                           np.full(count, room.width), np.full(count, room.height))
+        )
+        room.spawn_count = 0
+        return True
+    
+    def spawn_table(self, floor: int, biome: Biome):
+        """Return the compiled enemy spawn table for a floor."""
+        return self.archetypes.compile(biome.name, floor, self.settings.HP_SCALE_PER_FLOOR,
+                                       self.settings.DAMAGE_SCALE_PER_FLOOR)
+    
+    def snapshot(self) -> Snapshot:
+        """
+        Capture the state for a later restore().
         
-        enemy_type = random.choice(enemy_types)
+        Only mutable data is copied: rooms, enemies and the player keep
+        their identity and get a tuple copy of the fields that can change,
+        while the floor's immutable structures (layout, tile map, room
+        index, flow fields) are shared by reference. Settings and the event
+        log are left out.
+        """
+        values = {k: tuple(v) if type(v) is list else v for k, v in vars(self).items()
+                  if k not in ("settings", "events", "player")}
+        values["rooms"] = self.rooms  # list identity marks the floor
         
-        # Base stats by type
-        stats = {
-            "grunt": {"hp": 20, "damage": 5, "speed": 3.0},
-            "ranger": {"hp": 15, "damage": 8, "speed": 2.5},
-            "tank": {"hp": 40, "damage": 3, "speed": 1.5},
-            "swarm": {"hp": 5, "damage": 2, "speed": 5.0},
-            "lurker": {"hp": 25, "damage": 10, "speed": 4.0},
-            "spitter": {"hp": 18, "damage": 6, "speed": 2.0},
-            "brute": {"hp": 50, "damage": 12, "speed": 1.0},
-        }
+        enemies = {id(enemy): enemy for enemy in self.enemies}
+        for room in self.rooms:
+            for enemy in room.enemies:
+                enemies[id(enemy)] = enemy
         
-        base_stats = stats.get(enemy_type, stats["grunt"])
+        fog = self.fog_of_war
+        return Snapshot(
+            values=values,
+            player=(self.player, freeze_fields(self.player)),
+            rooms=tuple((room, room_state(room), tuple(room.enemies), tuple(room.items))
+                        for room in self.rooms),
+            enemies=tuple((enemy, enemy_state(enemy), tuple(enemy.modifiers))
+                          for enemy in enemies.values()),
+            fog=(fog.grid.copy(), fog.version, fog.last_reveal)
+        )
+    
+    def restore(self, snap: Snapshot):
+        """
+        Return to a snapshot; the same snapshot can be restored any number of times.
         
-        # Apply scaling
-        hp = int(base_stats["hp"] * hp_scale)
-        damage = int(base_stats["damage"] * damage_scale)
+        Floors prefetched before the restore must be forgotten without
+        releasing them first (Game.restore() does this), since they may
+        hold objects the restored floor uses.
+        """
+        # Objects released since the snapshot may be live again
+        self.room_pool.clear()
+        self.enemy_objects.clear()
+        thaw_fields(self, snap.values)
+        self.rooms = snap.values["rooms"]
         
-        # Elite chance
-        is_elite = random.random() < 0.1 * self.current_floor
-        if is_elite:
-            hp *= 2
-            damage *= 1.5
+        self.player, fields = snap.player
+        thaw_fields(self.player, fields)
+        for room, values, enemies, items in snap.rooms:
+            vars(room).update(zip(ROOM_STATE, values))
+            room.enemies = list(enemies)
+            room.items = list(items)
+        for enemy, values, modifiers in snap.enemies:
+            vars(enemy).update(zip(ENEMY_STATE, values))
+            enemy.modifiers = list(modifiers)
         
-        return Enemy(
-            x=x, y=y,
-            hp=hp, max_hp=hp,
-            damage=damage,
-            speed=base_stats["speed"],
-            enemy_type=enemy_type,
-            is_elite=is_elite
-        )
+        grid, version, last_reveal = snap.fog
+        self.fog_of_war.grid[:] = grid
+        self.fog_of_war.version = version
+        self.fog_of_war.last_reveal = last_reveal
     
-    def connect_rooms(self):
-        """Create connections between rooms."""
-        # Simple connection: each room connects to the next
-        for i in range(len(self.rooms) - 1):
-            self.rooms[i].connections.append(i + 1)
-            self.rooms[i + 1].connections.append(i)
-        
-        # Add some random connections for variety
-        for _ in range(self.settings.ROOMS_PER_FLOOR // 3):
-            room1 = random.randint(0, len(self.rooms) - 1)
-            room2 = random.randint(0, len(self.rooms) - 1)
-            if room1 != room2:
-                if room2 not in self.rooms[room1].connections:
-                    self.rooms[room1].connections.append(room2)
-                    self.rooms[room2].connections.append(room1)
+    @property
+    def combat_log(self) -> List[str]:
+        """Most recent combat messages, a bounded view of the event log."""
+        return self.events.messages("combat", self.settings.COMBAT_LOG_SIZE)
     
     def enemies_nearby(self) -> bool:
         """Check if there are enemies near the player."""
-        if self.current_room_index < len(self.rooms):
-            current_room = self.rooms[self.current_room_index]
-            return len(current_room.enemies) > 0
-        return False
+        room = self.current_room
+        return room is not None and len(room.enemies) > 0
     
     def has_pending_choices(self) -> bool:
         """Check if there are choices to make."""
@@ -268,10 +513,8 @@ class GameState:
     
     def shop_available(self) -> bool:
         """Check if a shop is available."""
-        if self.current_room_index < len(self.rooms):
-            current_room = self.rooms[self.current_room_index]
-            return current_room.room_type == "shop" and not current_room.cleared
-        return False
+        room = self.current_room
+        return room is not None and room.room_type == "shop" and not room.cleared
     
     def reset(self):
         """Reset the game state for a new run."""
@@ -285,18 +528,26 @@ class GameState:
             souls=self.settings.STARTING_SOULS,
             keys=self.settings.STARTING_KEYS
         )
+        self.rebuild_player_modifiers()
         
-        # Reset dungeon
+        # Reset dungeon with a fresh seed
+        self.release_floor()
+        self.seed = random.getrandbits(32)
         self.current_floor = 1
         self.current_biome = Biome.DUNGEON
         self.rooms = []
         self.current_room_index = 0
-        self.fog_of_war = {}
+        self.room_lookup = RoomIndex([], self.settings.MAX_ROOM_SIZE)
+        self.room_graph = RoomGraph.from_rooms([])
+        self.tiles = TileMap(0, 0, 0, 0)
+        self.flow_fields = FlowFieldCache(self.tiles)
+        self.fog_of_war = FogOfWar.for_rooms([])
+        self.vision_range = self.settings.VISION_RANGE
         
         # Reset combat
         self.in_combat = False
         self.enemies = []
-        self.combat_log = []
+        self.events.clear()
         
         # Reset choices
         self.pending_choices = []
@@ -0,0 +1,92 @@
+"""Generational handles for entities stored in dense, swap-removed arrays."""
+
+from typing import List, Tuple
+
+
+SLOT_BITS = 24
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class HandleRegistry:
+    """
+    Maps stable entity handles to rows of a dense array.
+
+    A handle packs a slot id with that slot's generation. Removing an
+    entity bumps its slot's generation, so an old handle never resolves to
+    whatever reuses the slot, and swap-removes its row: the last row moves
+    into the hole and only the moved entity's mapping changes. Owners keep
+    their own columns in step by moving row ``last`` to ``row`` whenever
+    remove() returns two different rows.
+    """
+
+    def __init__(self):
+        """Create an empty registry."""
+        self.generations: List[int] = []  # per slot
+        self.rows: List[int] = []  # per slot; -1 while the slot is free
+        self.handles: List[int] = []  # per row
+        self.free: List[int] = []
+
+    def __len__(self) -> int:
+        """Number of live entities."""
+        return len(self.handles)
+
+    def create(self) -> int:
+        """Register an entity at the next row and return its handle."""
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = len(self.generations)
+            self.generations.append(0)
+            self.rows.append(-1)
+        self.rows[slot] = len(self.handles)
+        handle = self.generations[slot] << SLOT_BITS | slot
+        self.handles.append(handle)
+        return handle
+
+    def row(self, handle: int) -> int:
+        """Return the row of ``handle``, or -1 if it has been removed."""
+        slot = handle & SLOT_MASK
+        if handle < 0 or slot >= len(self.rows) or self.generations[slot] != handle >> SLOT_BITS:
+            return -1
+        return self.rows[slot]
+
+    def alive(self, handle: int) -> bool:
+        """Check if ``handle`` still refers to a live entity."""
+        return self.row(handle) >= 0
+
+    def remove(self, handle: int) -> Tuple[int, int]:
+        """Unregister ``handle``; returns (row, last), the freed row and the row moved into it."""
+        row = self.row(handle)
+        if row < 0:
+            raise KeyError(f"Stale entity handle {handle}")
+        last = len(self.handles) - 1
+        moved = self.handles.pop()
+        if row != last:
+            self.handles[row] = moved
+            self.rows[moved & SLOT_MASK] = row
+        self.release(handle & SLOT_MASK)
+        return row, last
+
+    def release(self, slot: int):
+        """Free ``slot`` and invalidate its handles."""
+        self.rows[slot] = -1
+        self.generations[slot] += 1
+        self.free.append(slot)
+
+    def clear(self):
+        """Remove every entity; all outstanding handles become stale."""
+        for handle in self.handles:
+            self.release(handle & SLOT_MASK)
+        self.handles = []
+
+    def snapshot(self) -> tuple:
+        """Copy the registry for a later restore()."""
+        return tuple(self.generations), tuple(self.rows), tuple(self.handles), tuple(self.free)
+
+    def restore(self, snap: tuple):
+        """Return to a snapshot taken by snapshot()."""
+        generations, rows, handles, free = snap
+        self.generations = list(generations)
+        self.rows = list(rows)
+        self.handles = list(handles)
+        self.free = list(free)
@@ -0,0 +1,102 @@
+"""Input sources that feed events and held keys into the game loop."""
+
+import pygame
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+class HeldKeys:
+    """Set-backed stand-in for the result of pygame.key.get_pressed()."""
+
+    def __init__(self, keys: Iterable[int] = ()):
+        """Initialize with the key codes currently held down."""
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key: int) -> bool:
+        """Return True if the given key code is held."""
+        return key in self.keys
+
+
+class InputSource:
+    """Base input source supplying per-step events and held keys."""
+
+    def attach(self, game):
+        """Called by the game once all systems are constructed."""
+        pass
+
+    def poll(self) -> List[pygame.event.Event]:
+        """Return the events that occurred since the last poll."""
+        return []
+
+    def get_pressed(self):
+        """Return an indexable key code -> held state mapping."""
+        return HeldKeys()
+
+
+class PygameInput(InputSource):
+    """Live input read from the pygame event queue and keyboard."""
+
+    def poll(self) -> List[pygame.event.Event]:
+        """Drain the pygame event queue."""
+        return pygame.event.get()
+
+    def get_pressed(self):
+        """Return pygame's keyboard state."""
+        return pygame.key.get_pressed()
+
+
+# A policy receives the game and returns (held key codes, events) for one step
+Policy = Callable[[object], Tuple[Iterable[int], List[pygame.event.Event]]]
+
+
+class ScriptedInput(InputSource):
+    """
+    Synthetic input for headless runs.
+
+    The policy is called once per simulation step with the game and
+    returns the keys to hold and the events to deliver for that step.
+    Without a policy the input source stays idle.
+    """
+
+    def __init__(self, policy: Optional[Policy] = None):
+        """Initialize scripted input with an optional policy."""
+        self.policy = policy
+        self.game = None
+        self.held = HeldKeys()
+
+    @classmethod
+    def from_script(cls, script: List[Tuple[Iterable[int], List[pygame.event.Event]]]):
+        """Build an input source that replays a fixed list of steps, then idles."""
+        steps = iter(script)
+
+        def replay(game):
+            return next(steps, ((), []))
+
+        return cls(replay)
+
+    def attach(self, game):
+        """Bind the game the policy observes."""
+        self.game = game
+
+    def poll(self) -> List[pygame.event.Event]:
+        """Advance the policy by one step."""
+        if self.policy is None:
+            self.held = HeldKeys()
+            return []
+
+        held, events = self.policy(self.game)
+        self.held = HeldKeys(held)
+        return list(events)
+
+    def get_pressed(self):
+        """Return the keys held for the current step."""
+        return self.held
+
+
+def key_event(key: int) -> pygame.event.Event:
+    """Create a synthetic key press event."""
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+
+def click_event(button: int = 1) -> pygame.event.Event:
+    """Create a synthetic mouse click event."""
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button)
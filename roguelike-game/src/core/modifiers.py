@@ -0,0 +1,153 @@
+"""Relic, curse and enemy modifier hooks compiled into per-build chains."""
+
+import functools
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+
+HOOKS = ("on_hit", "on_damage_taken", "on_heal", "on_tick")
+
+BERSERKER_THRESHOLD = 0.3  # share of max hp below which Berserker's Rage applies
+BERSERKER_BONUS = 1.5  # damage multiplier
+LIFESTEAL = 0.2  # share of damage dealt healed by Vampire Fangs
+PHOENIX_REVIVE = 0.5  # share of max hp restored by Phoenix Feather
+HEALING_PENALTY = 0.5  # healing multiplier under Reduced Healing
+REGEN_RATE = 0.05  # share of max hp per second for Regenerating enemies
+
+
+class Hook(NamedTuple):
+    """One registered hook of a modifier."""
+    order: int
+    name: str
+    fn: Callable
+
+
+# Modifier name -> hook kind -> hook
+REGISTRY: Dict[str, Dict[str, Hook]] = {}
+
+
+def modifier(name: str, hook: str, order: int = 0):
+    """
+    Register the decorated function as ``name``'s ``hook``.
+
+    Hooks are called as fn(amount, entity, other, chain) and return the
+    new amount: damage for on_hit (entity is the attacker) and
+    on_damage_taken (entity is the target), healing for on_heal and the
+    timestep for on_tick, whose result is ignored. Lower ``order`` runs
+    earlier in a chain.
+    """
+    if hook not in HOOKS:
+        raise ValueError(f"Unknown hook {hook!r}, expected one of {HOOKS}")
+
+    def register(fn: Callable) -> Callable:
+        REGISTRY.setdefault(name, {})[hook] = Hook(order, name, fn)
+        compile_chain.cache_clear()
+        return fn
+    return register
+
+
+def modifier_name(label: str) -> str:
+    """Strip a relic's description, e.g. "Vampire Fangs (Lifesteal 20%)" -> "Vampire Fangs"."""
+    return label.split(" (", 1)[0]
+
+
+class ModifierChain:
+    """
+    The hooks of one build (a set of relics, curses or modifiers), flattened.
+
+    Each hook kind is a tuple of functions in run order, so an event only
+    loops over the hooks the build actually has, with no name lookups or
+    string matching. Chains are immutable and shared by every entity with
+    the same build; get them from compile_chain().
+    """
+
+    __slots__ = ("key",) + HOOKS
+
+    def __init__(self, key: Tuple[str, ...], hooks: Dict[str, Sequence[Callable]]):
+        """Wrap the ordered hook functions of each kind."""
+        self.key = key
+        for kind in HOOKS:
+            setattr(self, kind, tuple(hooks.get(kind, ())))
+
+    def __bool__(self) -> bool:
+        """Whether the build has any hooks at all."""
+        return any(getattr(self, kind) for kind in HOOKS)
+
+    def hit(self, damage: float, attacker, target) -> float:
+        """Return the damage of an attack by ``attacker`` after its on_hit hooks."""
+        for fn in self.on_hit:
+            damage = fn(damage, attacker, target, self)
+        return damage
+
+    def damage_taken(self, damage: float, target, attacker) -> float:
+        """Return the damage ``target`` takes after its on_damage_taken hooks."""
+        for fn in self.on_damage_taken:
+            damage = fn(damage, target, attacker, self)
+        return damage
+
+    def heal(self, amount: float, entity) -> float:
+        """Heal ``entity`` through its on_heal hooks, up to max hp; returns the hp gained."""
+        for fn in self.on_heal:
+            amount = fn(amount, entity, None, self)
+        # Whole hp for the player, fractional for enemies in the pool
+        healed = type(entity.hp)(max(0, min(amount, entity.max_hp - entity.hp)))
+        entity.hp += healed
+        return healed
+
+    def tick(self, dt: float, entity):
+        """Run the on_tick hooks for a step of ``dt`` seconds."""
+        for fn in self.on_tick:
+            fn(dt, entity, None, self)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_chain(key: Tuple[str, ...]) -> ModifierChain:
+    """Return the chain for the modifier labels in ``key``; labels without hooks are ignored."""
+    found: Dict[str, List[Hook]] = {kind: [] for kind in HOOKS}
+    for label in key:
+        for kind, hook in REGISTRY.get(modifier_name(label), {}).items():
+            found[kind].append(hook)
+    return ModifierChain(key, {kind: [hook.fn for hook in sorted(hooks, key=lambda h: (h.order, h.name))]
+                               for kind, hooks in found.items()})
+
+
+# Relics
+
+@modifier("Berserker's Rage", "on_hit", order=0)
+def berserkers_rage(damage, attacker, target, chain):
+    """More damage while badly hurt."""
+    if attacker.hp < attacker.max_hp * BERSERKER_THRESHOLD:
+        return damage * BERSERKER_BONUS
+    return damage
+
+
+@modifier("Vampire Fangs", "on_hit", order=10)
+def vampire_fangs(damage, attacker, target, chain):
+    """Heal for a share of the damage dealt, after damage bonuses."""
+    chain.heal(damage * LIFESTEAL, attacker)
+    return damage
+
+
+@modifier("Phoenix Feather", "on_damage_taken", order=100)
+def phoenix_feather(damage, target, attacker, chain):
+    """Survive a lethal hit at half hp; the feather is used up."""
+    if damage < target.hp:
+        return damage
+    target.relics.remove(next(r for r in target.relics if modifier_name(r) == "Phoenix Feather"))
+    target.hp = max(1, int(target.max_hp * PHOENIX_REVIVE))
+    return 0
+
+
+# Curses
+
+@modifier("Reduced Healing", "on_heal")
+def reduced_healing(amount, entity, other, chain):
+    """Halve all healing."""
+    return amount * HEALING_PENALTY
+
+
+# Enemy modifiers
+
+@modifier("Regenerating", "on_tick")
+def regenerating(dt, entity, other, chain):
+    """Recover a share of max hp every second."""
+    chain.heal(entity.max_hp * REGEN_RATE * dt, entity)
@@ -0,0 +1,144 @@
+"""Flow-field pathfinding over the floor tile grid."""
+
+import heapq
+import math
+import numpy as np
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from core.tilemap import WALL, ROOM_TILES
+
+
+# Neighbour offsets (dx, dy) and their step costs
+OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+COSTS = tuple(math.hypot(dx, dy) for dx, dy in OFFSETS)
+
+
+class FlowField:
+    """
+    Distance and step direction to one target tile.
+
+    ``dist`` holds the path length from every cell of a passable grid to
+    the target (inf where unreachable) and ``dir_x``/``dir_y`` the unit
+    step toward the neighbouring cell closest to the target. Any number of
+    agents then find their next step with one array lookup each. Diagonal
+    steps never cut a wall corner.
+    """
+
+    def __init__(self, passable: np.ndarray, origin_x: int, origin_y: int,
+                 target_x: int, target_y: int):
+        """Compute the field over ``passable`` (indexed [row, col])."""
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.target = (target_x, target_y)
+        height, width = passable.shape
+        self.dist = np.full((height, width), np.inf)
+        self.dir_x = np.zeros((height, width))
+        self.dir_y = np.zeros((height, width))
+
+        col = target_x - origin_x
+        row = target_y - origin_y
+        if 0 <= col < width and 0 <= row < height and passable[row, col]:
+            self.compute(passable, row, col)
+
+    def compute(self, passable: np.ndarray, row: int, col: int):
+        """Run Dijkstra from the target cell, then derive directions."""
+        height, width = passable.shape
+        dist = self.dist
+        dist[row, col] = 0.0
+        heap = [(0.0, row, col)]
+
+        while heap:
+            d, r, c = heapq.heappop(heap)
+            if d > dist[r, c]:
+                continue
+            for (dx, dy), cost in zip(OFFSETS, COSTS):
+                nr, nc = r + dy, c + dx
+                if not (0 <= nr < height and 0 <= nc < width) or not passable[nr, nc]:
+                    continue
+                if dx and dy and not (passable[r, nc] and passable[nr, c]):
+                    continue
+                nd = d + cost
+                if nd < dist[nr, nc]:
+                    dist[nr, nc] = nd
+                    heapq.heappush(heap, (nd, nr, nc))
+
+        # Point every cell at its lowest-distance neighbour
+        padded = np.pad(dist, 1, constant_values=np.inf)
+        blocked = np.pad(~passable, 1, constant_values=True)
+        best = dist.copy()
+        for dx, dy in OFFSETS:
+            neighbour = padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+            if dx and dy:
+                # No cutting corners: both orthogonal cells must be open
+                corner = (blocked[1:1 + height, 1 + dx:1 + dx + width] |
+                          blocked[1 + dy:1 + dy + height, 1:1 + width])
+                neighbour = np.where(corner, np.inf, neighbour)
+            better = neighbour < best
+            best[better] = neighbour[better]
+            length = math.hypot(dx, dy)
+            self.dir_x[better] = dx / length
+            self.dir_y[better] = dy / length
+
+    def sample(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Look up the step direction and remaining distance at each position.
+
+        Positions outside the grid get a zero direction and inf distance.
+        """
+        height, width = self.dist.shape
+        cols = np.floor(xs).astype(np.int64) - self.origin_x
+        rows = np.floor(ys).astype(np.int64) - self.origin_y
+        inside = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+        cols = np.where(inside, cols, 0)
+        rows = np.where(inside, rows, 0)
+        dir_x = np.where(inside, self.dir_x[rows, cols], 0.0)
+        dir_y = np.where(inside, self.dir_y[rows, cols], 0.0)
+        dist = np.where(inside, self.dist[rows, cols], np.inf)
+        return dir_x, dir_y, dist
+
+
+class FlowFieldCache:
+    """
+    Flow fields for one floor, keyed by (room, target tile).
+
+    A field is only computed the first time its target tile is asked for,
+    so an agent chasing a player who stays on one tile costs nothing per
+    frame. The least recently used fields are dropped beyond ``capacity``.
+    """
+
+    def __init__(self, tiles, capacity: int = 32):
+        """Create an empty cache over a floor's TileMap."""
+        self.tiles = tiles
+        self.capacity = capacity
+        self.fields: "OrderedDict[tuple, FlowField]" = OrderedDict()
+        self.computed = 0
+
+    def toward(self, x: float, y: float, room=None, room_index: Optional[int] = None) -> FlowField:
+        """
+        Return the field leading to tile (x, y).
+
+        With a room, the field only covers that room's floor tiles;
+        otherwise it spans every walkable tile of the floor.
+        """
+        target = (math.floor(x), math.floor(y))
+        key = (room_index, target)
+        field = self.fields.get(key)
+        if field is not None:
+            self.fields.move_to_end(key)
+            return field
+
+        tiles = self.tiles
+        if room is not None:
+            rows, cols = tiles.room_slice(room)
+            passable = np.isin(tiles.grid[rows, cols], ROOM_TILES)
+            field = FlowField(passable, room.x, room.y, *target)
+        else:
+            passable = tiles.grid != WALL
+            field = FlowField(passable, tiles.origin_x, tiles.origin_y, *target)
+
+        self.computed += 1
+        self.fields[key] = field
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
@@ -0,0 +1,177 @@
+"""Scripted input policies for headless and batch runs."""
+
+import numpy as np
+import pygame
+from typing import Dict, Type
+
+from core.input import key_event, click_event
+
+
+class IdlePolicy:
+    """Holds no keys and sends no events."""
+
+    def __call__(self, game):
+        """Return the input for one simulation step."""
+        return (), []
+
+
+class GreedyPolicy:
+    """
+    Plays the core loop with simple rules.
+
+    Follows the floor's flow field to the nearest unexplored or occupied
+    room, chases and attacks the nearest enemy, dodges telegraphed attacks,
+    takes the first choice, visits each shop once, buys the first
+    affordable item and optionally accepts risks.
+    """
+
+    ATTACK_INTERVAL = 0.4  # seconds between attacks
+
+    def __init__(self, accept_risk: bool = False):
+        """Initialize the policy."""
+        self.accept_risk = accept_risk
+        self.next_attack_frame = 0
+        self.visited_shops = set()
+        self.target_room = None  # (floor, room index) being walked to
+
+    def __call__(self, game):
+        """Return the input for one simulation step."""
+        # Local import to avoid a circular import with core.game
+        from core.game import GamePhase
+
+        phase = game.current_phase
+        if phase == GamePhase.EXPLORE:
+            return self.explore(game)
+        elif phase == GamePhase.FIGHT:
+            return self.fight(game)
+        elif phase == GamePhase.CHOOSE:
+            return (), [key_event(pygame.K_1)]
+        elif phase == GamePhase.PUSH_LUCK:
+            return (), [key_event(pygame.K_y if self.accept_risk else pygame.K_n)]
+        elif phase == GamePhase.CASH_OUT:
+            return self.shop(game)
+        return (), []
+
+    def explore(self, game):
+        """Head for the nearest room that still needs clearing."""
+        state = game.state
+        player = state.player
+        target = None
+        best = float('inf')
+
+        def wanted(i, room):
+            return i != state.current_room_index and not (room.discovered and not room.enemies)
+
+        # Stick with the room being walked to so equidistant rooms can't make us dither
+        if self.target_room is not None:
+            floor, i = self.target_room
+            if floor == state.current_floor and i < len(state.rooms) and wanted(i, state.rooms[i]):
+                target = i
+
+        if target is None:
+            for i, room in enumerate(state.rooms):
+                if not wanted(i, room):
+                    continue
+                cx = room.x + room.width / 2
+                cy = room.y + room.height / 2
+                dist = (cx - player.x) ** 2 + (cy - player.y) ** 2
+                if dist < best:
+                    best = dist
+                    target = i
+            self.target_room = None if target is None else (state.current_floor, target)
+
+        # Visit each shop once
+        events = []
+        shop = (state.current_floor, state.current_room_index)
+        if state.shop_available() and shop not in self.visited_shops:
+            self.visited_shops.add(shop)
+            events.append(key_event(game.settings.KEY_INTERACT))
+        
+        if target is None:
+            return (), events
+        room = state.rooms[target]
+        return self.follow_path(game, room.x + room.width / 2, room.y + room.height / 2), events
+
+    def fight(self, game):
+        """Chase the nearest enemy, attack on a cadence and dodge telegraphs."""
+        player = game.state.player
+        pool = game.combat.pool
+        n = pool.count
+        if not n:
+            return (), []
+
+        dist = np.hypot(pool.x[:n] - player.x, pool.y[:n] - player.y)
+        nearest = int(np.argmin(dist))
+        held = list(self.move_towards(game, pool.x[nearest], pool.y[nearest]))
+
+        if (pool.telegraph[:n] > 0).any():
+            held.append(game.settings.KEY_DODGE)
+
+        events = []
+        if dist[nearest] < 2.0 and game.frame >= self.next_attack_frame:
+            events.append(click_event())
+            self.next_attack_frame = game.frame + int(
+                self.ATTACK_INTERVAL * game.settings.SIM_TICK_RATE)
+        elif dist[nearest] < game.settings.PLAYER_RANGED_RANGE and game.combat.ranged_cooldown <= 0:
+            events.append(click_event(3))
+        return held, events
+
+    def shop(self, game):
+        """Buy the first affordable item, otherwise leave."""
+        state = game.state
+        for i, item in enumerate(state.shop_items):
+            if item["cost"] <= state.player.gold:
+                if game.economy.selected_item_index < i:
+                    return (), [key_event(pygame.K_DOWN)]
+                if game.economy.selected_item_index > i:
+                    return (), [key_event(pygame.K_UP)]
+                return (), [key_event(pygame.K_RETURN)]
+        return (), [key_event(pygame.K_ESCAPE)]
+
+    def follow_path(self, game, x: float, y: float):
+        """Return the movement keys that step the player along the floor toward (x, y)."""
+        player = game.state.player
+        field = game.state.flow_fields.toward(x, y)
+        dir_x, dir_y, dist = field.sample(np.array([player.x]), np.array([player.y]))
+        if not np.isfinite(dist[0]) or dist[0] < 1.0:
+            return self.move_towards(game, x, y)
+        
+        # Aim for the centre of the next tile on the path
+        return self.move_towards(game, int(player.x) + 0.5 + dir_x[0], int(player.y) + 0.5 + dir_y[0])
+    
+    def move_towards(self, game, x: float, y: float):
+        """Return the movement keys that step the player toward (x, y)."""
+        player = game.state.player
+        settings = game.settings
+        held = []
+        if x > player.x + 0.1:
+            held.append(settings.KEY_MOVE_RIGHT)
+        elif x < player.x - 0.1:
+            held.append(settings.KEY_MOVE_LEFT)
+        if y > player.y + 0.1:
+            held.append(settings.KEY_MOVE_DOWN)
+        elif y < player.y - 0.1:
+            held.append(settings.KEY_MOVE_UP)
+        return held
+
+
+class RecklessPolicy(GreedyPolicy):
+    """Greedy policy that accepts every push-your-luck offer."""
+
+    def __init__(self):
+        """Initialize the policy."""
+        super().__init__(accept_risk=True)
+
+
+POLICIES: Dict[str, Type] = {
+    "idle": IdlePolicy,
+    "greedy": GreedyPolicy,
+    "reckless": RecklessPolicy,
+}
+
+
+def make_policy(name: str):
+    """Create a fresh policy instance by name."""
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy '{name}', expected one of {sorted(POLICIES)}")
+    return POLICIES[name]()
@@ -0,0 +1,134 @@
+"""Object pools for entities and control of the cyclic garbage collector."""
+
+import gc
+import threading
+from typing import Callable, Generic, Iterable, List, NamedTuple, TypeVar
+
+
+T = TypeVar("T")
+
+GC_MODES = ("normal", "freeze", "disable")
+
+
+class PoolCounts(NamedTuple):
+    """Allocation counters of one pool since they were last taken."""
+    created: int
+    reused: int
+    released: int
+
+
+class ObjectPool(Generic[T]):
+    """
+    Free list of reusable objects.
+
+    acquire() hands out a released object when there is one and only
+    calls ``factory`` otherwise; the caller's keyword fields are then set
+    on it. release() runs ``reset`` (which should empty lists in place
+    rather than allocate new ones) and keeps the object for the next
+    acquire. Releasing an object twice is ignored. Safe to use from the
+    floor prefetch thread.
+    """
+
+    def __init__(self, factory: Callable[[], T], reset: Callable[[T], None]):
+        """Create an empty pool."""
+        self.factory = factory
+        self.reset = reset
+        self.free: List[T] = []
+        self.free_ids = set()
+        self.lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+
+    def __len__(self) -> int:
+        """Number of objects waiting to be reused."""
+        return len(self.free)
+
+    def acquire(self, **fields) -> T:
+        """Return a pooled or new object with ``fields`` set."""
+        with self.lock:
+            if self.free:
+                obj = self.free.pop()
+                self.free_ids.discard(id(obj))
+                self.reused += 1
+            else:
+                obj = None
+                self.created += 1
+        if obj is None:
+            obj = self.factory()
+        vars(obj).update(fields)
+        return obj
+
+    def release(self, obj: T):
+        """Reset ``obj`` and keep it for reuse."""
+        with self.lock:
+            if id(obj) in self.free_ids:
+                return
+            self.free_ids.add(id(obj))
+            self.released += 1
+        self.reset(obj)
+        with self.lock:
+            self.free.append(obj)
+
+    def release_all(self, objs: Iterable[T]):
+        """Release every object in ``objs``."""
+        for obj in objs:
+            self.release(obj)
+
+    def clear(self):
+        """Forget every pooled object, e.g. when released objects may be referenced again."""
+        with self.lock:
+            self.free = []
+            self.free_ids = set()
+
+    def take_counts(self) -> PoolCounts:
+        """Return the counters and start counting from zero."""
+        with self.lock:
+            counts = PoolCounts(self.created, self.reused, self.released)
+            self.created = self.reused = self.released = 0
+        return counts
+
+
+class GCPause:
+    """
+    Keeps the cyclic garbage collector out of a stretch of frames.
+
+    "freeze" moves every object alive at begin() into the permanent
+    generation, so collections in between only scan what was allocated
+    since and a full gen-2 pass can't stall a frame; "disable" turns the
+    collector off until end(). "normal" does nothing.
+    """
+
+    def __init__(self, mode: str = "normal"):
+        """Create a pause with one of GC_MODES."""
+        if mode not in GC_MODES:
+            raise ValueError(f"Unknown GC mode {mode!r}, expected one of {GC_MODES}")
+        self.mode = mode
+        self.active = False
+        self.was_enabled = True
+
+    def begin(self):
+        """Start the pause; does nothing if already started."""
+        if self.active or self.mode == "normal":
+            return
+        self.active = True
+        if self.mode == "freeze":
+            gc.freeze()
+        else:
+            self.was_enabled = gc.isenabled()
+            gc.disable()
+
+    def end(self):
+        """End the pause; does nothing if not started."""
+        if not self.active:
+            return
+        self.active = False
+        if self.mode == "freeze":
+            gc.unfreeze()
+        elif self.was_enabled:
+            gc.enable()
+
+
+def full_collections() -> int:
+    """Number of gen-2 collections run so far in this process."""
+    return gc.get_stats()[2]["collections"]
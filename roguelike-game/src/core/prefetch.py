@@ -0,0 +1,91 @@
+"""Speculative background generation of upcoming floors."""
+
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from core.game_state import Biome, GameState, Room
+
+
+class FloorPrefetcher:
+    """
+    Builds upcoming floors on a worker thread.
+
+    Requests are keyed by (seed, floor, biome). Because floors are built
+    from a dedicated per-floor generator, a prefetched floor is identical
+    to one built synchronously. take() never waits: if the worker has not
+    finished, the caller falls back to building the floor itself.
+    """
+
+    def __init__(self, game_state: GameState):
+        """Initialize the prefetcher for a game state."""
+        self.game_state = game_state
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending: Dict[Tuple[int, int, Biome], Future] = {}
+        self.generation = 0  # bumped by reset(); stale release callbacks do nothing
+
+    def request(self, floor: int, biome: Biome):
+        """Start building a floor in the background if not already queued."""
+        key = (self.game_state.seed, floor, biome)
+        if key in self.pending:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor-prefetch")
+        self.pending[key] = self.executor.submit(self.game_state.build_floor, floor, biome)
+
+    def take(self, floor: int, biome: Biome) -> Optional[List[Room]]:
+        """
+        Return the prefetched floor if it is ready, else None.
+
+        All other outstanding requests are discarded, and the rooms of any
+        that were already built go back to the room pool.
+        """
+        future = self.pending.pop((self.game_state.seed, floor, biome), None)
+        self.cancel()
+
+        if future is None:
+            return None
+        if not future.done():
+            self.discard(future)
+            return None
+        if future.exception() is not None:
+            return None
+        return future.result()
+
+    def cancel(self):
+        """Discard every outstanding request."""
+        for future in self.pending.values():
+            self.discard(future)
+        self.pending.clear()
+
+    def discard(self, future: Future):
+        """Cancel ``future``, or hand its rooms back to the room pool once it finishes."""
+        if not future.cancel():
+            future.add_done_callback(functools.partial(self.release, self.generation))
+
+    def release(self, generation: int, future: Future):
+        """Return the rooms of a discarded floor to the room pool, unless reset() ran since."""
+        if generation != self.generation:
+            return
+        if not future.cancelled() and future.exception() is None:
+            self.game_state.room_pool.release_all(future.result())
+
+    def reset(self):
+        """
+        Forget every request without releasing its rooms.
+
+        Used when the game state is restored from a snapshot: the pools
+        are emptied then, and rooms taken from them before the restore
+        may be live again, so handing them back would alias live rooms.
+        """
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.generation += 1
+
+    def shutdown(self):
+        """Stop the worker thread."""
+        self.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
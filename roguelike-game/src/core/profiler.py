@@ -0,0 +1,163 @@
+"""Per-phase frame timing instrumentation."""
+
+import csv
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+
+class _Section:
+    """Context manager timing one named section."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSection:
+    """No-op section used while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class FrameProfiler:
+    """
+    Collects high-resolution timings per (phase, section).
+
+    Samples are kept in bounded rolling windows so memory stays flat no
+    matter how long the game runs. Times are stored in seconds and
+    reported in milliseconds.
+    """
+
+    FRAME = "frame"
+
+    def __init__(self, window: int = 600, enabled: bool = True):
+        """Initialize the profiler with a rolling window of ``window`` samples."""
+        self.window = window
+        self.enabled = enabled
+        self.phase = None
+        self.samples: Dict[Tuple[object, str], Deque[float]] = {}
+        self.frame_start = 0.0
+
+    def set_phase(self, phase):
+        """Set the phase that subsequent samples are keyed by."""
+        self.phase = phase
+
+    def section(self, name: str):
+        """Return a context manager timing the enclosed block as ``name``."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def record(self, name: str, seconds: float):
+        """Record one sample for ``name`` under the current phase."""
+        key = (self.phase, name)
+        samples = self.samples.get(key)
+        if samples is None:
+            samples = self.samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def begin_frame(self, phase):
+        """Mark the start of a rendered frame."""
+        self.phase = phase
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Mark the end of a rendered frame and record its total time."""
+        if self.enabled:
+            self.record(self.FRAME, time.perf_counter() - self.frame_start)
+
+    def stats(self, section: str = FRAME, phase=None) -> Optional[Dict[str, float]]:
+        """
+        Return timing statistics in milliseconds for ``section``.
+
+        With ``phase`` given, only that phase's window is used; otherwise
+        the windows of all phases are combined. Returns None if there are
+        no samples.
+        """
+        values = []
+        for (sample_phase, name), samples in self.samples.items():
+            if name == section and (phase is None or sample_phase == phase):
+                values.extend(samples)
+        if not values:
+            return None
+
+        values.sort()
+        count = len(values)
+
+        def percentile(p):
+            return values[min(count - 1, int(p * count))] * 1000.0
+
+        return {
+            "count": count,
+            "mean": sum(values) / count * 1000.0,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": values[-1] * 1000.0,
+        }
+
+    def sections(self, phase=None):
+        """Return the section names recorded (optionally for one phase)."""
+        return sorted({name for sample_phase, name in self.samples
+                       if phase is None or sample_phase == phase})
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return statistics for every (phase, section) pair."""
+        result = {}
+        for (phase, name) in sorted(self.samples, key=lambda k: (_phase_name(k[0]), k[1])):
+            result.setdefault(_phase_name(phase), {})[name] = self.stats(name, phase)
+        return result
+
+    def reset(self):
+        """Discard all collected samples."""
+        self.samples.clear()
+
+    def dump(self, path):
+        """Write the summary to ``path`` as CSV or JSON based on its extension."""
+        path = Path(path)
+        summary = self.summary()
+
+        if path.suffix == ".csv":
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["phase", "section", "count", "mean_ms",
+                                 "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+                for phase, sections in summary.items():
+                    for name, s in sections.items():
+                        writer.writerow([phase, name, s["count"],
+                                         f"{s['mean']:.4f}", f"{s['p50']:.4f}",
+                                         f"{s['p95']:.4f}", f"{s['p99']:.4f}",
+                                         f"{s['max']:.4f}"])
+        else:
+            with open(path, "w") as f:
+                json.dump(summary, f, indent=2)
+
+
+def _phase_name(phase) -> str:
+    """Return a printable name for a phase key."""
+    if phase is None:
+        return "NONE"
+    return getattr(phase, "name", str(phase))
@@ -0,0 +1,182 @@
+"""Preallocated storage and batched motion for projectiles."""
+
+import numpy as np
+from typing import Optional, Tuple
+
+from core.spatial import CELL_KEY, NEIGHBOUR_CELLS
+
+# Owners
+PLAYER = 0
+ENEMY = 1
+
+PROJECTILE_RADIUS = 0.15  # tiles
+PLAYER_RADIUS = 0.33  # tiles
+ENEMY_RADIUS = 0.33  # tiles
+
+
+class ProjectilePool:
+    """
+    Live projectiles as fixed-capacity parallel NumPy arrays.
+
+    Row i of every array describes one projectile, and only the first
+    ``count`` rows are live. The arrays are allocated once: a shot fired
+    while the pool is full is dropped (and counted in ``dropped``) rather
+    than growing it mid-fight. Motion, expiry and collision are whole-array
+    operations, and spent projectiles are compacted out once per step.
+    """
+
+    COLUMNS = ("x", "y", "prev_x", "prev_y", "vx", "vy", "life", "damage")
+
+    def __init__(self, capacity: int = 512):
+        """Allocate arrays for ``capacity`` projectiles."""
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+        self.owner = np.zeros(capacity, dtype=np.int8)
+
+    def __len__(self) -> int:
+        """Number of live projectiles."""
+        return self.count
+
+    def clear(self):
+        """Remove every projectile."""
+        self.count = 0
+
+    def fire(self, x: float, y: float, vx: float, vy: float, life: float, damage: float, owner: int) -> bool:
+        """Launch one projectile; returns False if the pool is full."""
+        if self.count == self.capacity:
+            self.dropped += 1
+            return False
+        i = self.count
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.life[i] = life
+        self.damage[i] = damage
+        self.owner[i] = owner
+        self.count += 1
+        return True
+
+    def fire_many(self, xs: np.ndarray, ys: np.ndarray, vxs: np.ndarray, vys: np.ndarray,
+                  life, damage, owner: int) -> int:
+        """Launch a volley in one batch; ``life`` and ``damage`` may be scalars. Returns how many fit."""
+        wanted = len(xs)
+        k = min(wanted, self.capacity - self.count)
+        self.dropped += wanted - k
+        rows = slice(self.count, self.count + k)
+        self.x[rows] = self.prev_x[rows] = xs[:k]
+        self.y[rows] = self.prev_y[rows] = ys[:k]
+        self.vx[rows] = vxs[:k]
+        self.vy[rows] = vys[:k]
+        self.life[rows] = np.broadcast_to(life, wanted)[:k]
+        self.damage[rows] = np.broadcast_to(damage, wanted)[:k]
+        self.owner[rows] = owner
+        self.count += k
+        return k
+
+    def update(self, dt: float, tiles=None):
+        """Move every projectile by ``dt``, expiring old ones and any that left room floor in ``tiles``."""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.vx[:n] * dt
+        y += self.vy[:n] * dt
+        self.life[:n] -= dt
+        if tiles is not None:
+            self.life[:n][~tiles.room_floor_mask(x, y)] = 0.0
+
+    def hits(self, owner: int, xs: np.ndarray, ys: np.ndarray,
+             radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the live projectiles of ``owner`` touching a target.
+
+        Targets are circles of ``radius`` at (xs, ys). A uniform-grid
+        broadphase pairs each projectile only with the targets in its own
+        and the eight surrounding cells, so the exact distance test runs on
+        local pairs instead of every projectile-target combination.
+        Returns (rows, targets): projectile rows that hit and the nearest
+        target each one hit.
+        """
+        none = np.zeros(0, dtype=np.int64)
+        n = self.count
+        shots = np.flatnonzero((self.owner[:n] == owner) & (self.life[:n] > 0))
+        if not len(shots) or not len(xs):
+            return none, none
+
+        # Cells at least as wide as the hit distance, so every target a shot
+        # can touch is in its own cell or one of the eight around it. Each
+        # target is listed under all nine of those cells, leaving a single
+        # sorted lookup per shot
+        reach = radius + PROJECTILE_RADIUS
+        cols = np.floor(xs / reach).astype(np.int64)
+        cells = np.floor(ys / reach).astype(np.int64)
+        keys = ((cols[:, None] + NEIGHBOUR_CELLS[:, 0]) * CELL_KEY + cells[:, None] + NEIGHBOUR_CELLS[:, 1]).ravel()
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        listed = order // len(NEIGHBOUR_CELLS)
+
+        sx, sy = self.x[shots], self.y[shots]
+        key = np.floor(sx / reach).astype(np.int64) * CELL_KEY + np.floor(sy / reach).astype(np.int64)
+        lo = np.searchsorted(sorted_keys, key, side="left")
+        counts = np.searchsorted(sorted_keys, key, side="right") - lo
+        total = int(counts.sum())
+        if not total:
+            return none, none
+
+        # Expand each shot's [lo, lo + count) run of candidate targets
+        starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+        rows = np.repeat(np.arange(len(shots)), counts)
+        targets = listed[starts + np.arange(total)]
+
+        # Narrow phase on the candidate pairs, keeping the nearest target per shot
+        d2 = (sx[rows] - xs[targets]) ** 2 + (sy[rows] - ys[targets]) ** 2
+        touching = d2 <= reach * reach
+        rows, targets, d2 = rows[touching], targets[touching], d2[touching]
+        nearest = np.lexsort((d2, rows))
+        rows, targets = rows[nearest], targets[nearest]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        return shots[rows[first]], targets[first]
+
+    def expire(self, rows: np.ndarray):
+        """Spend the projectiles at ``rows``; they are removed by remove_spent()."""
+        self.life[rows] = 0.0
+
+    def remove_spent(self) -> int:
+        """Compact out projectiles whose life ran out and return how many went."""
+        n = self.count
+        keep = self.life[:n] > 0
+        k = int(keep.sum())
+        if k == n:
+            return 0
+        for name in self.COLUMNS + ("owner",):
+            column = getattr(self, name)
+            column[:k] = column[:n][keep]
+        self.count = k
+        return n - k
+
+    def snapshot(self) -> tuple:
+        """Copy the live columns for a later restore()."""
+        n = self.count
+        return n, tuple(getattr(self, name)[:n].copy() for name in self.COLUMNS + ("owner",))
+
+    def restore(self, snap: tuple):
+        """Return to a snapshot taken by snapshot(); shots fired since are gone."""
+        n, columns = snap
+        for name, column in zip(self.COLUMNS + ("owner",), columns):
+            getattr(self, name)[:n] = column
+        self.count = n
+
+    def positions(self, alpha: float = 1.0, owner: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return live positions blended ``alpha`` of the way from the previous step."""
+        n = self.count
+        xs = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+        ys = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        if owner is not None:
+            mine = self.owner[:n] == owner
+            return xs[mine], ys[mine]
+        return xs, ys
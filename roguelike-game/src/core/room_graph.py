@@ -0,0 +1,105 @@
+"""Room connectivity graph for path and distance queries."""
+
+import numpy as np
+from collections import deque
+from typing import Callable, Dict, List, Tuple
+
+
+class RoomGraph:
+    """
+    A floor's room connections compiled into CSR arrays.
+
+    The neighbours of room i are ``targets[offsets[i]:offsets[i + 1]]``.
+    Breadth-first searches are memoized per source room, so repeated
+    distance, path and range queries from the same room are lookups. The
+    graph is immutable: build a new one whenever the floor changes, which
+    drops every cached search with it.
+    """
+
+    def __init__(self, offsets: np.ndarray, targets: np.ndarray):
+        """Wrap CSR ``offsets`` (length n + 1) and ``targets`` arrays."""
+        self.offsets = offsets
+        self.targets = targets
+        self.searches: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+        # Plain lists walk faster than numpy scalars in the BFS loop
+        self.offset_list = offsets.tolist()
+        self.target_list = targets.tolist()
+
+    @classmethod
+    def from_rooms(cls, rooms: List) -> "RoomGraph":
+        """Compile the graph of ``rooms`` and their connections."""
+        counts = np.fromiter((len(room.connections) for room in rooms), dtype=np.int32, count=len(rooms))
+        offsets = np.zeros(len(rooms) + 1, dtype=np.int32)
+        np.cumsum(counts, out=offsets[1:])
+        targets = np.fromiter((j for room in rooms for j in sorted(room.connections)),
+                              dtype=np.int32, count=int(offsets[-1]))
+        return cls(offsets, targets)
+
+    def __len__(self) -> int:
+        """Number of rooms."""
+        return len(self.offsets) - 1
+
+    def neighbours(self, index: int) -> np.ndarray:
+        """Return the rooms directly connected to ``index``."""
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    def search(self, source: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Breadth-first search from ``source``, memoized.
+
+        Returns (hops, parent, order): hop counts (-1 if unreachable),
+        the previous room on a shortest path (-1 for the source and
+        unreachable rooms), and the reachable rooms in order of distance.
+        """
+        result = self.searches.get(source)
+        if result is not None:
+            return result
+
+        offsets, targets = self.offset_list, self.target_list
+        hops = [-1] * len(self)
+        parent = [-1] * len(self)
+        hops[source] = 0
+        order = [source]
+        queue = deque(order)
+        while queue:
+            current = queue.popleft()
+            depth = hops[current] + 1
+            for n in targets[offsets[current]:offsets[current + 1]]:
+                if hops[n] < 0:
+                    hops[n] = depth
+                    parent[n] = current
+                    order.append(n)
+                    queue.append(n)
+
+        result = (np.array(hops, dtype=np.int32), np.array(parent, dtype=np.int32),
+                  np.array(order, dtype=np.int32))
+        self.searches[source] = result
+        return result
+
+    def distance(self, a: int, b: int) -> int:
+        """Return the number of hops from room a to room b, or -1 if unreachable."""
+        return int(self.search(a)[0][b])
+
+    def path(self, a: int, b: int) -> List[int]:
+        """Return the rooms on a shortest path from a to b, both included; empty if unreachable."""
+        hops, parent, _ = self.search(a)
+        if hops[b] < 0:
+            return []
+        rooms = [b]
+        while rooms[-1] != a:
+            rooms.append(int(parent[rooms[-1]]))
+        rooms.reverse()
+        return rooms
+
+    def within(self, source: int, k: int) -> np.ndarray:
+        """Return the rooms at most ``k`` hops from ``source``, nearest first."""
+        hops, _, order = self.search(source)
+        return order[:np.searchsorted(hops[order], k, side="right")]
+
+    def nearest(self, source: int, predicate: Callable[[int], bool]) -> int:
+        """Return the closest room (by hops) for which ``predicate`` holds, or -1."""
+        for index in self.search(source)[2]:
+            if predicate(int(index)):
+                return int(index)
+        return -1
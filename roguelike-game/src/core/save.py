@@ -0,0 +1,339 @@
+"""Versioned binary save files."""
+
+import json
+import os
+import struct
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import List, Optional
+
+from core.fog import FogOfWar
+from core.game_state import ENEMY_STATE, ROOM_STATE, Biome, Enemy, GameState, Player, Room, Snapshot
+
+
+MAGIC = b"RGSV"
+VERSION = 3
+
+HEADER = struct.Struct("<4sH")
+RUN = struct.Struct("<qIBIdIIIdddB")
+PLAYER = struct.Struct("<ddiiiiiddBiiiddid")
+ROOM = struct.Struct("<iiHHBBQH")
+ENEMY = struct.Struct("<ddiiddB")
+FOG = struct.Struct("<iiII")
+COUNT = struct.Struct("<I")
+
+
+class SaveError(Exception):
+    """Raised when a save file is missing, corrupt or from another version."""
+
+
+class Writer:
+    """Appends struct-packed fields and length-prefixed lists to a buffer."""
+
+    def __init__(self):
+        """Start an empty buffer."""
+        self.buffer = bytearray()
+
+    def pack(self, fmt: struct.Struct, *values):
+        """Append fixed fields."""
+        self.buffer += fmt.pack(*values)
+
+    def count(self, n: int):
+        """Append a list length."""
+        self.buffer += COUNT.pack(n)
+
+    def bytes(self, data: bytes):
+        """Append a length-prefixed byte string."""
+        self.count(len(data))
+        self.buffer += data
+
+    def string(self, text: str):
+        """Append a length-prefixed UTF-8 string."""
+        self.bytes(text.encode("utf-8"))
+
+    def strings(self, items: List[str]):
+        """Append a length-prefixed list of strings."""
+        self.count(len(items))
+        for item in items:
+            self.string(item)
+
+    def json(self, value):
+        """Append a free-form value (shop items, choices) as JSON."""
+        self.string(json.dumps(value, separators=(",", ":")))
+
+
+class Reader:
+    """Reads back what Writer wrote."""
+
+    def __init__(self, data: bytes):
+        """Read from ``data``."""
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        """Read fixed fields."""
+        try:
+            values = fmt.unpack_from(self.data, self.offset)
+        except struct.error as e:
+            raise SaveError(f"Truncated save data: {e}") from e
+        self.offset += fmt.size
+        return values
+
+    def count(self) -> int:
+        """Read a list length."""
+        return self.unpack(COUNT)[0]
+
+    def bytes(self) -> bytes:
+        """Read a length-prefixed byte string."""
+        n = self.count()
+        if self.offset + n > len(self.data):
+            raise SaveError("Truncated save data")
+        data = bytes(self.data[self.offset:self.offset + n])
+        self.offset += n
+        return data
+
+    def string(self) -> str:
+        """Read a length-prefixed UTF-8 string."""
+        try:
+            return self.bytes().decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise SaveError(f"Corrupt save data: {e}") from e
+
+    def strings(self) -> List[str]:
+        """Read a length-prefixed list of strings."""
+        return [self.string() for _ in range(self.count())]
+
+    def json(self):
+        """Read a JSON value."""
+        try:
+            return json.loads(self.string())
+        except ValueError as e:
+            raise SaveError(f"Corrupt save data: {e}") from e
+
+
+def dump_state(state: GameState) -> bytes:
+    """Serialize the persistent parts of a game state."""
+    out = Writer()
+    out.pack(HEADER, MAGIC, VERSION)
+
+    # Run and meta counters
+    out.pack(RUN, state.seed, state.current_floor, state.current_biome.value,
+             state.current_room_index, state.run_time, state.enemies_killed,
+             state.rooms_explored, state.items_collected,
+             state.total_damage_dealt, state.total_damage_taken,
+             state.price_modifier, state.vision_range)
+
+    # Player
+    p = state.player
+    out.pack(PLAYER, p.x, p.y, int(p.hp), int(p.max_hp), int(p.stamina), int(p.max_stamina),
+             int(p.damage), p.speed, p.dodge_cooldown, p.is_dodging, p.gold, p.souls, p.keys,
+             p.crit_chance, p.crit_damage, int(p.armor), p.dodge_chance)
+    out.strings(p.abilities)
+    out.strings(p.relics)
+    out.strings(p.curses)
+
+    # Rooms and their enemies
+    out.count(len(state.rooms))
+    for room in state.rooms:
+        out.pack(ROOM, room.x, room.y, room.width, room.height, room.discovered, room.cleared,
+                 room.spawn_seed, room.spawn_count)
+        out.string(room.room_type)
+        out.count(len(room.connections))
+        for index in sorted(room.connections):
+            out.count(index)
+        out.count(len(room.enemies))
+        for enemy in room.enemies:
+            out.pack(ENEMY, enemy.x, enemy.y, int(enemy.hp), int(enemy.max_hp),
+                     enemy.damage, enemy.speed, enemy.is_elite)
+            out.string(enemy.enemy_type)
+            out.strings(enemy.modifiers)
+        out.json(room.items)
+
+    # Fog as packed bits
+    fog = state.fog_of_war
+    out.pack(FOG, fog.origin_x, fog.origin_y, fog.width, fog.height)
+    out.bytes(np.packbits(fog.grid).tobytes())
+
+    # Economy and pending decisions
+    out.json(state.shop_items)
+    out.json(state.pending_choices)
+    return bytes(out.buffer)
+
+
+def load_state(data: bytes, state: GameState):
+    """Replace the contents of ``state`` with a serialized state."""
+    src = Reader(data)
+    magic, version = src.unpack(HEADER)
+    if magic != MAGIC:
+        raise SaveError("Not a save file")
+    if version != VERSION:
+        raise SaveError(f"Unsupported save version {version}, expected {VERSION}")
+
+    (seed, floor, biome, room_index, run_time, killed, explored, collected,
+     dealt, taken, price_modifier, vision_range) = src.unpack(RUN)
+    try:
+        biome = Biome(biome)
+    except ValueError as e:
+        raise SaveError(f"Corrupt save data: {e}") from e
+
+    (x, y, hp, max_hp, stamina, max_stamina, damage, speed, dodge_cooldown, is_dodging,
+     gold, souls, keys, crit_chance, crit_damage, armor, dodge_chance) = src.unpack(PLAYER)
+    player = Player(x=x, y=y, hp=hp, max_hp=max_hp, stamina=stamina, max_stamina=max_stamina,
+                    damage=damage, speed=speed, dodge_cooldown=dodge_cooldown,
+                    is_dodging=bool(is_dodging), gold=gold, souls=souls, keys=keys,
+                    crit_chance=crit_chance, crit_damage=crit_damage, armor=armor,
+                    dodge_chance=dodge_chance)
+    player.abilities = src.strings()
+    player.relics = src.strings()
+    player.curses = src.strings()
+
+    rooms = []
+    for _ in range(src.count()):
+        rx, ry, width, height, discovered, cleared, spawn_seed, spawn_count = src.unpack(ROOM)
+        room = Room(rx, ry, width, height, src.string(), discovered=bool(discovered),
+                    cleared=bool(cleared), spawn_seed=spawn_seed, spawn_count=spawn_count)
+        room.connections = {src.count() for _ in range(src.count())}
+        for _ in range(src.count()):
+            ex, ey, ehp, emax_hp, edamage, espeed, elite = src.unpack(ENEMY)
+            enemy = Enemy(x=ex, y=ey, hp=ehp, max_hp=emax_hp, damage=edamage, speed=espeed,
+                          enemy_type=src.string(), is_elite=bool(elite))
+            enemy.modifiers = src.strings()
+            room.enemies.append(enemy)
+        room.items = src.json()
+        rooms.append(room)
+
+    fog_x, fog_y, fog_width, fog_height = src.unpack(FOG)
+    fog_bits = np.frombuffer(src.bytes(), dtype=np.uint8)
+    shop_items = src.json()
+    pending_choices = src.json()
+
+    # Everything parsed: now swap it in
+    state.seed = seed
+    state.current_floor = floor
+    state.current_biome = biome
+    state.player = player
+    state.rebuild_player_modifiers()
+    state.install_floor(rooms)
+    state.current_room_index = room_index
+    state.player.x, state.player.y = x, y
+    if (fog_x, fog_y, fog_width, fog_height) == (state.fog_of_war.origin_x, state.fog_of_war.origin_y,
+                                                 state.fog_of_war.width, state.fog_of_war.height):
+        grid = np.unpackbits(fog_bits, count=fog_width * fog_height).astype(bool)
+        state.fog_of_war.grid[:] = grid.reshape(fog_height, fog_width)
+        state.fog_of_war.version += 1
+
+    state.run_time = run_time
+    state.enemies_killed = killed
+    state.rooms_explored = explored
+    state.items_collected = collected
+    state.total_damage_dealt = dealt
+    state.total_damage_taken = taken
+    state.price_modifier = price_modifier
+    state.vision_range = vision_range
+    state.shop_items = shop_items
+    state.pending_choices = pending_choices
+    state.in_combat = False
+    state.enemies = []
+
+
+def detached_state(snap: Snapshot) -> SimpleNamespace:
+    """
+    Rebuild what dump_state() reads from a GameState snapshot.
+
+    The result only holds copies of the snapshot's frozen fields, never the
+    live player, rooms or enemies, so it can be serialized on another
+    thread while the game keeps changing them.
+    """
+    state = SimpleNamespace(**snap.values)
+    state.player = SimpleNamespace(**snap.player[1])
+    enemies = {id(enemy): Enemy(**dict(zip(ENEMY_STATE, values)), modifiers=list(modifiers))
+               for enemy, values, modifiers in snap.enemies}
+    state.rooms = [Room(**dict(zip(ROOM_STATE, values)), enemies=[enemies[id(e)] for e in room_enemies],
+                        items=list(items))
+                   for _, values, room_enemies, items in snap.rooms]
+    live_fog = snap.values["fog_of_war"]
+    state.fog_of_war = FogOfWar(live_fog.origin_x, live_fog.origin_y, 0, 0)
+    state.fog_of_war.grid = snap.fog[0]
+    return state
+
+
+def write_snapshot(path: str, snap: Snapshot):
+    """Serialize a GameState snapshot and write it atomically; runs on the save worker."""
+    write_atomic(path, dump_state(detached_state(snap)))
+
+
+class SaveManager:
+    """
+    Reads and writes save slots.
+
+    save_async() only takes a GameState snapshot on the calling thread; a
+    worker serializes it, writes a temp file and renames it over the slot,
+    so a crash mid-write never leaves a half-written save and the frame
+    waits on neither packing nor disk I/O.
+    """
+
+    def __init__(self, settings):
+        """Initialize the manager for the configured save file."""
+        self.settings = settings
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending: Optional[Future] = None
+
+    def path(self, slot: int = 0) -> str:
+        """Return the file path of a save slot."""
+        if not 0 <= slot < self.settings.MAX_SAVE_SLOTS:
+            raise ValueError(f"Save slot {slot} out of range 0-{self.settings.MAX_SAVE_SLOTS - 1}")
+        if slot == 0:
+            return self.settings.SAVE_FILE
+        root, ext = os.path.splitext(self.settings.SAVE_FILE)
+        return f"{root}.{slot}{ext}"
+
+    def save(self, state: GameState, slot: int = 0):
+        """Write a save slot synchronously."""
+        write_atomic(self.path(slot), dump_state(state))
+
+    def save_async(self, state: GameState, slot: int = 0) -> Future:
+        """Snapshot ``state`` and serialize and write it on the background thread."""
+        snap = state.snapshot()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
+        self.pending = self.executor.submit(write_snapshot, self.path(slot), snap)
+        return self.pending
+
+    def load(self, state: GameState, slot: int = 0):
+        """Load a save slot into ``state``."""
+        self.wait()
+        try:
+            with open(self.path(slot), "rb") as f:
+                data = f.read()
+        except OSError as e:
+            raise SaveError(f"Cannot read save: {e}") from e
+        load_state(data, state)
+
+    def exists(self, slot: int = 0) -> bool:
+        """Check whether a save slot has been written."""
+        return os.path.exists(self.path(slot))
+
+    def wait(self):
+        """Block until the last background save has finished."""
+        if self.pending is not None:
+            self.pending.result()
+            self.pending = None
+
+    def shutdown(self):
+        """Finish outstanding writes and stop the worker thread."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+
+def write_atomic(path: str, data: bytes):
+    """Write ``data`` to a temp file beside ``path`` and rename it into place."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp = f"{path}.tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
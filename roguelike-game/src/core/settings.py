@@ -12,8 +12,11 @@ class Settings:
     # Display settings
     SCREEN_WIDTH: int = 1280
     SCREEN_HEIGHT: int = 720
-    FPS: int = 60
+    FPS: int = 60  # render rate cap
+    SIM_TICK_RATE: int = 60  # fixed simulation updates per second
+    MAX_SIM_STEPS_PER_FRAME: int = 5  # catch-up cap per rendered frame
     TITLE: str = "Roguelike - Core Loop"
+    DIRTY_RECT_RENDERING: bool = False  # redraw only changed regions
     
     # Colors (RGB)
     BLACK: Tuple[int, int, int] = (0, 0, 0)
@@ -35,10 +38,18 @@ class Settings:
     PLAYER_BASE_DAMAGE: int = 10
     STAMINA_MAX: int = 100
     STAMINA_REGEN: float = 20.0  # per second
+    PROJECTILE_CAPACITY: int = 512  # live projectiles; further shots are dropped
+    PLAYER_PROJECTILE_SPEED: float = 12.0  # tiles per second
+    PLAYER_RANGED_RANGE: float = 8.0  # tiles
+    PLAYER_RANGED_DAMAGE: float = 0.5  # share of melee damage
+    PLAYER_RANGED_COOLDOWN: float = 0.5  # seconds
     
     # Exploration settings
     VISION_RANGE: int = 5  # tiles
+    CAVERNS_VISION_RANGE: int = 3  # tiles
     FOG_ALPHA: int = 128  # transparency for fog of war
+    HAZARD_CHANCE: float = 0.03  # share of room tiles that are hazards in FACTORY/VOID
+    FLOW_FIELD_CACHE_SIZE: int = 32  # pathfinding fields kept per floor
     
     # Economy settings
     STARTING_GOLD: int = 50
@@ -49,11 +60,15 @@ class Settings:
     MIN_ROOM_SIZE: int = 5
     MAX_ROOM_SIZE: int = 9
     ROOMS_PER_FLOOR: int = 10
+    PREFETCH_FLOORS: bool = True  # build the next floor in the background
+    AUTO_ESCALATE: bool = False  # clear empty rooms and descend once the floor is cleared
     
     # Difficulty scaling
     HP_SCALE_PER_FLOOR: float = 1.15
     DAMAGE_SCALE_PER_FLOOR: float = 1.10
     ENEMY_DENSITY_INCREASE: float = 0.1
+    ENEMY_DATA_FILE: str = ""  # archetype YAML; empty uses assets/data/enemies.yaml
+    ELITE_SPAWN_HOPS: int = 3  # elites from push-your-luck land within this many rooms
     
     # UI settings
     UI_PANEL_HEIGHT: int = 150
@@ -69,10 +84,27 @@ class Settings:
     KEY_INTERACT: int = pygame.K_e
     KEY_INVENTORY: int = pygame.K_TAB
     KEY_PAUSE: int = pygame.K_ESCAPE
+    KEY_PROFILER: int = pygame.K_F3
+    
+    # Memory
+    COMBAT_GC: str = "normal"  # "freeze" or "disable" keeps full GC passes out of fights
+    ALLOCATION_HISTORY: int = 64  # floors of entity allocation counts kept
+    
+    # Profiling
+    PROFILER_ENABLED: bool = True
+    PROFILER_WINDOW: int = 600  # samples kept per phase and section
+    PROFILE_DUMP_PATH: str = ""  # .csv or .json written on exit when set
+    
+    # Event log
+    EVENT_LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING or OFF
+    EVENT_LOG_CAPACITY: int = 4096  # ring buffer slots
+    EVENT_LOG_FLUSH_INTERVAL: float = 0.25  # seconds between background flushes
+    COMBAT_LOG_SIZE: int = 50  # entries shown by GameState.combat_log
     
     # Meta progression
     SAVE_FILE: str = "savegame.dat"
     MAX_SAVE_SLOTS: int = 3
+    AUTO_SAVE: bool = True  # save to slot 0 on every new floor
     
     def get_grid_size(self) -> Tuple[int, int]:
         """Calculate grid dimensions based on screen and tile size."""
@@ -0,0 +1,156 @@
+"""Spatial indexes for floor lookups."""
+
+import math
+import numpy as np
+from typing import Dict, Iterator, List, Tuple
+
+
+# Packs a (col, row) grid cell into one sortable key
+CELL_KEY = 1 << 21
+NEIGHBOUR_CELLS = np.array([(ox, oy) for ox in (-1, 0, 1) for oy in (-1, 0, 1)], dtype=np.int64)
+
+class RoomIndex:
+    """
+    Uniform grid over room rectangles.
+
+    Each cell lists the rooms overlapping it, so finding the room that
+    contains a tile only tests the handful of rooms in one cell. The last
+    hit is remembered, and lookups inside that room return immediately.
+    Build a new index whenever the floor's rooms change.
+    """
+
+    def __init__(self, rooms: List, cell_size: int):
+        """Index ``rooms`` on a grid of ``cell_size`` tile cells."""
+        self.rooms = rooms
+        self.cell_size = max(1, cell_size)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.last_index = -1
+
+        size = self.cell_size
+        for i, room in enumerate(rooms):
+            for cx in range(room.x // size, (room.x + room.width - 1) // size + 1):
+                for cy in range(room.y // size, (room.y + room.height - 1) // size + 1):
+                    self.cells.setdefault((cx, cy), []).append(i)
+
+    def room_at(self, x: float, y: float) -> int:
+        """Return the index of the room containing tile (x, y), or -1."""
+        px = int(x)
+        py = int(y)
+
+        # Still inside the last room found
+        if self.last_index >= 0 and self.contains(self.last_index, px, py):
+            return self.last_index
+
+        for i in self.cells.get((px // self.cell_size, py // self.cell_size), ()):
+            if self.contains(i, px, py):
+                self.last_index = i
+                return i
+        return -1
+
+    def contains(self, index: int, px: int, py: int) -> bool:
+        """Check whether room ``index`` contains tile (px, py)."""
+        room = self.rooms[index]
+        return room.x <= px < room.x + room.width and room.y <= py < room.y + room.height
+
+
+class SpatialHash:
+    """
+    Hash of point positions into square cells.
+
+    Positions are read from the coordinate arrays passed to rebuild(), so
+    queries see in-place updates to those arrays; call rebuild() again
+    after points move further than a cell or are added/removed. Queries
+    only visit the cells overlapping their radius, costing O(k) in the
+    local density rather than O(n) in the total number of points.
+    """
+
+    def __init__(self, cell_size: float = 1.0):
+        """Create an empty hash with ``cell_size`` tile cells."""
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.xs = np.zeros(0)
+        self.ys = np.zeros(0)
+
+    def rebuild(self, xs: np.ndarray, ys: np.ndarray):
+        """Re-bucket every point; index i is the point (xs[i], ys[i])."""
+        self.xs = xs
+        self.ys = ys
+        self.cells = {}
+        cols = np.floor(xs / self.cell_size).astype(np.int64).tolist()
+        rows = np.floor(ys / self.cell_size).astype(np.int64).tolist()
+        for i, key in enumerate(zip(cols, rows)):
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [i]
+            else:
+                bucket.append(i)
+
+    def __len__(self) -> int:
+        """Number of indexed points."""
+        return len(self.xs)
+
+    def candidates(self, x: float, y: float, radius: float) -> Iterator[int]:
+        """Yield the points in every cell overlapping the query circle."""
+        size = self.cell_size
+        for cx in range(math.floor((x - radius) / size), math.floor((x + radius) / size) + 1):
+            for cy in range(math.floor((y - radius) / size), math.floor((y + radius) / size) + 1):
+                yield from self.cells.get((cx, cy), ())
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[int]:
+        """Return the indices of points within ``radius`` of (x, y)."""
+        r2 = radius * radius
+        xs, ys = self.xs, self.ys
+        return [i for i in self.candidates(x, y, radius)
+                if (xs[i] - x) ** 2 + (ys[i] - y) ** 2 <= r2]
+
+    def nearest(self, x: float, y: float, max_range: float) -> int:
+        """Return the index of the nearest point closer than ``max_range``, or -1."""
+        best = -1
+        best_d2 = max_range * max_range
+        xs, ys = self.xs, self.ys
+        for i in self.candidates(x, y, max_range):
+            d2 = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+            if d2 < best_d2:
+                best = i
+                best_d2 = d2
+        return best
+
+    def neighbours(self, index: int, radius: float) -> Iterator[int]:
+        """Yield the other points within ``radius`` of point ``index``."""
+        for j in self.query_radius(self.xs[index], self.ys[index], radius):
+            if j != index:
+                yield j
+
+
+def close_pairs(xs: np.ndarray, ys: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return every ordered pair (i, j), i != j, of points within ``radius``.
+
+    A uniform-grid broadphase done with array operations: cells are
+    ``radius`` wide, each point is listed under the nine cells around its
+    own, and one sorted lookup per point finds its candidates, so the
+    exact distance test only runs on local pairs.
+    """
+    none = np.zeros(0, dtype=np.int64)
+    n = len(xs)
+    if n < 2 or radius <= 0:
+        return none, none
+
+    cols = np.floor(xs / radius).astype(np.int64)
+    rows = np.floor(ys / radius).astype(np.int64)
+    keys = ((cols[:, None] + NEIGHBOUR_CELLS[:, 0]) * CELL_KEY + rows[:, None] + NEIGHBOUR_CELLS[:, 1]).ravel()
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    listed = order // len(NEIGHBOUR_CELLS)
+
+    own = cols * CELL_KEY + rows
+    lo = np.searchsorted(sorted_keys, own, side="left")
+    counts = np.searchsorted(sorted_keys, own, side="right") - lo
+    total = int(counts.sum())
+
+    # Expand each point's [lo, lo + count) run of candidates
+    starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+    first = np.repeat(np.arange(n), counts)
+    second = listed[starts + np.arange(total)]
+    close = (first != second) & ((xs[first] - xs[second]) ** 2 + (ys[first] - ys[second]) ** 2 <= radius * radius)
+    return first[close], second[close]
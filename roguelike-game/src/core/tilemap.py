@@ -0,0 +1,130 @@
+"""Compact tile grid for a floor."""
+
+import math
+import random
+import numpy as np
+from typing import List
+
+
+# Tile codes, one byte per cell
+WALL = 0
+FLOOR = 1
+DOOR = 2
+CORRIDOR = 3
+HAZARD = 4
+
+ROOM_TILES = (FLOOR, HAZARD)
+
+
+class TileMap:
+    """
+    A floor as a uint8 grid of tile codes.
+
+    The grid is indexed [row, col] and covers the floor starting at tile
+    (origin_x, origin_y); everything outside it is wall. Rooms are carved
+    as FLOOR, connections between rooms as CORRIDOR with a DOOR where a
+    corridor enters a room, and biomes with hazards scatter HAZARD tiles
+    over room floors.
+    """
+
+    def __init__(self, origin_x: int, origin_y: int, width: int, height: int):
+        """Create a grid of solid wall."""
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.grid = np.full((height, width), WALL, dtype=np.uint8)
+
+    @classmethod
+    def from_rooms(cls, rooms: List, rng: random.Random, hazard_chance: float = 0.0) -> "TileMap":
+        """Carve rooms and corridors along each room connection."""
+        if not rooms:
+            return cls(0, 0, 0, 0)
+
+        # One wall tile of margin around the rooms
+        left = min(room.x for room in rooms) - 1
+        top = min(room.y for room in rooms) - 1
+        right = max(room.x + room.width for room in rooms) + 1
+        bottom = max(room.y + room.height for room in rooms) + 1
+        tiles = cls(left, top, right - left, bottom - top)
+        grid = tiles.grid
+
+        for room in rooms:
+            grid[tiles.room_slice(room)] = FLOOR
+
+        # L-shaped corridors between room centres, horizontal leg first
+        for i, room in enumerate(rooms):
+            for j in room.connections:
+                if j > i:
+                    tiles.carve_corridor(room, rooms[j])
+
+        # Doors where corridors touch room floor
+        floor = grid == FLOOR
+        touching = np.zeros_like(floor)
+        touching[1:, :] |= floor[:-1, :]
+        touching[:-1, :] |= floor[1:, :]
+        touching[:, 1:] |= floor[:, :-1]
+        touching[:, :-1] |= floor[:, 1:]
+        grid[(grid == CORRIDOR) & touching] = DOOR
+
+        # Hazards on room floors, never in the start room
+        if hazard_chance > 0:
+            np_rng = np.random.default_rng(rng.getrandbits(64))
+            hazards = (grid == FLOOR) & (np_rng.random(grid.shape) < hazard_chance)
+            for room in rooms:
+                if room.room_type == "start":
+                    hazards[tiles.room_slice(room)] = False
+            grid[hazards] = HAZARD
+
+        return tiles
+
+    @property
+    def width(self) -> int:
+        """Grid width in tiles."""
+        return self.grid.shape[1]
+
+    @property
+    def height(self) -> int:
+        """Grid height in tiles."""
+        return self.grid.shape[0]
+
+    def room_slice(self, room):
+        """Return the grid slice covering a room's floor."""
+        x = room.x - self.origin_x
+        y = room.y - self.origin_y
+        return slice(y, y + room.height), slice(x, x + room.width)
+
+    def carve_corridor(self, a, b):
+        """Carve wall tiles between the centres of rooms a and b into corridor."""
+        ax = a.x + a.width // 2 - self.origin_x
+        ay = a.y + a.height // 2 - self.origin_y
+        bx = b.x + b.width // 2 - self.origin_x
+        by = b.y + b.height // 2 - self.origin_y
+
+        row = self.grid[ay, min(ax, bx):max(ax, bx) + 1]
+        row[row == WALL] = CORRIDOR
+        column = self.grid[min(ay, by):max(ay, by) + 1, bx]
+        column[column == WALL] = CORRIDOR
+
+    def tile_at(self, x: float, y: float) -> int:
+        """Return the tile code at tile (x, y); outside the grid is wall."""
+        col = math.floor(x) - self.origin_x
+        row = math.floor(y) - self.origin_y
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return int(self.grid[row, col])
+        return WALL
+
+    def is_walkable(self, x: float, y: float) -> bool:
+        """Check whether tile (x, y) can be walked on."""
+        return self.tile_at(x, y) != WALL
+
+    def is_room_floor(self, x: float, y: float) -> bool:
+        """Check whether tile (x, y) is inside a room rather than a doorway or corridor."""
+        return self.tile_at(x, y) in ROOM_TILES
+
+    def room_floor_mask(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Vectorized is_room_floor() over arrays of tile coordinates."""
+        cols = np.floor(xs).astype(np.int64) - self.origin_x
+        rows = np.floor(ys).astype(np.int64) - self.origin_y
+        inside = (cols >= 0) & (cols < self.width) & (rows >= 0) & (rows < self.height)
+        codes = np.full(len(cols), WALL, dtype=np.uint8)
+        codes[inside] = self.grid[rows[inside], cols[inside]]
+        return np.isin(codes, ROOM_TILES)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Roguelike Game - Fight Estimator
+Monte Carlo survival and time-to-kill estimates for a build, floor by floor
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from core.archetypes import load_archetypes
+from core.batch import parse_overrides
+from core.combat_model import Build, estimate_room
+from core.game_state import Biome, Player
+from core.settings import Settings
+
+
+def floor_biome(floor: int) -> Biome:
+    """Return the biome a run is in on ``floor`` (a new one every three floors)."""
+    biomes = list(Biome)
+    return biomes[min((floor - 1) // 3, len(biomes) - 1)]
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    player = Player()
+    parser = argparse.ArgumentParser(description="Estimate fights of a player build against each floor's rooms")
+    parser.add_argument("--floors", type=int, nargs="+", default=list(range(1, 11)),
+                        help="floors to estimate")
+    parser.add_argument("--hp", type=int, default=player.hp)
+    parser.add_argument("--damage", type=int, default=player.damage)
+    parser.add_argument("--armor", type=int, default=player.armor)
+    parser.add_argument("--crit-chance", type=float, default=player.crit_chance)
+    parser.add_argument("--dodge-rate", type=float, default=0.0,
+                        help="share of enemy attacks dodged")
+    parser.add_argument("--enemies", type=int, default=None,
+                        help="enemies per room (default: a standard room of that floor)")
+    parser.add_argument("--trials", type=int, default=100_000)
+    parser.add_argument("--set", dest="overrides", action="append", default=[],
+                        metavar="KEY=VALUE", help="override a Settings field")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main():
+    """Fight estimator entry point."""
+    args = parse_args()
+    settings = Settings(**parse_overrides(args.overrides))
+    registry = load_archetypes(settings.ENEMY_DATA_FILE)
+    build = Build(hp=args.hp, damage=args.damage, crit_chance=args.crit_chance, armor=args.armor,
+                  dodge_rate=args.dodge_rate)
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'floor':>5} {'biome':>8} {'enemies':>7} {'death':>7} {'ttk p50':>8} {'ttk p90':>8} "
+          f"{'dmg p50':>8} {'dmg p90':>8}")
+    start = time.perf_counter()
+    for floor in args.floors:
+        biome = floor_biome(floor)
+        table = registry.compile(biome.name, floor, settings.HP_SCALE_PER_FLOOR, settings.DAMAGE_SCALE_PER_FLOOR)
+        count = args.enemies or 2 + int(floor * settings.ENEMY_DENSITY_INCREASE)
+        result = estimate_room(build, table, count, registry.ranged, args.trials, rng).summary()
+        print(f"{floor:>5} {biome.name:>8} {count:>7} {result['death_probability']:>6.1%} "
+              f"{result['ttk_p50']:>7.1f}s {result['ttk_p90']:>7.1f}s "
+              f"{result['damage_p50']:>8.0f} {result['damage_p90']:>8.0f}")
+    print(f"{len(args.floors) * args.trials} fights in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ Roguelike Game - Main Entry Point
 Implements the 8-phase core gameplay loop
 """
 
+import argparse
+import random
 import pygame
 import sys
 from pathlib import Path
@@ -15,20 +17,56 @@ from core.game import Game
 from core.settings import Settings
 
 
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Roguelike - Core Loop")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without a window or frame cap")
+    parser.add_argument("--steps", type=int, default=10000,
+                        help="number of simulation steps in headless mode")
+    parser.add_argument("--dt", type=float, default=None,
+                        help="fixed timestep in seconds for headless mode")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed")
+    parser.add_argument("--profile-out", default="",
+                        help="write frame timings to this .csv or .json file on exit")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from the auto-save")
+    return parser.parse_args(argv)
+
+
 def main():
     """Main entry point for the game."""
-    pygame.init()
-    
+    args = parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+
     # Load settings
-    settings = Settings()
-    
+    settings = Settings(PROFILE_DUMP_PATH=args.profile_out)
+
+    if args.headless:
+        # Display-free soak run
+        game = Game(settings, headless=True)
+        if args.resume:
+            game.load_game()
+        steps = game.simulate(args.steps, dt=args.dt)
+        print(f"Simulated {steps} steps, ended in {game.current_phase.name} "
+              f"on floor {game.state.current_floor}")
+        if settings.PROFILE_DUMP_PATH:
+            game.profiler.dump(settings.PROFILE_DUMP_PATH)
+        sys.exit()
+
+    pygame.init()
+
     # Create and run game
     game = Game(settings)
+    if args.resume:
+        game.load_game()
     game.run()
-    
+
     pygame.quit()
     sys.exit()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
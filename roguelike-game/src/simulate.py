@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Roguelike Game - Batch Simulator
+Runs many headless games in parallel for balance sweeps
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from core.batch import run_batch, parse_overrides
+from core.policies import POLICIES
+
+
+def parse_seed_range(text: str) -> range:
+    """Parse 'START:STOP' (or a single count N meaning 0:N) into a range."""
+    if ":" in text:
+        start, stop = text.split(":", 1)
+        return range(int(start), int(stop))
+    return range(int(text))
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run headless games across a process pool")
+    parser.add_argument("--seeds", type=parse_seed_range, default=range(100),
+                        help="seed range as START:STOP or a run count (default 100)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy",
+                        help="scripted input policy")
+    parser.add_argument("--set", dest="overrides", action="append", default=[],
+                        metavar="KEY=VALUE", help="override a Settings field")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--max-time", type=float, default=900.0,
+                        help="simulated seconds before a run is cut off")
+    parser.add_argument("--out", type=Path, default=None,
+                        help="write per-run records to a .csv or .jsonl file")
+    return parser.parse_args(argv)
+
+
+def write_records(records, path: Path):
+    """Write run records as CSV or JSON lines depending on the extension."""
+    rows = [record.to_dict() for record in records]
+    if path.suffix == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else [])
+            writer.writeheader()
+            for row in rows:
+                row["gold_curve"] = " ".join(str(g) for g in row["gold_curve"])
+                writer.writerow(row)
+    else:
+        with open(path, "w") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+
+def main():
+    """Batch simulator entry point."""
+    args = parse_args()
+    overrides = parse_overrides(args.overrides)
+
+    start = time.perf_counter()
+    records = run_batch(args.seeds, overrides=overrides, policy=args.policy,
+                        max_time=args.max_time, processes=args.workers)
+    elapsed = time.perf_counter() - start
+
+    if args.out:
+        write_records(records, args.out)
+
+    count = len(records)
+    if count:
+        mean_floor = sum(r.floor_reached for r in records) / count
+        deaths = sum(r.died for r in records)
+        timeouts = sum(r.timed_out for r in records)
+        print(f"{count} runs in {elapsed:.1f}s ({count / elapsed:.1f} runs/s)")
+        print(f"Mean floor reached: {mean_floor:.2f}")
+        print(f"Deaths: {deaths}  Timed out: {timeouts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ from abc import ABC, abstractmethod
 from typing import List
 import pygame
 
+from core.input import PygameInput
+
 
 class BaseSystem(ABC):
     """Abstract base class for game systems."""
@@ -13,6 +15,7 @@ class BaseSystem(ABC):
         self.game_state = game_state
         self.settings = settings
         self.active = False
+        self.input = PygameInput()
     
     @abstractmethod
     def enter(self):
@@ -27,13 +27,13 @@ class ChoiceSystem(BaseSystem):
         self.active = True
         self.choice_confirmed = False
         self.selected_index = 0
-        print("Entering CHOICE phase")
+        self.game_state.events.debug("phase", "Entering CHOICE phase")
         
         # Get pending choices
         if self.game_state.pending_choices:
             choice_data = self.game_state.pending_choices.pop(0)
             self.current_choices = choice_data.get("options", [])
-            print(f"Presenting {len(self.current_choices)} choices")
+            self.game_state.events.debug("choice", "Presenting {count} choices", count=len(self.current_choices))
     
     def update(self, dt: float, events: List[pygame.event.Event]):
         """Update choice logic."""
@@ -61,7 +61,7 @@ class ChoiceSystem(BaseSystem):
             choice = self.current_choices[self.selected_index]
             self.game_state.selected_choice = choice
             self.choice_confirmed = True
-            print(f"Selected: {choice.get('name', 'Unknown')}")
+            self.game_state.events.info("choice", "Selected: {name}", name=choice.get('name', 'Unknown'))
     
     def choice_made(self) -> bool:
         """Check if a choice has been made."""
@@ -1,11 +1,16 @@
 """Combat system - Phase 2 of the core loop."""
 
 import pygame
-from typing import List
-import math
+from typing import Dict, List
 import random
+import numpy as np
 
 from systems.base import BaseSystem
+from core.enemy_pool import EnemyPool
+from core.combat_model import MELEE_RANGE, attack_damage, mitigate
+from core.modifiers import ModifierChain, compile_chain
+from core.projectiles import ProjectilePool, PLAYER, ENEMY, PLAYER_RADIUS, ENEMY_RADIUS
+from core.pooling import GCPause
 
 
 class CombatSystem(BaseSystem):
@@ -13,6 +18,7 @@ class CombatSystem(BaseSystem):
     Handles combat phase:
     - Enemy AI and movement
     - Attack telegraphs
+    - Projectiles
     - Damage calculation
     - I-frames and dodging
     """
@@ -22,25 +28,59 @@ class CombatSystem(BaseSystem):
         super().__init__(game_state, settings)
         self.combat_complete = False
         self.player_victory = False
-        self.telegraph_timers = {}
-        self.attack_cooldowns = {}
+        self.pool = EnemyPool()
+        self.enemy_chains: Dict[int, ModifierChain] = {}  # pool handle -> chain, for enemies with hooks
+        self.projectiles = ProjectilePool(settings.PROJECTILE_CAPACITY)
+        self.ranged_cooldown = 0.0
+        self.gc_pause = GCPause(settings.COMBAT_GC)
     
     def enter(self):
         """Enter combat phase."""
         self.active = True
         self.combat_complete = False
         self.player_victory = False
-        print("Entering COMBAT phase")
+        self.game_state.events.debug("phase", "Entering COMBAT phase")
         
-        # Initialize combat with current room's enemies
+        # Initialize combat with current room's enemies; the pool is
+        # authoritative for their positions, hp and timers until combat ends.
+        # The room shares the pool's list, so kills and spawns update it by row
         current_room = self.game_state.rooms[self.game_state.current_room_index]
-        self.game_state.enemies = current_room.enemies.copy()
+        self.pool.load(current_room.enemies)
+        current_room.enemies = self.game_state.enemies = self.pool.enemies
+        for row in range(self.pool.count):
+            self.arm(row)
+        self.projectiles.clear()
+        self.ranged_cooldown = 0.0
+        self.track_all_modifiers()
         self.game_state.in_combat = True
-        
-        # Initialize enemy timers
-        for i, enemy in enumerate(self.game_state.enemies):
-            self.telegraph_timers[i] = 0
-            self.attack_cooldowns[i] = random.uniform(1.0, 2.0)
+        self.gc_pause.begin()
+    
+    def exit(self):
+        """Leave the combat phase."""
+        super().exit()
+        self.gc_pause.end()
+    
+    def snapshot(self) -> tuple:
+        """Capture the fight for a later restore(), alongside a GameState snapshot."""
+        return (self.active, self.combat_complete, self.player_victory, self.pool.snapshot(),
+                self.projectiles.snapshot(), self.ranged_cooldown)
+    
+    def restore(self, snap: tuple):
+        """Return to a snapshot; call after restoring the GameState snapshot taken with it."""
+        active, self.combat_complete, self.player_victory, pool, projectiles, self.ranged_cooldown = snap
+        if active and not self.active:
+            self.gc_pause.begin()
+        elif self.active and not active:
+            self.gc_pause.end()
+        self.active = active
+        self.pool.restore(pool)
+        self.projectiles.restore(projectiles)
+        # Handles may have been reused since; chains follow the restored records
+        self.track_all_modifiers()
+        if active:
+            # The restored room gets its own list back; share the pool's again
+            room = self.game_state.rooms[self.game_state.current_room_index]
+            room.enemies = self.game_state.enemies = self.pool.enemies
     
     def update(self, dt: float, events: List[pygame.event.Event]):
         """Update combat logic."""
@@ -50,15 +90,20 @@ class CombatSystem(BaseSystem):
         # Update player dodge cooldown
         if self.game_state.player.dodge_cooldown > 0:
             self.game_state.player.dodge_cooldown -= dt
+        if self.ranged_cooldown > 0:
+            self.ranged_cooldown -= dt
         
-        # Update dodge duration
+        # End the dodge's i-frames DODGE_DURATION into its cooldown
         if self.game_state.player.is_dodging:
-            # Check if dodge should end (simplified for now)
-            pass
+            if self.game_state.player.dodge_cooldown <= self.settings.DODGE_COOLDOWN - self.settings.DODGE_DURATION:
+                self.game_state.player.is_dodging = False
         
         # Handle player input
         self.handle_player_combat(dt, events)
         
+        # Move projectiles and resolve their hits
+        self.update_projectiles(dt)
+        
         # Update enemies
         self.update_enemies(dt)
         
@@ -67,7 +112,7 @@ class CombatSystem(BaseSystem):
     
     def handle_player_combat(self, dt: float, events: List[pygame.event.Event]):
         """Handle player combat actions."""
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
         
         # Movement (same as exploration but in combat context)
         dx, dy = 0, 0
@@ -91,10 +136,8 @@ class CombatSystem(BaseSystem):
             new_x = self.game_state.player.x + dx * speed
             new_y = self.game_state.player.y + dy * speed
             
-            # Simple bounds check
-            room = self.game_state.rooms[self.game_state.current_room_index]
-            if (room.x <= new_x < room.x + room.width and
-                room.y <= new_y < room.y + room.height):
+            # Stay on the room's floor; doorways are closed during a fight
+            if self.game_state.tiles.is_room_floor(new_x, new_y):
                 self.game_state.player.x = new_x
                 self.game_state.player.y = new_y
         
@@ -108,152 +151,257 @@ class CombatSystem(BaseSystem):
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
                     self.player_attack()
+                elif event.button == 3:  # Right click
+                    self.player_shoot()
+    
+    def spawn_enemy(self, enemy) -> int:
+        """Add ``enemy`` to the current fight and return its pool handle."""
+        handle = self.pool.spawn(enemy)
+        self.arm(self.pool.row(handle))
+        self.game_state.record_enemy_spawned(enemy)
+        self.track_modifiers(handle, enemy)
+        self.game_state.events.debug("combat", "{enemy} joined the fight!", enemy=enemy.enemy_type)
+        return handle
+    
+    def track_all_modifiers(self):
+        """Compile the modifier chains of every enemy in the pool."""
+        self.enemy_chains = {}
+        for row, enemy in enumerate(self.pool.enemies):
+            self.track_modifiers(self.pool.handle(row), enemy)
+    
+    def track_modifiers(self, handle: int, enemy):
+        """Remember the compiled modifier chain of enemy ``handle``, if its modifiers have hooks."""
+        chain = compile_chain(tuple(enemy.modifiers))
+        if chain:
+            self.enemy_chains[handle] = chain
+    
+    def arm(self, row: int):
+        """Give the enemy at ``row`` its archetype's projectile attack, if it has one."""
+        attack = self.game_state.archetypes.ranged.get(self.pool.enemies[row].enemy_type)
+        if attack is not None:
+            self.pool.arm(row, attack.speed, attack.range)
     
     def perform_dodge(self):
         """Execute player dodge."""
         self.game_state.player.is_dodging = True
         self.game_state.player.dodge_cooldown = self.settings.DODGE_COOLDOWN
-        print("Player dodged!")
-        
-        # TODO: Add i-frame timer
+        self.game_state.events.debug("combat", "Player dodged!")
     
     def player_attack(self):
         """Player attacks nearest enemy."""
-        if not self.game_state.enemies:
+        pool = self.pool
+        if not pool.count:
             return
         
-        # Find nearest enemy
-        px = self.game_state.player.x
-        py = self.game_state.player.y
+        # Find nearest enemy within melee range
+        player = self.game_state.player
+        target = pool.nearest(player.x, player.y, MELEE_RANGE)
         
-        nearest_enemy = None
-        min_dist = float('inf')
+        if target >= 0:
+            # Deal damage, with a chance to crit
+            roll = random.random()
+            damage = int(attack_damage(player.damage, player.crit_chance, player.crit_damage, roll))
+            if roll < player.crit_chance:
+                self.game_state.events.debug("combat", "Critical hit!")
+            
+            damage = self.damage_enemy(pool.handle(target), damage)
+            self.game_state.events.info("combat", "Dealt {damage} damage to {target}", damage=damage, target=pool.enemies[target].enemy_type)
+    
+    def player_shoot(self):
+        """Player fires a projectile at the nearest enemy in range."""
+        pool = self.pool
+        if self.ranged_cooldown > 0 or not pool.count:
+            return
         
-        for enemy in self.game_state.enemies:
-            dist = math.sqrt((enemy.x - px) ** 2 + (enemy.y - py) ** 2)
-            if dist < min_dist and dist < 2.0:  # Attack range of 2 tiles
-                min_dist = dist
-                nearest_enemy = enemy
+        player = self.game_state.player
+        target = pool.nearest(player.x, player.y, self.settings.PLAYER_RANGED_RANGE)
+        if target < 0:
+            return
         
-        if nearest_enemy:
-            # Deal damage
-            damage = self.game_state.player.damage
-            
-            # Apply crit
-            if random.random() < self.game_state.player.crit_chance:
-                damage = int(damage * self.game_state.player.crit_damage)
-                print("Critical hit!")
-            
-            nearest_enemy.hp -= damage
-            self.game_state.total_damage_dealt += damage
-            print(f"Dealt {damage} damage to {nearest_enemy.enemy_type}")
+        dx = pool.x[target] - player.x
+        dy = pool.y[target] - player.y
+        dist = max(float(np.hypot(dx, dy)), 1e-6)
+        speed = self.settings.PLAYER_PROJECTILE_SPEED
+        damage = max(1, int(player.damage * self.settings.PLAYER_RANGED_DAMAGE))
+        self.projectiles.fire(player.x, player.y, dx / dist * speed, dy / dist * speed,
+                              self.settings.PLAYER_RANGED_RANGE / speed, damage, PLAYER)
+        self.ranged_cooldown = self.settings.PLAYER_RANGED_COOLDOWN
+    
+    def update_projectiles(self, dt: float):
+        """Move every projectile and apply the hits of this step."""
+        shots = self.projectiles
+        if not shots.count:
+            return
+        shots.update(dt, self.game_state.tiles)
+        
+        # Player shots against enemies; the dead are removed by update_enemies
+        pool = self.pool
+        n = pool.count
+        rows, targets = shots.hits(PLAYER, pool.x[:n], pool.y[:n], ENEMY_RADIUS)
+        if len(rows):
+            self.damage_enemies(targets, shots.damage[rows])
+            shots.expire(rows)
+        
+        # Enemy shots against the player
+        player = self.game_state.player
+        rows, _ = shots.hits(ENEMY, np.array([player.x]), np.array([player.y]), PLAYER_RADIUS)
+        for damage in shots.damage[rows].tolist():
+            if self.combat_complete:
+                break
+            self.hit_player(int(damage), "Projectile")
+        shots.expire(rows)
+        shots.remove_spent()
     
     def update_enemies(self, dt: float):
         """Update enemy AI and attacks."""
-        px = self.game_state.player.x
-        py = self.game_state.player.y
+        pool = self.pool
         
-        enemies_to_remove = []
+        # Remove dead enemies
+        for enemy in pool.remove_dead():
+            self.game_state.record_enemy_killed(enemy)
+            self.game_state.events.info("combat", "{enemy} defeated!", enemy=enemy.enemy_type)
+            self.game_state.enemy_objects.release(enemy)
+        self.game_state.enemies = pool.enemies
+        self.tick_modifiers(dt)
         
-        for i, enemy in enumerate(self.game_state.enemies):
-            # Check if enemy is dead
-            if enemy.hp <= 0:
-                enemies_to_remove.append(i)
-                self.game_state.enemies_killed += 1
-                print(f"{enemy.enemy_type} defeated!")
-                continue
-            
-            # Update attack cooldown
-            if self.attack_cooldowns[i] > 0:
-                self.attack_cooldowns[i] -= dt
-            
-            # Calculate distance to player
-            dist = math.sqrt((enemy.x - px) ** 2 + (enemy.y - py) ** 2)
-            
-            if dist > 1.5:  # Move towards player
-                # Simple pathfinding
-                dx = px - enemy.x
-                dy = py - enemy.y
-                
-                # Normalize
-                length = math.sqrt(dx ** 2 + dy ** 2)
-                if length > 0:
-                    dx /= length
-                    dy /= length
-                
-                # Move enemy
-                enemy.x += dx * enemy.speed * dt
-                enemy.y += dy * enemy.speed * dt
-            
-            elif self.attack_cooldowns[i] <= 0:  # In range and can attack
-                # Start telegraph
-                if self.telegraph_timers[i] == 0:
-                    self.telegraph_timers[i] = 0.5  # 0.5 second telegraph
-                    print(f"{enemy.enemy_type} is preparing to attack!")
-                
-                # Update telegraph
-                self.telegraph_timers[i] -= dt
-                
-                # Execute attack
-                if self.telegraph_timers[i] <= 0:
-                    self.enemy_attack(enemy)
-                    self.attack_cooldowns[i] = 2.0  # Reset cooldown
-                    self.telegraph_timers[i] = 0
+        # Move along the room's flow field, telegraph and attack as one batched step
+        px, py = self.game_state.player.x, self.game_state.player.y
+        room_index = self.game_state.current_room_index
+        field = self.game_state.flow_fields.toward(px, py, self.game_state.rooms[room_index], room_index)
+        starting, attacking = pool.update(dt, px, py, field)
         
-        # Remove dead enemies
-        for i in reversed(enemies_to_remove):
-            del self.game_state.enemies[i]
-            del self.telegraph_timers[i]
-            del self.attack_cooldowns[i]
+        for i in starting:
+            self.game_state.events.debug("combat", "{enemy} is preparing to attack!", enemy=pool.enemies[i].enemy_type)
+        
+        # Ranged attackers loose one volley; the rest strike in melee
+        ranged = pool.shot_speed[attacking] > 0
+        if ranged.any():
+            self.enemy_fire(attacking[ranged], px, py)
+        
+        # Resolve by handle: an attack may kill or spawn enemies and move rows
+        for handle in [pool.handle(i) for i in attacking[~ranged]]:
+            self.enemy_attack(handle)
     
-    def enemy_attack(self, enemy):
-        """Enemy attacks player."""
+    def enemy_fire(self, rows, px: float, py: float):
+        """Enemies at ``rows`` shoot at the player at (px, py)."""
+        pool = self.pool
+        dx = px - pool.x[rows]
+        dy = py - pool.y[rows]
+        dist = np.maximum(np.hypot(dx, dy), 1e-6)
+        speed = pool.shot_speed[rows]
+        # Shots fly a little past the enemy's reach before expiring
+        self.projectiles.fire_many(pool.x[rows], pool.y[rows], dx / dist * speed, dy / dist * speed,
+                                   pool.reach[rows] * 1.5 / speed, pool.damage[rows], ENEMY)
+        for i in rows:
+            self.game_state.events.debug("combat", "{enemy} fires!", enemy=pool.enemies[i].enemy_type)
+    
+    def tick_modifiers(self, dt: float):
+        """Run the on_tick hooks of the player and living enemies, forgetting the dead."""
+        player = self.game_state.player
+        self.game_state.player_modifiers().tick(dt, player)
+        pool = self.pool
+        for handle in [h for h in self.enemy_chains if pool.row(h) < 0]:
+            del self.enemy_chains[handle]
+        for handle, chain in self.enemy_chains.items():
+            chain.tick(dt, pool.view(handle))
+    
+    def damage_enemy(self, handle: int, damage: int) -> int:
+        """Deal the player's ``damage`` to enemy ``handle`` through both sides' modifiers; returns the damage dealt."""
+        pool = self.pool
+        player = self.game_state.player
+        enemy = pool.view(handle)
+        damage = self.game_state.player_modifiers().hit(damage, player, enemy)
+        chain = self.enemy_chains.get(handle)
+        if chain is not None:
+            damage = chain.damage_taken(damage, enemy, player)
+        damage = int(damage)
+        enemy.hp -= damage
+        self.game_state.total_damage_dealt += damage
+        return damage
+    
+    def damage_enemies(self, rows, damage) -> int:
+        """
+        Deal a batch of the player's hits to the enemies at pool ``rows``; returns the total dealt.
+        
+        Every hit is counted as damage_enemy() would count it. Only when
+        neither the player nor any enemy has hooks is the batch applied in
+        one step, which gives the same hp and totals.
+        """
+        if self.game_state.player_modifiers().on_hit or self.enemy_chains:
+            # Hooks see one hit at a time, in case one heals or revives
+            pool = self.pool
+            return sum(self.damage_enemy(pool.handle(row), int(hit))
+                       for row, hit in zip(rows.tolist(), damage.tolist()))
+        damage = damage.astype(np.int64)
+        np.subtract.at(self.pool.hp, rows, damage)
+        dealt = int(damage.sum())
+        self.game_state.total_damage_dealt += dealt
+        return dealt
+    
+    def enemy_attack(self, handle: int):
+        """Enemy ``handle`` in the pool attacks player."""
+        index = self.pool.row(handle)
+        if index < 0:
+            return
+        damage = int(self.pool.damage[index])
+        chain = self.enemy_chains.get(handle)
+        enemy = self.pool.view(handle)
+        if chain is not None:
+            damage = int(chain.hit(damage, enemy, self.game_state.player))
+        self.hit_player(damage, self.pool.enemies[index].enemy_type, enemy)
+    
+    def hit_player(self, damage: int, source: str, attacker=None):
+        """Deal an attack's ``damage`` from ``source`` (and ``attacker``, if an enemy) to the player."""
         # Check if player is dodging (i-frames)
         if self.game_state.player.is_dodging:
-            print(f"Dodged {enemy.enemy_type}'s attack!")
+            self.game_state.events.info("combat", "Dodged {enemy}'s attack!", enemy=source)
             return
         
-        # Calculate damage
-        damage = enemy.damage
-        
         # Apply armor
-        damage = max(1, damage - self.game_state.player.armor)
+        damage = int(mitigate(damage, self.game_state.player.armor))
+        
+        # Relics and curses, e.g. Phoenix Feather
+        relics = len(self.game_state.player.relics)
+        damage = int(self.game_state.player_modifiers().damage_taken(damage, self.game_state.player, attacker))
+        if len(self.game_state.player.relics) != relics:
+            # A relic used itself up (Phoenix Feather)
+            self.game_state.rebuild_player_modifiers()
         
         # Apply damage
         self.game_state.player.hp -= damage
         self.game_state.total_damage_taken += damage
-        print(f"{enemy.enemy_type} dealt {damage} damage!")
+        self.game_state.events.info("combat", "{enemy} dealt {damage} damage!", enemy=source, damage=damage)
         
         # Check player death
         if self.game_state.player.hp <= 0:
             self.combat_complete = True
             self.player_victory = False
-            print("Player defeated!")
+            self.pool.sync()
+            self.game_state.events.warning("combat", "Player defeated!")
     
     def check_combat_end(self):
         """Check if combat should end."""
-        if not self.game_state.enemies:
+        if not self.pool.count:
             # All enemies defeated
             self.combat_complete = True
             self.player_victory = True
             self.game_state.in_combat = False
+            self.projectiles.clear()
             
             # Clear the room
-            current_room = self.game_state.rooms[self.game_state.current_room_index]
-            current_room.enemies = []
-            current_room.cleared = True
+            self.game_state.mark_room_cleared(self.game_state.current_room_index)
             
             # Generate rewards
             self.generate_combat_rewards()
             
-            print("Combat victory!")
+            self.game_state.events.info("combat", "Combat victory!")
     
     def generate_combat_rewards(self):
         """Generate rewards for combat victory."""
         # Gold reward
         gold_reward = random.randint(20, 50) * self.game_state.current_floor
         self.game_state.player.gold += gold_reward
-        print(f"Gained {gold_reward} gold!")
+        self.game_state.events.info("combat", "Gained {gold} gold!", gold=gold_reward)
         
         # Generate upgrade choices
         self.game_state.pending_choices.append({
@@ -275,4 +423,4 @@ class CombatSystem(BaseSystem):
     
     def render(self, renderer):
         """Render combat view."""
-        renderer.render_combat(self.game_state, self.telegraph_timers)
\ No newline at end of file
+        renderer.render_combat(self.game_state, self.pool, self.projectiles)
\ No newline at end of file
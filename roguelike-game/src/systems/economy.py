@@ -26,7 +26,7 @@ class EconomySystem(BaseSystem):
         self.active = True
         self.transaction_done = False
         self.selected_item_index = 0
-        print("Entering CASH-OUT phase")
+        self.game_state.events.debug("phase", "Entering CASH-OUT phase")
         
         # Ensure shop has items
         if not self.game_state.shop_items:
@@ -75,7 +75,7 @@ class EconomySystem(BaseSystem):
                 elif event.key == pygame.K_ESCAPE:
                     # Leave shop
                     self.transaction_done = True
-                    print("Left the shop")
+                    self.game_state.events.info("economy", "Left the shop")
     
     def purchase_item(self):
         """Attempt to purchase selected item."""
@@ -96,7 +96,7 @@ class EconomySystem(BaseSystem):
             # Remove item from shop
             self.game_state.shop_items.pop(self.selected_item_index)
             
-            print(f"Purchased {item['name']} for {cost} gold")
+            self.game_state.events.info("economy", "Purchased {item} for {cost} gold", item=item['name'], cost=cost)
             
             # Adjust selection index if needed
             if self.selected_item_index >= len(self.game_state.shop_items):
@@ -105,9 +105,9 @@ class EconomySystem(BaseSystem):
             # Check if shop is empty
             if not self.game_state.shop_items:
                 self.transaction_done = True
-                print("Shop sold out!")
+                self.game_state.events.info("economy", "Shop sold out!")
         else:
-            print(f"Not enough gold! Need {cost}, have {self.game_state.player.gold}")
+            self.game_state.events.info("economy", "Not enough gold! Need {cost}, have {gold}", cost=cost, gold=self.game_state.player.gold)
     
     def apply_item_effect(self, item):
         """Apply purchased item's effect."""
@@ -115,36 +115,36 @@ class EconomySystem(BaseSystem):
         value = item["value"]
         
         if effect == "heal":
-            heal_amount = min(value, self.game_state.player.max_hp - self.game_state.player.hp)
-            self.game_state.player.hp += heal_amount
-            print(f"Healed {heal_amount} HP")
+            heal_amount = self.game_state.heal_player(value)
+            self.game_state.events.info("economy", "Healed {amount} HP", amount=heal_amount)
         
         elif effect == "damage":
             self.game_state.player.damage += value
-            print(f"Damage increased by {value}")
+            self.game_state.events.info("economy", "Damage increased by {value}", value=value)
         
         elif effect == "armor":
             self.game_state.player.armor += value
-            print(f"Armor increased by {value}")
+            self.game_state.events.info("economy", "Armor increased by {value}", value=value)
         
         elif effect == "speed":
             self.game_state.player.speed += value
-            print(f"Speed increased by {value}")
+            self.game_state.events.info("economy", "Speed increased by {value}", value=value)
         
         elif effect == "crit_chance":
             self.game_state.player.crit_chance += value
-            print(f"Crit chance increased by {value * 100}%")
+            self.game_state.events.info("economy", "Crit chance increased by {percent}%", percent=value * 100)
         
         elif effect == "remove_curse":
             if self.game_state.player.curses:
                 removed = self.game_state.player.curses.pop()
-                print(f"Removed curse: {removed}")
+                self.game_state.rebuild_player_modifiers()
+                self.game_state.events.info("economy", "Removed curse: {curse}", curse=removed)
             else:
-                print("No curses to remove!")
+                self.game_state.events.info("economy", "No curses to remove!")
         
         elif effect == "key":
             self.game_state.player.keys += value
-            print(f"Gained {value} key(s)")
+            self.game_state.events.info("economy", "Gained {value} key(s)", value=value)
         
         elif effect == "random":
             # Random positive effect
@@ -160,7 +160,7 @@ class EconomySystem(BaseSystem):
         
         elif effect == "gold":
             self.game_state.player.gold += value
-            print(f"Gained {value} gold")
+            self.game_state.events.info("economy", "Gained {value} gold", value=value)
     
     def transaction_complete(self) -> bool:
         """Check if shopping is done."""
@@ -3,6 +3,17 @@
 import random
 from systems.base import BaseSystem
 from core.game_state import Biome
+from core.prefetch import FloorPrefetcher
+from core.save import SaveManager
+
+
+BIOME_PROGRESSION = [
+    Biome.DUNGEON,
+    Biome.CAVERNS,
+    Biome.FACTORY,
+    Biome.TEMPLE,
+    Biome.VOID
+]
 
 
 class EscalationSystem(BaseSystem):
@@ -18,12 +29,14 @@ class EscalationSystem(BaseSystem):
         """Initialize escalation system."""
         super().__init__(game_state, settings)
         self.escalation_ready = False
+        self.prefetcher = FloorPrefetcher(game_state)
+        self.saves = SaveManager(settings)
     
     def enter(self):
         """Enter escalation phase."""
         self.active = True
         self.escalation_ready = False
-        print("Entering ESCALATION phase")
+        self.game_state.events.debug("phase", "Entering ESCALATION phase")
         
         # Check for floor/biome progression
         self.check_progression()
@@ -31,10 +44,7 @@ class EscalationSystem(BaseSystem):
     def check_progression(self):
         """Check and apply progression changes."""
         # Check if all rooms cleared (boss defeated)
-        all_cleared = all(room.cleared for room in self.game_state.rooms 
-                         if room.room_type != "shop")
-        
-        if all_cleared:
+        if self.game_state.floor_cleared():
             # Progress to next floor
             self.advance_floor()
         else:
@@ -46,32 +56,54 @@ class EscalationSystem(BaseSystem):
     def advance_floor(self):
         """Advance to the next floor."""
         self.game_state.current_floor += 1
-        print(f"Advancing to floor {self.game_state.current_floor}")
+        self.game_state.events.info("escalation", "Advancing to floor {floor}", floor=self.game_state.current_floor)
         
         # Check for biome change (every 3 floors)
-        if self.game_state.current_floor % 3 == 1 and self.game_state.current_floor > 1:
+        if self.biome_changes_on(self.game_state.current_floor):
             self.change_biome()
         
-        # Generate new floor
-        self.game_state.generate_floor()
+        # Use the prefetched floor if ready, otherwise generate it now
+        rooms = self.prefetcher.take(self.game_state.current_floor, self.game_state.current_biome)
+        if rooms is not None:
+            self.game_state.install_floor(rooms)
+        else:
+            self.game_state.generate_floor()
+        self.game_state.events.debug("escalation", "Floor {floor} prefetched: {prefetched}",
+                                     floor=self.game_state.current_floor,
+                                     prefetched=rooms is not None)
         
         # Apply difficulty scaling
         self.apply_difficulty_scaling()
+        
+        # Auto-save between floors; the file is written in the background
+        if self.settings.AUTO_SAVE:
+            self.saves.save_async(self.game_state)
+    
+    def biome_changes_on(self, floor: int) -> bool:
+        """Check if reaching ``floor`` moves the run into a new biome."""
+        return floor % 3 == 1 and floor > 1
+    
+    def next_biome(self, biome: Biome) -> Biome:
+        """Return the biome following ``biome`` (the last one repeats)."""
+        index = BIOME_PROGRESSION.index(biome)
+        return BIOME_PROGRESSION[min(index + 1, len(BIOME_PROGRESSION) - 1)]
+    
+    def prefetch_next_floor(self):
+        """Start building the floor advance_floor() would generate next."""
+        if not self.settings.PREFETCH_FLOORS:
+            return
+        floor = self.game_state.current_floor + 1
+        biome = self.game_state.current_biome
+        if self.biome_changes_on(floor):
+            biome = self.next_biome(biome)
+        self.prefetcher.request(floor, biome)
     
     def change_biome(self):
         """Transition to a new biome."""
-        biome_progression = [
-            Biome.DUNGEON,
-            Biome.CAVERNS,
-            Biome.FACTORY,
-            Biome.TEMPLE,
-            Biome.VOID
-        ]
-        
-        current_index = biome_progression.index(self.game_state.current_biome)
-        if current_index < len(biome_progression) - 1:
-            self.game_state.current_biome = biome_progression[current_index + 1]
-            print(f"Entered {self.game_state.current_biome.name} biome!")
+        next_biome = self.next_biome(self.game_state.current_biome)
+        if next_biome != self.game_state.current_biome:
+            self.game_state.current_biome = next_biome
+            self.game_state.events.info("escalation", "Entered {biome} biome!", biome=self.game_state.current_biome.name)
             
             # Apply biome-specific modifiers
             self.apply_biome_modifiers()
@@ -79,25 +111,25 @@ class EscalationSystem(BaseSystem):
     def apply_biome_modifiers(self):
         """Apply biome-specific gameplay modifiers."""
         biome = self.game_state.current_biome
+        self.game_state.vision_range = self.settings.VISION_RANGE
         
         if biome == Biome.CAVERNS:
             # Reduced vision in caverns
-            print("Vision reduced in the dark caverns...")
-            # Would modify vision range here
+            self.game_state.events.info("escalation", "Vision reduced in the dark caverns...")
+            self.game_state.vision_range = self.settings.CAVERNS_VISION_RANGE
         
         elif biome == Biome.FACTORY:
             # Environmental hazards
-            print("Watch out for machinery hazards!")
-            # Would add hazard tiles
+            self.game_state.events.info("escalation", "Watch out for machinery hazards!")
         
         elif biome == Biome.TEMPLE:
             # Magic-heavy enemies
-            print("Ancient magic fills the air...")
+            self.game_state.events.info("escalation", "Ancient magic fills the air...")
             # Would modify enemy types
         
         elif biome == Biome.VOID:
             # All mechanics combined
-            print("Reality itself becomes unstable...")
+            self.game_state.events.info("escalation", "Reality itself becomes unstable...")
             # Maximum difficulty
     
     def apply_difficulty_scaling(self):
@@ -107,13 +139,13 @@ class EscalationSystem(BaseSystem):
         # Increase shop prices
         self.game_state.price_modifier = 1.0 + (floor - 1) * 0.15
         
-        print(f"Difficulty increased for floor {floor}")
-        print(f"Enemy HP multiplier: {self.settings.HP_SCALE_PER_FLOOR ** (floor - 1):.1f}x")
-        print(f"Enemy damage multiplier: {self.settings.DAMAGE_SCALE_PER_FLOOR ** (floor - 1):.1f}x")
+        self.game_state.events.info("escalation", "Difficulty increased for floor {floor}", floor=floor)
+        self.game_state.events.debug("escalation", "Enemy HP multiplier: {scale:.1f}x", scale=self.settings.HP_SCALE_PER_FLOOR ** (floor - 1))
+        self.game_state.events.debug("escalation", "Enemy damage multiplier: {scale:.1f}x", scale=self.settings.DAMAGE_SCALE_PER_FLOOR ** (floor - 1))
     
     def apply_minor_escalation(self):
         """Apply minor escalation within current floor."""
-        # Add modifiers to remaining enemies
+        # Add modifiers to remaining enemies; undiscovered rooms haven't rolled theirs yet
         for room in self.game_state.rooms:
             if not room.cleared and room.enemies:
                 # Small chance to add modifiers
@@ -129,7 +161,7 @@ class EscalationSystem(BaseSystem):
                             elif modifier == "Tough":
                                 enemy.hp = int(enemy.hp * 1.2)
                                 enemy.max_hp = int(enemy.max_hp * 1.2)
-                            # Regenerating would be handled in combat
+                            # Regenerating is a hook in core.modifiers
     
     def update(self, dt: float, events):
         """Update escalation logic."""
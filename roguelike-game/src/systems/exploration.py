@@ -1,10 +1,11 @@
 """Exploration system - Phase 1 of the core loop."""
 
 import pygame
+import numpy as np
 from typing import List
-import math
 
 from systems.base import BaseSystem
+from core.spatial import SpatialHash
 
 
 class ExplorationSystem(BaseSystem):
@@ -26,12 +27,17 @@ class ExplorationSystem(BaseSystem):
             settings.KEY_MOVE_RIGHT: (1, 0)
         }
         self.transition_ready = False
+        
+        # Spatial hash of the current room's enemies for collision checks
+        self.enemy_hash = SpatialHash(cell_size=1.0)
+        self.hashed_enemies = None
     
     def enter(self):
         """Enter exploration phase."""
         self.active = True
         self.transition_ready = False
-        print("Entering EXPLORATION phase")
+        self.hashed_enemies = None  # room objects and their lists are reused across floors
+        self.game_state.events.debug("phase", "Entering EXPLORATION phase")
         
         # Update fog of war around player
         self.update_fog_of_war()
@@ -42,7 +48,7 @@ class ExplorationSystem(BaseSystem):
             return
         
         # Handle player movement
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
         dx, dy = 0, 0
         
         for key, (mx, my) in self.movement_keys.items():
@@ -82,57 +88,51 @@ class ExplorationSystem(BaseSystem):
         
         room = self.game_state.rooms[self.game_state.current_room_index]
         
-        # Check room bounds
-        if x < room.x or x >= room.x + room.width:
-            return False
-        if y < room.y or y >= room.y + room.height:
+        # Check the tile grid (rooms, doors and corridors are walkable)
+        if not self.game_state.tiles.is_walkable(x, y):
             return False
         
         # Check for enemy collisions (can't walk through enemies)
-        for enemy in room.enemies:
-            if abs(x - enemy.x) < 0.5 and abs(y - enemy.y) < 0.5:
+        enemies = self.room_enemy_hash(room)
+        for i in enemies.candidates(x, y, 0.5):
+            if abs(x - enemies.xs[i]) < 0.5 and abs(y - enemies.ys[i]) < 0.5:
                 return False
         
         return True
     
+    def room_enemy_hash(self, room) -> SpatialHash:
+        """Return the enemy hash for ``room``, rebuilding it if the enemies changed."""
+        if self.hashed_enemies is not room.enemies or len(self.enemy_hash) != len(room.enemies):
+            self.enemy_hash.rebuild(np.array([enemy.x for enemy in room.enemies], dtype=np.float64),
+                                    np.array([enemy.y for enemy in room.enemies], dtype=np.float64))
+            self.hashed_enemies = room.enemies
+        return self.enemy_hash
+    
     def update_fog_of_war(self):
         """Update fog of war based on player position."""
-        px = int(self.game_state.player.x)
-        py = int(self.game_state.player.y)
-        vision_range = self.settings.VISION_RANGE
-        
-        # Reveal tiles within vision range
-        for x in range(px - vision_range, px + vision_range + 1):
-            for y in range(py - vision_range, py + vision_range + 1):
-                # Calculate distance
-                dist = math.sqrt((x - px) ** 2 + (y - py) ** 2)
-                if dist <= vision_range:
-                    self.game_state.fog_of_war[(x, y)] = True
+        player = self.game_state.player
+        self.game_state.fog_of_war.reveal(player.x, player.y, self.game_state.vision_range)
     
     def check_room_transition(self):
         """Check if player has moved to a new room."""
-        px = int(self.game_state.player.x)
-        py = int(self.game_state.player.y)
-        
         # Find which room the player is in
-        for i, room in enumerate(self.game_state.rooms):
-            if (room.x <= px < room.x + room.width and 
-                room.y <= py < room.y + room.height):
-                if i != self.game_state.current_room_index:
-                    # Moved to a new room
-                    self.game_state.current_room_index = i
-                    if not room.discovered:
-                        room.discovered = True
-                        self.game_state.rooms_explored += 1
-                        print(f"Discovered {room.room_type} room!")
-                        
-                        # Trigger discovery event
-                        self.trigger_discovery_event(room)
-                    
-                    # Check for enemies
-                    if room.enemies:
-                        self.transition_ready = True
-                break
+        i = self.game_state.room_lookup.room_at(self.game_state.player.x, self.game_state.player.y)
+        if i < 0 or i == self.game_state.current_room_index:
+            return
+        
+        # Moved to a new room
+        room = self.game_state.rooms[i]
+        self.game_state.current_room_index = i
+        if self.game_state.mark_room_discovered(i):
+            self.game_state.rooms_explored += 1
+            self.game_state.events.info("explore", "Discovered {room_type} room!", room=i, room_type=room.room_type)
+            
+            # Trigger discovery event
+            self.trigger_discovery_event(room)
+        
+        # Check for enemies
+        if room.enemies:
+            self.transition_ready = True
     
     def trigger_discovery_event(self, room):
         """Trigger special events when discovering a room."""
@@ -169,7 +169,7 @@ class ExplorationSystem(BaseSystem):
         elif current_room.items:
             # Pick up items
             item = current_room.items.pop(0)
-            print(f"Picked up {item.get('name', 'item')}!")
+            self.game_state.events.info("explore", "Picked up {item}!", item=item.get('name', 'item'))
             self.game_state.items_collected += 1
     
     def should_transition(self) -> bool:
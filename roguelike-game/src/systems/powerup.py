@@ -21,7 +21,7 @@ class PowerUpSystem(BaseSystem):
         """Enter power-up phase."""
         self.active = True
         self.application_complete = False
-        print("Entering POWER-UP phase")
+        self.game_state.events.debug("phase", "Entering POWER-UP phase")
         
         # Apply the selected choice
         if self.game_state.selected_choice:
@@ -34,48 +34,48 @@ class PowerUpSystem(BaseSystem):
         value = choice.get("value")
         name = choice.get("name", "Unknown")
         
-        print(f"Applying power-up: {name}")
+        self.game_state.events.info("powerup", "Applying power-up: {name}", name=name)
         
         # Apply different effect types
         if effect == "damage":
             self.game_state.player.damage += value
-            print(f"Damage increased by {value}")
+            self.game_state.events.info("powerup", "Damage increased by {value}", value=value)
         
         elif effect == "max_hp":
             self.game_state.player.max_hp += value
             self.game_state.player.hp += value  # Also heal
-            print(f"Max HP increased by {value}")
+            self.game_state.events.info("powerup", "Max HP increased by {value}", value=value)
         
         elif effect == "speed":
             self.game_state.player.speed += value
-            print(f"Speed increased by {value}")
+            self.game_state.events.info("powerup", "Speed increased by {value}", value=value)
         
         elif effect == "armor":
             self.game_state.player.armor += value
-            print(f"Armor increased by {value}")
+            self.game_state.events.info("powerup", "Armor increased by {value}", value=value)
         
         elif effect == "crit_chance":
             self.game_state.player.crit_chance += value
-            print(f"Crit chance increased by {value * 100}%")
+            self.game_state.events.info("powerup", "Crit chance increased by {percent}%", percent=value * 100)
         
         elif effect == "heal":
-            heal_amount = min(value, self.game_state.player.max_hp - self.game_state.player.hp)
-            self.game_state.player.hp += heal_amount
-            print(f"Healed for {heal_amount} HP")
+            heal_amount = self.game_state.heal_player(value)
+            self.game_state.events.info("powerup", "Healed for {amount} HP", amount=heal_amount)
         
         elif effect == "gold":
             self.game_state.player.gold += value
-            print(f"Gained {value} gold")
+            self.game_state.events.info("powerup", "Gained {value} gold", value=value)
         
         elif effect == "ability":
             # Add new ability
             self.game_state.player.abilities.append(name)
-            print(f"Gained ability: {name}")
+            self.game_state.events.info("powerup", "Gained ability: {name}", name=name)
         
         elif effect == "relic":
             # Add relic
             self.game_state.player.relics.append(name)
-            print(f"Gained relic: {name}")
+            self.game_state.rebuild_player_modifiers()
+            self.game_state.events.info("powerup", "Gained relic: {name}", name=name)
         
         elif effect == "random":
             # Random effect
@@ -26,7 +26,7 @@ class ResetSystem(BaseSystem):
         self.active = True
         self.restart_ready = False
         self.stats_displayed = False
-        print("Entering RESET phase")
+        self.game_state.events.debug("phase", "Entering RESET phase")
         
         # Calculate and display run statistics
         self.calculate_run_stats()
@@ -48,10 +48,9 @@ class ResetSystem(BaseSystem):
             "Abilities Gained": len(self.game_state.player.abilities)
         }
         
-        print("\n=== RUN COMPLETE ===")
+        self.game_state.events.info("reset", "=== RUN COMPLETE ===")
         for stat, value in stats.items():
-            print(f"{stat}: {value}")
-        print("==================\n")
+            self.game_state.events.info("reset", "{stat}: {value}", stat=stat, value=value)
         
         self.stats_displayed = True
         return stats
@@ -68,7 +67,7 @@ class ResetSystem(BaseSystem):
         if self.game_state.current_floor >= 10:
             souls_earned += 100
         
-        print(f"Earned {souls_earned} souls for meta progression")
+        self.game_state.events.info("reset", "Earned {souls} souls for meta progression", souls=souls_earned)
         
         # In a full implementation, these would be saved
         # and used to unlock new characters, items, etc.
@@ -83,8 +82,9 @@ class ResetSystem(BaseSystem):
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:  # R to restart
                     self.restart_ready = True
-                    print("Restarting run...")
+                    self.game_state.events.info("reset", "Restarting run...")
                 elif event.key == pygame.K_q:  # Q to quit
+                    self.game_state.events.stop()
                     pygame.quit()
                     import sys
                     sys.exit()
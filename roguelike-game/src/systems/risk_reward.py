@@ -27,14 +27,14 @@ class RiskRewardSystem(BaseSystem):
         """Enter risk/reward phase."""
         self.active = True
         self.decision = None
-        print("Entering PUSH YOUR LUCK phase")
+        self.game_state.events.debug("phase", "Entering PUSH YOUR LUCK phase")
         
         # Generate risk/reward opportunities
         self.generate_opportunities()
         
         if self.opportunities:
             self.current_opportunity = self.opportunities[0]
-            print(f"Risk opportunity: {self.current_opportunity['name']}")
+            self.game_state.events.info("risk", "Risk opportunity: {name}", name=self.current_opportunity['name'])
     
     def generate_opportunities(self):
         """Generate risk/reward opportunities based on current state."""
@@ -99,7 +99,7 @@ class RiskRewardSystem(BaseSystem):
         
         self.decision = "accepted"
         opp = self.current_opportunity
-        print(f"Accepted {opp['name']}!")
+        self.game_state.events.info("risk", "Accepted {name}!", name=opp['name'], type=opp["type"])
         
         # Apply risk effects
         if opp["type"] == "elite":
@@ -109,6 +109,7 @@ class RiskRewardSystem(BaseSystem):
         elif opp["type"] == "curse":
             # Add curse
             self.game_state.player.curses.append("Reduced Healing")
+            self.game_state.rebuild_player_modifiers()
             # Apply immediate reward
             self.game_state.player.damage += 10
         
@@ -125,27 +126,34 @@ class RiskRewardSystem(BaseSystem):
     def decline_risk(self):
         """Player declines the risk."""
         self.decision = "declined"
-        print("Risk declined, playing it safe.")
+        self.game_state.events.info("risk", "Risk declined, playing it safe.")
     
     def spawn_elite_encounter(self):
         """Create an elite enemy encounter."""
-        # Find next uncle room and add elite
-        for room in self.game_state.rooms:
-            if not room.cleared and room.room_type == "standard":
-                if room.enemies:
-                    # Upgrade first enemy to elite
-                    room.enemies[0].is_elite = True
-                    room.enemies[0].hp *= 2
-                    room.enemies[0].damage = int(room.enemies[0].damage * 1.5)
-                    room.enemies[0].modifiers.append("Elite")
-                break
+        # Upgrade an enemy in the closest uncleared standard room within reach
+        state = self.game_state
+        for index in state.room_graph.within(state.current_room_index, self.settings.ELITE_SPAWN_HOPS):
+            room = state.rooms[index]
+            if room.cleared or room.room_type != "standard":
+                continue
+            # Roll the room's enemies now if the player hasn't been there yet
+            state.populate_room(room)
+            if room.enemies:
+                enemy = room.enemies[0]
+                enemy.is_elite = True
+                enemy.hp *= 2
+                enemy.damage = int(enemy.damage * 1.5)
+                enemy.modifiers.append("Elite")
+                state.events.debug("risk", "Elite waiting {hops} rooms away",
+                                   hops=state.room_graph.distance(state.current_room_index, index))
+                return
     
     def start_timed_challenge(self):
         """Initialize a timed challenge."""
         # This would trigger a special timed room
         # For now, just give rewards
         self.game_state.player.gold += 150
-        print("Completed timed challenge! +150 gold")
+        self.game_state.events.info("risk", "Completed timed challenge! +{gold} gold", gold=150)
     
     def grant_legendary_relic(self):
         """Grant a legendary relic."""
@@ -157,7 +165,8 @@ class RiskRewardSystem(BaseSystem):
         ]
         relic = random.choice(legendary_relics)
         self.game_state.player.relics.append(relic)
-        print(f"Gained legendary relic: {relic}")
+        self.game_state.rebuild_player_modifiers()
+        self.game_state.events.info("risk", "Gained legendary relic: {relic}", relic=relic)
     
     def has_opportunities(self) -> bool:
         """Check if there are risk/reward opportunities."""
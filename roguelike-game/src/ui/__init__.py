@@ -2,5 +2,6 @@
 
 from ui.renderer import Renderer
 from ui.hud import HUD
+from ui.profiler_overlay import ProfilerOverlay
 
-__all__ = ['Renderer', 'HUD']
\ No newline at end of file
+__all__ = ['Renderer', 'HUD', 'ProfilerOverlay']
\ No newline at end of file
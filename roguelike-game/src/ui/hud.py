@@ -1,6 +1,7 @@
 """HUD (Heads-Up Display) for the game."""
 
 import pygame
+from typing import Optional
 
 
 class HUD:
@@ -12,16 +13,42 @@ class HUD:
         self.settings = settings
         self.font = pygame.font.Font(None, settings.UI_FONT_SIZE)
         self.small_font = pygame.font.Font(None, settings.UI_FONT_SIZE - 4)
+        self.rect = pygame.Rect(
+            0,
+            settings.SCREEN_HEIGHT - settings.UI_PANEL_HEIGHT,
+            settings.SCREEN_WIDTH,
+            settings.UI_PANEL_HEIGHT
+        )
+        self.last_values = None
     
-    def render(self, game_state):
-        """Render all HUD elements."""
-        # HUD background panel
-        hud_rect = pygame.Rect(
-            0, 
-            self.settings.SCREEN_HEIGHT - self.settings.UI_PANEL_HEIGHT,
-            self.settings.SCREEN_WIDTH,
-            self.settings.UI_PANEL_HEIGHT
+    def displayed_values(self, game_state) -> tuple:
+        """Return every value the HUD shows, used to detect changes."""
+        player = game_state.player
+        return (
+            player.hp, player.max_hp, player.stamina, player.max_stamina,
+            player.damage, player.armor, round(player.speed, 1),
+            round(player.crit_chance * 100), round(max(player.dodge_cooldown, 0.0), 1),
+            player.gold, player.souls, player.keys,
+            game_state.current_floor, game_state.current_biome,
+            game_state.rooms_cleared, len(game_state.rooms),
+            tuple(player.abilities[:3]), tuple(player.relics[:2]), tuple(player.curses[:2]),
+            game_state.current_phase
         )
+    
+    def render(self, game_state, force: bool = True) -> Optional[pygame.Rect]:
+        """
+        Render all HUD elements.
+        
+        Unless ``force`` is set, nothing is drawn when no displayed value
+        changed since the last render. Returns the area drawn, or None.
+        """
+        values = self.displayed_values(game_state)
+        if not force and values == self.last_values:
+            return None
+        self.last_values = values
+        
+        # HUD background panel
+        hud_rect = self.rect
         pygame.draw.rect(self.screen, self.settings.DARK_GRAY, hud_rect)
         pygame.draw.rect(self.screen, self.settings.WHITE, hud_rect, 2)
         
@@ -40,6 +67,8 @@ class HUD:
         # Current phase indicator
         if game_state.current_phase:
             self.draw_phase_indicator(game_state.current_phase, hud_rect)
+        
+        return hud_rect
     
     def draw_player_stats(self, player, hud_rect):
         """Draw player statistics."""
@@ -108,9 +137,7 @@ class HUD:
         self.draw_text(biome_text, x, y + 25, self.settings.WHITE)
         
         # Room progress
-        rooms_cleared = sum(1 for r in game_state.rooms if r.cleared)
-        total_rooms = len(game_state.rooms)
-        progress_text = f"Rooms: {rooms_cleared}/{total_rooms}"
+        progress_text = f"Rooms: {game_state.rooms_cleared}/{len(game_state.rooms)}"
         self.draw_text(progress_text, x, y + 50, self.settings.WHITE)
     
     def draw_abilities_relics(self, player, hud_rect):
@@ -0,0 +1,54 @@
+"""On-screen frame timing overlay."""
+
+import pygame
+
+
+class ProfilerOverlay:
+    """Draws frame time percentiles and the slowest sections."""
+
+    SECTIONS = ("events", "update", "render.phase", "render.hud", "flip")
+
+    def __init__(self, screen: pygame.Surface, settings):
+        """Initialize the overlay."""
+        self.screen = screen
+        self.settings = settings
+        self.font = pygame.font.Font(None, settings.UI_FONT_SIZE)
+        self.visible = False
+        self.budget_ms = 1000.0 / settings.FPS
+
+    def toggle(self):
+        """Show or hide the overlay."""
+        self.visible = not self.visible
+
+    def render(self, profiler, phase) -> pygame.Rect:
+        """Draw the overlay for the current phase and return the area drawn."""
+        width = 260
+        lines = []
+
+        frame = profiler.stats(profiler.FRAME, phase)
+        if frame:
+            lines.append((f"Frame p50 {frame['p50']:.1f}  p95 {frame['p95']:.1f}  "
+                          f"p99 {frame['p99']:.1f} ms",
+                          self.settings.GREEN if frame["p99"] <= self.budget_ms
+                          else self.settings.RED))
+        else:
+            lines.append(("Frame: no samples", self.settings.GRAY))
+
+        for section in self.SECTIONS:
+            s = profiler.stats(section, phase)
+            if s:
+                lines.append((f"{section}: p95 {s['p95']:.2f} ms", self.settings.WHITE))
+
+        rect = pygame.Rect(self.settings.SCREEN_WIDTH - width - 10, 10,
+                           width, 10 + len(lines) * 18)
+        panel = pygame.Surface(rect.size)
+        panel.set_alpha(200)
+        panel.fill(self.settings.BLACK)
+        self.screen.blit(panel, rect)
+
+        y = rect.y + 5
+        for text, color in lines:
+            surface = self.font.render(text, True, color)
+            self.screen.blit(surface, (rect.x + 8, y))
+            y += 18
+        return rect
@@ -1,8 +1,12 @@
 """Main rendering system for the game."""
 
 import pygame
+import numpy as np
 from typing import List, Dict, Optional
 
+from core.tilemap import DOOR, CORRIDOR, HAZARD
+from core.projectiles import PROJECTILE_RADIUS
+
 
 class Renderer:
     """Handles all game rendering."""
@@ -13,50 +17,189 @@ class Renderer:
         self.settings = settings
         self.font = pygame.font.Font(None, settings.UI_FONT_SIZE)
         self.large_font = pygame.font.Font(None, settings.UI_FONT_SIZE * 2)
+        
+        # Interpolation between the two most recent simulation states
+        self.previous_positions = {}
+        self.alpha = 1.0
+        
+        # Dirty-rectangle rendering
+        self.dirty_rendering = settings.DIRTY_RECT_RENDERING
+        self.background: Optional[pygame.Surface] = None
+        self.scene_key = None
+        self.full_redraw = True
+        self.dirty_rects: List[pygame.Rect] = []
+        self.dynamic_rects: List[pygame.Rect] = []
+        
+        # Scaled fog and tile overlays and the grid versions they were built from
+        self.fog_cache = None
+        self.tile_cache = None
+        
+        # Tile colours indexed by tile code; walls and room floor are not drawn
+        self.tile_colors = np.zeros((5, 3), dtype=np.uint8)
+        self.tile_colors[DOOR] = (139, 90, 43)  # Brown
+        self.tile_colors[CORRIDOR] = settings.DARK_GRAY
+        self.tile_colors[HAZARD] = (255, 140, 0)  # Orange
+        self.tile_visible = np.zeros(5, dtype=bool)
+        self.tile_visible[[DOOR, CORRIDOR, HAZARD]] = True
+        
+        # Projectile sprites indexed by owner (player, enemy)
+        self.projectile_sprites = (self.make_projectile_sprite(settings.WHITE),
+                                   self.make_projectile_sprite((255, 140, 0)))
+    
+    def set_interpolation(self, previous_positions: Dict[int, tuple], alpha: float):
+        """Set the previous sim positions and blend factor for this frame."""
+        self.previous_positions = previous_positions
+        self.alpha = alpha
+    
+    def interpolate(self, entity):
+        """Return the entity's position blended between the last two sim states."""
+        previous = self.previous_positions.get(id(entity))
+        if previous is None:
+            return entity.x, entity.y
+        
+        px, py = previous
+        # Snap on teleports (floor changes, respawns) instead of sliding
+        if abs(entity.x - px) > 2 or abs(entity.y - py) > 2:
+            return entity.x, entity.y
+        
+        return px + (entity.x - px) * self.alpha, py + (entity.y - py) * self.alpha
+    
+    # Dirty-rect bookkeeping
+    @property
+    def invalidated(self) -> bool:
+        """Whether the next frame must redraw the whole screen."""
+        return self.scene_key is None
+    
+    def invalidate(self):
+        """Force a full redraw on the next frame."""
+        self.scene_key = None
+    
+    def begin_frame(self):
+        """Restore last frame's moving elements from the cached background."""
+        self.full_redraw = False
+        self.dirty_rects = []
+        if self.background is not None:
+            for rect in self.dynamic_rects:
+                self.screen.blit(self.background, rect, rect)
+                self.dirty_rects.append(rect)
+        self.dynamic_rects = []
+    
+    def skip_frame(self):
+        """Present nothing this frame."""
+        self.full_redraw = False
+        self.dirty_rects = []
+    
+    def static_layer(self, key) -> bool:
+        """
+        Return True if the static layer identified by ``key`` must be drawn.
+        
+        Without dirty rendering the static layer is always drawn. With it,
+        the layer is only redrawn (from a cleared screen) when its key
+        changes; otherwise the cached background already holds it.
+        """
+        if not self.dirty_rendering:
+            return True
+        if key == self.scene_key and self.background is not None:
+            return False
+        
+        self.scene_key = key
+        self.screen.fill(self.settings.BLACK)
+        self.full_redraw = True
+        return True
+    
+    def end_static_layer(self):
+        """Cache the freshly drawn static layer as the background."""
+        if self.dirty_rendering and self.full_redraw:
+            self.background = self.screen.copy()
+    
+    def track(self, rect: pygame.Rect):
+        """Record the area of a moving element drawn this frame."""
+        if self.dirty_rendering:
+            self.dynamic_rects.append(pygame.Rect(rect))
+    
+    def mark_dirty(self, rect: pygame.Rect):
+        """Record an area that changed this frame but is not restored next frame."""
+        if self.dirty_rendering:
+            self.dirty_rects.append(pygame.Rect(rect))
+    
+    def frame_rects(self) -> List[pygame.Rect]:
+        """Return every screen area that changed this frame."""
+        return self.dirty_rects + self.dynamic_rects
     
     def render_exploration(self, game_state):
         """Render exploration view."""
-        # Draw rooms
-        for room in game_state.rooms:
-            if room.discovered:
-                self.draw_room(room, game_state)
-        
-        # Draw fog of war
-        self.draw_fog_of_war(game_state)
+        key = ("explore", game_state.current_room_index, game_state.fog_of_war.version,
+               tuple((room.discovered, room.cleared) for room in game_state.rooms))
+        if self.static_layer(key):
+            # Draw rooms
+            for room in game_state.rooms:
+                if room.discovered:
+                    self.draw_room(room, game_state)
+            
+            # Draw corridors, doors and hazards that have been seen
+            self.draw_tiles(game_state)
+            
+            # Draw fog of war
+            self.draw_fog_of_war(game_state)
+            
+            # Draw current room info
+            if game_state.current_room_index < len(game_state.rooms):
+                room = game_state.rooms[game_state.current_room_index]
+                text = f"Room: {room.room_type.upper()}"
+                self.draw_text(text, 10, 10, self.settings.WHITE)
+                
+                # Navigation hint toward the closest unexplored room
+                target = game_state.next_unexplored_room()
+                if target >= 0:
+                    hops = game_state.room_graph.distance(game_state.current_room_index, target)
+                    self.draw_text(f"Unexplored room: {hops} away", 10, 35, self.settings.WHITE)
+            self.end_static_layer()
         
         # Draw player
         self.draw_player(game_state.player)
-        
-        # Draw current room info
-        if game_state.current_room_index < len(game_state.rooms):
-            room = game_state.rooms[game_state.current_room_index]
-            text = f"Room: {room.room_type.upper()}"
-            self.draw_text(text, 10, 10, self.settings.WHITE)
     
-    def render_combat(self, game_state, telegraph_timers):
+    def render_combat(self, game_state, pool, projectiles=None):
         """Render combat view."""
-        # Draw room
-        if game_state.current_room_index < len(game_state.rooms):
-            room = game_state.rooms[game_state.current_room_index]
-            self.draw_room(room, game_state)
+        key = ("combat", game_state.current_room_index)
+        if self.static_layer(key):
+            # Draw room
+            if game_state.current_room_index < len(game_state.rooms):
+                room = game_state.rooms[game_state.current_room_index]
+                self.draw_room(room, game_state)
+            self.draw_tiles(game_state)
+            
+            # Combat UI
+            text = "COMBAT - Press SPACE to dodge!"
+            self.draw_text(text, 10, 10, self.settings.RED)
+            self.end_static_layer()
         
         # Draw player
         self.draw_player(game_state.player)
         
+        # Enemy positions blended between the pool's last two sim states
+        n = pool.count
+        xs = pool.prev_x[:n] + (pool.x[:n] - pool.prev_x[:n]) * self.alpha
+        ys = pool.prev_y[:n] + (pool.y[:n] - pool.prev_y[:n]) * self.alpha
+        hp_ratio = pool.hp[:n] / pool.max_hp[:n]
+        
         # Draw enemies with telegraphs
-        for i, enemy in enumerate(game_state.enemies):
-            self.draw_enemy(enemy)
+        for i in range(n):
+            enemy = pool.enemies[i]
+            self.draw_enemy(enemy.enemy_type, enemy.is_elite, xs[i], ys[i], hp_ratio[i])
             
             # Draw telegraph if active
-            if i in telegraph_timers and telegraph_timers[i] > 0:
-                self.draw_telegraph(enemy)
+            if pool.telegraph[i] > 0:
+                self.draw_telegraph(xs[i], ys[i])
         
-        # Combat UI
-        text = "COMBAT - Press SPACE to dodge!"
-        self.draw_text(text, 10, 10, self.settings.RED)
+        # Draw projectiles
+        if projectiles is not None:
+            self.draw_projectiles(projectiles)
     
     def render_choices(self, choices: List[Dict], selected_index: int):
         """Render choice interface."""
+        if not self.static_layer(("choices", tuple(c.get('name') for c in choices), selected_index)):
+            return
+        
         # Draw choice panel
         panel_height = 400
         panel_y = (self.settings.SCREEN_HEIGHT - panel_height) // 2
@@ -88,17 +231,25 @@ class Renderer:
             
             self.draw_text(name, choice_rect.x + 10, choice_rect.y + 10, color)
             self.draw_text(effect, choice_rect.x + 10, choice_rect.y + 40, color)
+        self.end_static_layer()
     
     def render_powerup_feedback(self, game_state):
         """Render power-up application feedback."""
+        if not self.static_layer(("powerup",)):
+            return
+        
         # Simple feedback text
         text = "Power-up Applied!"
         text_surface = self.large_font.render(text, True, self.settings.GREEN)
         text_rect = text_surface.get_rect(center=(self.settings.SCREEN_WIDTH // 2, self.settings.SCREEN_HEIGHT // 2))
         self.screen.blit(text_surface, text_rect)
+        self.end_static_layer()
     
     def render_risk_reward(self, opportunity: Dict):
         """Render risk/reward interface."""
+        if not self.static_layer(("risk", opportunity['name'])):
+            return
+        
         # Draw opportunity panel
         panel_height = 300
         panel_y = (self.settings.SCREEN_HEIGHT - panel_height) // 2
@@ -128,16 +279,24 @@ class Renderer:
         # Instructions
         inst = "Press Y to accept, N to decline"
         self.draw_text(inst, panel_rect.x + 20, panel_y + 220, self.settings.GRAY)
+        self.end_static_layer()
     
     def render_escalation_info(self, game_state):
         """Render escalation information."""
+        if not self.static_layer(("escalate", game_state.current_floor, game_state.current_biome)):
+            return
+        
         text = f"Floor {game_state.current_floor} - {game_state.current_biome.name}"
         text_surface = self.large_font.render(text, True, self.settings.WHITE)
         text_rect = text_surface.get_rect(center=(self.settings.SCREEN_WIDTH // 2, self.settings.SCREEN_HEIGHT // 2))
         self.screen.blit(text_surface, text_rect)
+        self.end_static_layer()
     
     def render_shop(self, game_state, selected_index: int):
         """Render shop interface."""
+        if not self.static_layer(("shop", game_state.player.gold, selected_index, len(game_state.shop_items))):
+            return
+        
         # Shop background
         shop_rect = pygame.Rect(50, 50, self.settings.SCREEN_WIDTH - 100, self.settings.SCREEN_HEIGHT - 200)
         pygame.draw.rect(self.screen, self.settings.DARK_GRAY, shop_rect)
@@ -170,9 +329,13 @@ class Renderer:
         # Instructions
         inst = "ENTER to buy, ESC to leave"
         self.draw_text(inst, shop_rect.x + 20, shop_rect.bottom - 40, self.settings.GRAY)
+        self.end_static_layer()
     
     def render_reset_screen(self, game_state, show_stats: bool):
         """Render death/reset screen."""
+        if not self.static_layer(("reset", show_stats)):
+            return
+        
         # Dark overlay
         overlay = pygame.Surface((self.settings.SCREEN_WIDTH, self.settings.SCREEN_HEIGHT))
         overlay.set_alpha(200)
@@ -212,6 +375,7 @@ class Renderer:
         prompt_surface = self.font.render(prompt, True, self.settings.WHITE)
         prompt_rect = prompt_surface.get_rect(center=(self.settings.SCREEN_WIDTH // 2, self.settings.SCREEN_HEIGHT - 100))
         self.screen.blit(prompt_surface, prompt_rect)
+        self.end_static_layer()
     
     # Helper methods
     def draw_room(self, room, game_state):
@@ -247,31 +411,59 @@ class Renderer:
             text_rect = text_surface.get_rect(center=(x + w // 2, y + h // 2))
             self.screen.blit(text_surface, text_rect)
     
+    def draw_tiles(self, game_state):
+        """Draw the revealed corridor, door and hazard tiles of the floor's tile grid."""
+        tiles = game_state.tiles
+        fog = game_state.fog_of_war
+        if not tiles.grid.size:
+            return
+        
+        # Rebuild the overlay only when the grid or the revealed area changed
+        if self.tile_cache is None or self.tile_cache[0] is not tiles or self.tile_cache[1] != fog.version:
+            tile_size = self.settings.TILE_SIZE
+            surface = pygame.Surface((tiles.width, tiles.height), pygame.SRCALPHA)
+            pixels = pygame.surfarray.pixels3d(surface)
+            pixels[:] = self.tile_colors[tiles.grid.T]
+            del pixels  # release the surface lock
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            alpha[:] = (self.tile_visible[tiles.grid] & fog.grid).T * 255
+            del alpha
+            surface = pygame.transform.scale(surface, (tiles.width * tile_size, tiles.height * tile_size))
+            self.tile_cache = (tiles, fog.version, surface)
+        
+        tile_size = self.settings.TILE_SIZE
+        self.screen.blit(self.tile_cache[2], (tiles.origin_x * tile_size, tiles.origin_y * tile_size))
+    
     def draw_fog_of_war(self, game_state):
-        """Draw fog of war overlay."""
-        # Simple fog - darken undiscovered areas
-        for room in game_state.rooms:
-            if not room.discovered:
-                tile_size = self.settings.TILE_SIZE
-                x = room.x * tile_size
-                y = room.y * tile_size
-                w = room.width * tile_size
-                h = room.height * tile_size
-                
-                fog_surf = pygame.Surface((w, h))
-                fog_surf.set_alpha(self.settings.FOG_ALPHA)
-                fog_surf.fill(self.settings.BLACK)
-                self.screen.blit(fog_surf, (x, y))
+        """Draw fog of war overlay from the floor's revealed-tile grid."""
+        fog = game_state.fog_of_war
+        if not fog.grid.size:
+            return
+        
+        # Rebuild the overlay only when the grid changed
+        if self.fog_cache is None or self.fog_cache[0] is not fog or self.fog_cache[1] != fog.version:
+            tile_size = self.settings.TILE_SIZE
+            surface = pygame.Surface((fog.width, fog.height), pygame.SRCALPHA)
+            surface.fill(self.settings.BLACK)
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            alpha[:] = (~fog.grid.T) * self.settings.FOG_ALPHA
+            del alpha  # release the surface lock
+            surface = pygame.transform.scale(surface, (fog.width * tile_size, fog.height * tile_size))
+            self.fog_cache = (fog, fog.version, surface)
+        
+        tile_size = self.settings.TILE_SIZE
+        self.screen.blit(self.fog_cache[2], (fog.origin_x * tile_size, fog.origin_y * tile_size))
     
     def draw_player(self, player):
         """Draw the player character."""
         tile_size = self.settings.TILE_SIZE
-        x = int(player.x * tile_size)
-        y = int(player.y * tile_size)
+        ex, ey = self.interpolate(player)
+        x = int(ex * tile_size)
+        y = int(ey * tile_size)
         
         # Draw player as a circle
         color = self.settings.BLUE if player.is_dodging else self.settings.WHITE
-        pygame.draw.circle(self.screen, color, (x, y), tile_size // 3)
+        body = pygame.draw.circle(self.screen, color, (x, y), tile_size // 3)
         
         # Draw health bar
         bar_width = tile_size
@@ -280,16 +472,17 @@ class Renderer:
         bar_y = y - tile_size // 2 - 10
         
         # Background
-        pygame.draw.rect(self.screen, self.settings.RED, (bar_x, bar_y, bar_width, bar_height))
+        bar = pygame.draw.rect(self.screen, self.settings.RED, (bar_x, bar_y, bar_width, bar_height))
         # Health
         health_width = int(bar_width * (player.hp / player.max_hp))
         pygame.draw.rect(self.screen, self.settings.GREEN, (bar_x, bar_y, health_width, bar_height))
+        self.track(body.union(bar))
     
-    def draw_enemy(self, enemy):
-        """Draw an enemy."""
+    def draw_enemy(self, enemy_type: str, is_elite: bool, ex: float, ey: float, hp_ratio: float):
+        """Draw an enemy at tile position (ex, ey)."""
         tile_size = self.settings.TILE_SIZE
-        x = int(enemy.x * tile_size)
-        y = int(enemy.y * tile_size)
+        x = int(ex * tile_size)
+        y = int(ey * tile_size)
         
         # Enemy color based on type
         colors = {
@@ -298,15 +491,15 @@ class Renderer:
             "tank": (128, 0, 128),  # Purple
             "swarm": (255, 255, 0),  # Yellow
         }
-        color = colors.get(enemy.enemy_type, self.settings.RED)
+        color = colors.get(enemy_type, self.settings.RED)
         
         # Draw enemy
         size = tile_size // 3
-        if enemy.is_elite:
+        if is_elite:
             size = int(size * 1.5)
             pygame.draw.circle(self.screen, self.settings.WHITE, (x, y), size + 2)  # Elite border
         
-        pygame.draw.circle(self.screen, color, (x, y), size)
+        body = pygame.draw.circle(self.screen, color, (x, y), size).inflate(4, 4)
         
         # Health bar
         bar_width = tile_size
@@ -314,24 +507,52 @@ class Renderer:
         bar_x = x - bar_width // 2
         bar_y = y - tile_size // 2 - 10
         
-        pygame.draw.rect(self.screen, self.settings.RED, (bar_x, bar_y, bar_width, bar_height))
-        health_width = int(bar_width * (enemy.hp / enemy.max_hp))
+        bar = pygame.draw.rect(self.screen, self.settings.RED, (bar_x, bar_y, bar_width, bar_height))
+        health_width = int(bar_width * hp_ratio)
         pygame.draw.rect(self.screen, self.settings.GREEN, (bar_x, bar_y, health_width, bar_height))
+        self.track(body.union(bar))
+    
+    def make_projectile_sprite(self, color) -> pygame.Surface:
+        """Pre-render a projectile dot in ``color``."""
+        radius = max(2, int(PROJECTILE_RADIUS * self.settings.TILE_SIZE))
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        return sprite
+    
+    def draw_projectiles(self, projectiles):
+        """Draw every live projectile with a single blits() call."""
+        n = projectiles.count
+        if not n:
+            return
+        
+        # Screen positions for the whole pool at once, offset to the sprite corner
+        tile_size = self.settings.TILE_SIZE
+        offset = self.projectile_sprites[0].get_width() // 2
+        xs, ys = projectiles.positions(self.alpha)
+        xs = (xs * tile_size).astype(np.int64) - offset
+        ys = (ys * tile_size).astype(np.int64) - offset
+        
+        sprites = self.projectile_sprites
+        rects = self.screen.blits([(sprites[owner], (x, y)) for owner, x, y in
+                                   zip(projectiles.owner[:n].tolist(), xs.tolist(), ys.tolist())])
+        if self.dirty_rendering:
+            self.dynamic_rects.extend(rects)
     
-    def draw_telegraph(self, enemy):
-        """Draw attack telegraph for enemy."""
+    def draw_telegraph(self, ex: float, ey: float):
+        """Draw attack telegraph for an enemy at tile position (ex, ey)."""
         tile_size = self.settings.TILE_SIZE
-        x = int(enemy.x * tile_size)
-        y = int(enemy.y * tile_size)
+        x = int(ex * tile_size)
+        y = int(ey * tile_size)
         
         # Draw warning indicator
-        pygame.draw.circle(self.screen, self.settings.RED, (x, y), tile_size // 2, 2)
+        ring = pygame.draw.circle(self.screen, self.settings.RED, (x, y), tile_size // 2, 2)
         
         # Draw "!" above enemy
         text = "!"
         text_surface = self.large_font.render(text, True, self.settings.RED)
         text_rect = text_surface.get_rect(centerx=x, bottom=y - tile_size // 2 - 15)
         self.screen.blit(text_surface, text_rect)
+        self.track(ring.union(text_rect))
     
     def draw_text(self, text: str, x: int, y: int, color):
         """Draw text at specified position."""